@@ -3,19 +3,26 @@ from .operator import array_keys
 from .operator import shader_node
 from .operator import install_packages
 from .operator import validation_report
+from .operator import profile_dump
 from .panel import preferences as prefs_panel
 from .menu import object_context
 from .menu import edit
+from .lib import handlers
+from .lib import profiling
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (array_keys, shader_node, object_context, prefs_panel, validation_report, edit):  # list all imports here
+    for mod in (array_keys, shader_node, object_context, prefs_panel, validation_report, profile_dump, edit, handlers,
+                profiling):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
 ArrayKeys = array_keys.ArrayKeys
 StringKeys = array_keys.StringKeys
+BatchStringKeys = array_keys.BatchStringKeys
+TextKeys = array_keys.TextKeys
+LayoutKeys = array_keys.LayoutKeys
 KeySet = array_keys.KeySetPropertyGroup
 AddKiroShader = shader_node.AddKiroShader
 ObjectKiroMenu = object_context.ObjectKiroMenu
@@ -60,6 +67,7 @@ registerable_modules = [
     install_packages,
     prefs_panel,
     validation_report,
+    profile_dump,
     edit,
 ]
 
@@ -104,10 +112,17 @@ def register() -> None:
         print("Kiro Registered class:", c)
     for m in menus:
         getattr(bpy.types, m[0]).append(m[1])
+    handlers.register()
+    # Preferences aren't available in every context (e.g., some command-line runs), so profiling just stays off there
+    try:
+        profiling.enabled = bpy.context.preferences.addons[package_name].preferences.profiling
+    except (AttributeError, KeyError):
+        pass
 
 
 def unregister() -> None:
     all_classes = get_classes()
+    handlers.unregister()
     for m in menus[::-1]:
         getattr(bpy.types, m[0]).remove(m[1])
     for c in all_classes[::-1]:
@@ -0,0 +1,39 @@
+from . import pkg
+
+__package__ = pkg()
+
+import bpy
+from mathutils import Matrix
+from . import harness
+from ..lib import boxer
+
+SIZES = (1000, 10000, 100000, 1000000)
+
+
+def _make_object(n: int) -> bpy.types.Object:
+    mesh = bpy.data.meshes.new("Kiro Benchmark Points")
+    mesh.from_pydata([(i % 100, (i // 100) % 100, i // 10000) for i in range(n)], [], [])
+    obj = bpy.data.objects.new("Kiro Benchmark Points", mesh)
+    obj.matrix_world = Matrix.Translation((1, 2, 3)) @ Matrix.Rotation(0.5, 4, "Z")
+    return obj
+
+
+def run():
+    implementations = {"Python": boxer._get_extremes_python}
+    if boxer._HAS_NUMPY:
+        implementations["NumPy"] = boxer._get_extremes_numpy
+    # The public entry point, with whichever implementation is in use
+    implementations["get_extremes"] = lambda obj, _, mesh_precision: boxer.get_extremes(obj, mesh_precision)
+    results = {name: [] for name in implementations.keys()}
+    for n in SIZES:
+        obj = _make_object(n)
+        try:
+            for (name, get_extremes) in implementations.items():
+                seconds = harness.time_call(lambda: get_extremes(obj, obj.matrix_world, mesh_precision=True))
+                results[name].append((n, seconds))
+        finally:
+            mesh = obj.data
+            bpy.data.objects.remove(obj)
+            bpy.data.meshes.remove(mesh)
+    for (name, result) in results.items():
+        harness.print_scaling(f"boxer.get_extremes with mesh_precision, {name}", result, unit_name="vertex")
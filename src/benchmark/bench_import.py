@@ -0,0 +1,50 @@
+from . import pkg
+
+__package__ = pkg()
+
+import bpy
+import subprocess
+from os import environ, path
+from . import harness
+
+TOP = 15
+
+
+def _import_times(addon_package: str, addon_parent: str) -> list[tuple[int, int, str]]:
+    """
+    Import the addon in a fresh background Blender with -X importtime, returning (self us, cumulative us, module) for
+    every module the import pulled in.
+    """
+    expr = f"import sys; sys.path.insert(0, {addon_parent!r}); import {addon_package}"
+    env = {**environ, "PYTHONPROFILEIMPORTTIME": "1"}
+    completed = subprocess.run(
+        [bpy.app.binary_path, "-b", "--factory-startup", "--python-use-system-env", "--python-expr", expr],
+        env=env, capture_output=True, text=True)
+    times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        (self_us, cumulative_us, module) = [f.strip() for f in line[len("import time:"):].split("|")]
+        if self_us.isdigit():
+            times.append((int(self_us), int(cumulative_us), module))
+    return times
+
+
+def run():
+    addon_package = __package__.split(".")[0]
+    addon_parent = path.dirname(path.dirname(path.dirname(__file__)))
+    times = _import_times(addon_package, addon_parent)
+    addon_times = [t for t in times if t[2].split(".")[0] == addon_package]
+    if not addon_times:
+        print("\nAddon import time: no -X importtime output. Is this Blender's Python honoring PYTHON* variables?")
+        return
+    total = max(t[1] for t in addon_times)
+    title = "Addon import time (python -X importtime under blender -b)"
+    print(f"\n{title}: {total / 1000:.1f} ms")
+    print(f"{'self (ms)':>10} | {'cumulative (ms)':>15} | module")
+    print("-" * 60)
+    for (self_us, cumulative_us, module) in sorted(times, key=lambda t: -t[0])[:TOP]:
+        print(f"{self_us / 1000:>10.2f} | {cumulative_us / 1000:>15.2f} | {module}")
+    harness.record(title, [{"module": addon_package, "cumulative_us": total}] + [
+        {"module": module, "self_us": self_us, "cumulative_us": cumulative_us} for (self_us, cumulative_us, module) in
+        sorted(times, key=lambda t: -t[0])[:TOP]])
@@ -0,0 +1,52 @@
+from . import pkg
+
+__package__ = pkg()
+
+import bpy
+from time import perf_counter
+from . import harness
+from ..lib import kiro
+
+POLLS = 1000
+SIZES = (0, 10, 100, 1000)
+
+
+def _count_scans(polls: int) -> tuple[int, int, float]:
+    """Poll kiro_images like ArrayKeysBase.poll does, returning (list rebuilds, per-image examinations, seconds)"""
+    examinations = 0
+    original_kiro_image_meta = kiro.kiro_image_meta
+
+    def counting_kiro_image_meta(image):
+        nonlocal examinations
+        examinations += 1
+        return original_kiro_image_meta(image)
+
+    kiro._test_clear_caches()
+    kiro._general_cache.reset_stats()
+    kiro.kiro_image_meta = counting_kiro_image_meta
+    try:
+        start = perf_counter()
+        for _ in range(polls):
+            kiro.kiro_images()
+        elapsed = perf_counter() - start
+    finally:
+        kiro.kiro_image_meta = original_kiro_image_meta
+    return kiro._general_cache.stats.misses, examinations, elapsed
+
+
+def run():
+    title = f"kiro.kiro_images, {POLLS} polls"
+    rows = []
+    print(f"\n{title}")
+    print(f"{'images':>8} | {'rebuilds':>8} | {'examined':>8} | {'total (s)':>10}")
+    print("-" * 44)
+    for n in SIZES:
+        images = [bpy.data.images.new(f"Kiro Benchmark {i}", 4, 4) for i in range(n)]
+        try:
+            (rebuilds, examined, elapsed) = _count_scans(POLLS)
+        finally:
+            for image in images:
+                bpy.data.images.remove(image)
+        print(f"{n:>8} | {rebuilds:>8} | {examined:>8} | {elapsed:>10.4f}")
+        rows.append({"images": n, "rebuilds": rebuilds, "examined": examined, "seconds": elapsed})
+    harness.record(title, rows)
@@ -0,0 +1,97 @@
+from . import pkg
+
+__package__ = pkg()
+
+import gc
+import json
+import tracemalloc
+from . import harness
+from ..lib import metadata
+from ..lib import types
+
+KEYSETS = 50
+KEYS_PER_KEYSET = 10000
+
+
+class _DictKeyset:
+    """The dict-backed keyset as it was before types.KiroKeyset used __slots__ and interned tokens, for comparison"""
+
+    def __init__(self, name, cols, rows, start, default_key=0, length=None, keys=None, alt_for=None, version=1.0):
+        self.name = name
+        self.parent = None
+        self.cols = cols
+        self.rows = rows
+        self.start = start
+        self._keys = keys
+        self._key_index = {}
+        for (index, key) in enumerate(keys if keys else []):
+            if key is not None:
+                self._key_index.setdefault(key, index)
+        self.alt_for = alt_for
+        self.length = length if length else len(keys)
+        self.length_explicit = (length is not None)
+        self.default_key = default_key
+        self.version = version
+
+
+class _DictMetaData:
+    def __init__(self, version, name, description, keysets):
+        self.description = description
+        self.name = name
+        self.version = version
+        self.keysets = keysets
+        for ks in self.keysets.values():
+            ks.parent = self
+
+
+def _catalog() -> str:
+    """A sidecar with many keysets sharing one large (CJK) glyph set, with a few gaps, as JSON"""
+    keys = [chr(0x4E00 + i) if i % 100 else None for i in range(KEYS_PER_KEYSET)]
+    return json.dumps({
+        "kiro": 1.0,
+        "name": "Memory benchmark",
+        "keysets": {
+            f"keyset {k}": {"cols": 100, "rows": KEYS_PER_KEYSET // 100, "start": 0, "default_key": 0, "keys": keys}
+            for k in range(KEYSETS)
+        }
+    })
+
+
+def _build(catalog: str, metadata_class: type, keyset_class: type):
+    data = json.loads(catalog)
+    return metadata_class(
+        version=1.0,
+        name=data["name"],
+        description=None,
+        keysets={name: keyset_class(name=name, cols=ks["cols"], rows=ks["rows"], start=ks["start"],
+                                    keys=metadata._normalize_keys(ks), default_key=ks["default_key"])
+                 for (name, ks) in data["keysets"].items()},
+    )
+
+
+def _footprint(catalog: str, metadata_class: type, keyset_class: type) -> int:
+    """Bytes still allocated, once the parsed JSON is gone, to hold the catalog"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        instance = _build(catalog, metadata_class, keyset_class)
+        gc.collect()
+        (current, _) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del instance
+    return current
+
+
+def run():
+    catalog = _catalog()
+    before = _footprint(catalog, _DictMetaData, _DictKeyset)
+    after = _footprint(catalog, types.KiroMetaData, types.KiroKeyset)
+    title = f"Keyset catalog memory, {KEYSETS} keysets of {KEYS_PER_KEYSET} keys"
+    print(f"\n{title}")
+    print(f"{'model':>24} | {'MiB':>8}")
+    print("-" * 36)
+    print(f"{'dict-backed':>24} | {before / 2 ** 20:>8.2f}")
+    print(f"{'slotted, interned':>24} | {after / 2 ** 20:>8.2f}")
+    print(f"{'saved':>24} | {(before - after) / 2 ** 20:>8.2f} ({(before - after) / before:.0%})")
+    harness.record(title, [{"model": "dict-backed", "bytes": before}, {"model": "slotted, interned", "bytes": after}])
@@ -0,0 +1,44 @@
+from . import pkg
+
+__package__ = pkg()
+
+import json
+from os import path
+from tempfile import TemporaryDirectory
+from . import harness
+from ..lib import disk_cache
+from ..lib import metadata
+
+SIZES = (1, 10, 100)
+KEYS_PER_KEYSET = 100
+
+
+def _write_sidecar(directory: str, keysets: int) -> str:
+    keys = [chr(0x41 + i % 26) for i in range(KEYS_PER_KEYSET)] + [None, {"gap": 1}, {"row_gap": 1}]
+    file_path = path.join(directory, f"bench{keysets}.kiro.json")
+    with open(file_path, "w") as file:
+        json.dump({
+            "kiro": 1.0,
+            "name": "Benchmark",
+            "description": "Synthetic sidecar for benchmarks",
+            "keysets": {
+                f"keyset {i}": {"cols": 10, "rows": 11, "start": 0, "default_key": 0, "keys": keys}
+                for i in range(keysets)
+            }
+        }, file)
+    return file_path
+
+
+def run():
+    results = {"parse and validate": [], "persistent store hit": []}
+    with TemporaryDirectory() as directory:
+        store = disk_cache.DiskCache(path.join(directory, "store"), "bench")
+        for n in SIZES:
+            file_path = _write_sidecar(directory, n)
+            # Validation results are remembered by content, so forget them to time the whole load every time
+            results["parse and validate"].append(
+                (n, harness.time_call(lambda _: metadata.load(file_path), setup=metadata._valid_content.clear)))
+            metadata.load(file_path, store=store)
+            results["persistent store hit"].append((n, harness.time_call(lambda: metadata.load(file_path, store=store))))
+    for (name, result) in results.items():
+        harness.print_scaling(f"metadata.load, {name}, {KEYS_PER_KEYSET} keys per keyset", result, unit_name="keyset")
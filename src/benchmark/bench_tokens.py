@@ -0,0 +1,34 @@
+from . import pkg
+
+__package__ = pkg()
+
+from . import harness
+from ..lib import kiro
+from ..lib import types
+
+SIZES = (10, 100, 1000, 10000, 100000)
+
+_KEYS = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789") + ["Enter", "Space", "Backspace", None, "Shift", "Tab"]
+
+
+def _string(n: int) -> str:
+    """A string of n tokens, mixing single characters (in either case), bracketed names and spaces"""
+    pieces = ["a", "B", "[Enter]", " ", "7", "[Shift]", "q", "[Nope]"]
+    return "".join(pieces[i % len(pieces)] for i in range(n))
+
+
+def run():
+    keyset = types.KiroKeyset("Benchmark", 8, 6, 0, keys=_KEYS)
+    results = {"string_to_tokens": [], "normalize_tokens": [], "tokens_to_indices": [], "tokenize": []}
+    for n in SIZES:
+        string = _string(n)
+        tokens = kiro.string_to_tokens(string, space_to_none=True)
+        normalized = kiro.normalize_tokens(tokens, keyset)
+        results["string_to_tokens"].append(
+            (n, harness.time_call(lambda: kiro.string_to_tokens(string, space_to_none=True))))
+        results["normalize_tokens"].append((n, harness.time_call(lambda: kiro.normalize_tokens(tokens, keyset))))
+        results["tokens_to_indices"].append((n, harness.time_call(lambda: kiro.tokens_to_indices(normalized, keyset))))
+        # All three at once, as StringKeys does it
+        results["tokenize"].append((n, harness.time_call(lambda: kiro.tokenize(string, keyset, space_to_none=True))))
+    for (name, result) in results.items():
+        harness.print_scaling(f"kiro.{name}", result, unit_name="token")
@@ -0,0 +1,72 @@
+from . import pkg
+
+__package__ = pkg()
+
+import bpy
+from mathutils import Vector
+from . import harness
+from ..lib import typeset
+
+SIZES = (10, 100, 1000, 10000)
+WIRE_SIZES = (1000, 10000, 100000)
+
+
+def _setup(n: int):
+    def setup():
+        collection = bpy.data.collections.new("Kiro Benchmark")
+        bpy.context.scene.collection.children.link(collection)
+        mesh = bpy.data.meshes.new("Kiro Benchmark Key")
+        mesh.from_pydata([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], [], [(0, 1, 2, 3)])
+        original = bpy.data.objects.new("Kiro Benchmark Key", mesh)
+        collection.objects.link(original)
+        indices = [i % 26 for i in range(n)]
+        tokens = [chr(ord("A") + i) for i in indices]
+        return original, indices, tokens, collection
+
+    return setup
+
+
+def _extend(state):
+    original, indices, tokens, collection = state
+    return typeset.extend_from_original(original, indices, target=collection, normalized_tokens=tokens)
+
+
+def _extend_with_wire(state):
+    original, indices, tokens, collection = state
+    return typeset.extend_from_original(original, indices, target=collection, guide_wire=True,
+                                        normalized_tokens=tokens)
+
+
+def _wire(fill: callable, n: int) -> float:
+    points = [Vector((i, 0, 0)) for i in range(n)]
+
+    def make(_):
+        mesh = bpy.data.meshes.new("Kiro Benchmark Wire")
+        fill(mesh, points)
+        return mesh
+
+    return harness.time_call(make, setup=lambda: None, teardown=lambda _, mesh: bpy.data.meshes.remove(mesh))
+
+
+def _teardown(state, objects):
+    original, indices, tokens, collection = state
+    mesh = original.data
+    bpy.data.batch_remove(list(collection.objects))
+    bpy.data.collections.remove(collection)
+    bpy.data.meshes.remove(mesh)
+
+
+def run():
+    for (title, extend) in (("typeset.extend_from_original", _extend),
+                            ("typeset.extend_from_original with a guide wire", _extend_with_wire)):
+        results = [(n, harness.time_call(extend, setup=_setup(n), teardown=_teardown, repeat=1 if n >= 10000 else 3,
+                                       warmup=0 if n >= 10000 else 1))
+                   for n in SIZES]
+        harness.print_scaling(title, results)
+
+    fills = {"Python": typeset._fill_wire_python}
+    if typeset._HAS_NUMPY:
+        fills["NumPy"] = typeset._fill_wire_numpy
+    for (name, fill) in fills.items():
+        harness.print_scaling(f"typeset guide wire mesh, {name}", [(n, _wire(fill, n)) for n in WIRE_SIZES],
+                              unit_name="vertex")
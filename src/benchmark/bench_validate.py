@@ -0,0 +1,36 @@
+from . import pkg
+
+__package__ = pkg()
+
+from .harness import time_call, print_scaling
+from ..lib import metadata
+from ..lib import validator
+
+SIZES = (1, 10, 100)
+KEYS_PER_KEYSET = 100
+
+
+def _sidecar(keysets: int) -> dict:
+    keys = [chr(0x41 + i % 26) for i in range(KEYS_PER_KEYSET)] + [None, {"gap": 1}, {"row_gap": 1}]
+    return {
+        "kiro": 1.0,
+        "name": "Benchmark",
+        "keysets": {
+            f"keyset {i}": {"cols": 10, "rows": 10, "start": 0, "default_key": 0, "keys": list(keys)}
+            for i in range(keysets)
+        }
+    }
+
+
+def run():
+    jsonschema_validator = metadata.jsonschema_validator()
+    results = {"built-in": []}
+    if jsonschema_validator:
+        results["jsonschema"] = []
+    for n in SIZES:
+        data = _sidecar(n)
+        results["built-in"].append((n, time_call(lambda: list(validator.iter_errors(data, metadata.kirofile_schema())))))
+        if jsonschema_validator:
+            results["jsonschema"].append((n, time_call(lambda: list(jsonschema_validator.iter_errors(data)))))
+    for (name, result) in results.items():
+        print_scaling(f"Sidecar validation, {name}, {KEYS_PER_KEYSET} keys per keyset", result, unit_name="keyset")
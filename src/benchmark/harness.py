@@ -0,0 +1,71 @@
+import json
+import platform
+import sys
+from datetime import datetime
+from statistics import median
+from time import perf_counter
+
+# Results recorded by every benchmark that has run, for write_json
+_results: list[dict] = []
+
+
+def time_call(fn: callable, setup: callable = None, teardown: callable = None, repeat: int = 3,
+              warmup: int = 1) -> float:
+    """
+    Run fn() warmup times untimed, then repeat times, and return the best wall-clock time in seconds. setup() output is
+    passed to fn().
+    """
+    return time_calls(fn, setup=setup, teardown=teardown, repeat=repeat, warmup=warmup)["best"]
+
+
+def time_calls(fn: callable, setup: callable = None, teardown: callable = None, repeat: int = 3,
+               warmup: int = 1) -> dict[str, float | list[float]]:
+    """Like time_call, but returns the best and median times, and every timed run"""
+    runs = []
+    for iteration in range(warmup + repeat):
+        state = setup() if setup else None
+        start = perf_counter()
+        result = fn(state) if setup else fn()
+        elapsed = perf_counter() - start
+        if teardown:
+            teardown(state, result)
+        if iteration >= warmup:
+            runs.append(elapsed)
+    return {"best": min(runs), "median": median(runs), "runs": runs}
+
+
+def record(title: str, rows: list[dict]) -> None:
+    """Keep a benchmark's results (one dict per row of its table) to be written out by write_json"""
+    _results.append({"benchmark": title, "rows": rows})
+
+
+def print_scaling(title: str, results: list[tuple[int, float]], unit_name: str = "key") -> None:
+    print(f"\n{title}")
+    print(f"{'n':>8} | {'total (s)':>10} | {'per ' + unit_name + ' (us)':>16}")
+    print("-" * 40)
+    for (n, seconds) in results:
+        print(f"{n:>8} | {seconds:>10.4f} | {seconds / n * 1e6:>16.2f}")
+    record(title, [{"n": n, "seconds": seconds, f"per_{unit_name}_us": seconds / n * 1e6} for (n, seconds) in results])
+
+
+def clear() -> None:
+    _results.clear()
+
+
+def write_json(file_path: str) -> None:
+    """Write every recorded result, with enough about the environment to tell runs apart"""
+    try:
+        import bpy
+        blender_version = bpy.app.version_string
+    except ImportError:
+        blender_version = None
+    report = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "blender": blender_version,
+        "python": sys.version,
+        "platform": platform.platform(),
+        "results": _results,
+    }
+    with open(file_path, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nBenchmark results written to {file_path}")
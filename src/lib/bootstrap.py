@@ -5,6 +5,10 @@ from importlib import util as il_util
 
 WANTED_MODULES = ["jsonschema"]
 
+# find_spec searches sys.path on every call, and has_module is called from UI draw code and validation, so results are
+# remembered until modules are installed or removed.
+_has_module_cache: dict[str, bool] = {}
+
 
 def _check_modules(installed: False) -> list[str]:
     result = []
@@ -15,7 +19,9 @@ def _check_modules(installed: False) -> list[str]:
 
 
 def has_module(mod_name: str) -> bool:
-    return bool(il_util.find_spec(mod_name))
+    if mod_name not in _has_module_cache:
+        _has_module_cache[mod_name] = bool(il_util.find_spec(mod_name))
+    return _has_module_cache[mod_name]
 
 
 def missing_modules() -> list[str]:
@@ -28,9 +34,15 @@ def installed_modules() -> list[str]:
 
 def install_missing_modules() -> None:
     missing = set(missing_modules())
-    subprocess.check_call([sys.executable, "-m", "pip", "install", *missing])
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *missing])
+    finally:
+        _has_module_cache.clear()
 
 
 def remove_installed_modules(exceptions: Iterable = tuple()) -> None:
     installed = set(installed_modules()) - set(exceptions)
-    subprocess.check_call([sys.executable, "-m", "pip", "uninstall", "-y", *installed])
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "uninstall", "-y", *installed])
+    finally:
+        _has_module_cache.clear()
@@ -1,8 +1,21 @@
 from typing import Iterable
 import bpy
-from mathutils import Vector
+from mathutils import Vector, Matrix
+from . import bootstrap
 from . import util
 
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (bootstrap, util,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+# NumPy ships with Blender, but the pure-Python path is kept for builds without it
+_HAS_NUMPY = bootstrap.has_module("numpy")
+if _HAS_NUMPY:
+    import numpy
+
 
 # See https://github.com/SuperFLEB/bounding_boxer for the full addon this lib is based off of
 
@@ -24,6 +37,30 @@ def _get_points(obj: bpy.types.Object, mesh_precision: bool = False) -> list[Vec
         return [Vector(corner) for corner in obj.bound_box]
 
 
+def _get_extremes_python(obj: bpy.types.Object, matrix: Matrix, mesh_precision: bool = False) -> tuple[Vector, Vector]:
+    points = _get_points(obj, mesh_precision=mesh_precision)
+    return _get_extremes_vectors([matrix @ Vector(pt) for pt in points])
+
+
+def _get_extremes_numpy(obj: bpy.types.Object, matrix: Matrix, mesh_precision: bool = False) -> tuple[Vector, Vector]:
+    """Same as _get_extremes_python, but reads and transforms the points as arrays"""
+    if mesh_precision and type(obj.data) is bpy.types.Mesh:
+        vertices = obj.data.vertices
+        if not len(vertices):
+            return _get_extremes_vectors([])
+        # float32 is how Blender stores coordinates, so foreach_get can copy them straight into the buffer
+        coords = numpy.empty(len(vertices) * 3, dtype=numpy.float32)
+        vertices.foreach_get("co", coords)
+        points = coords.reshape(-1, 3)
+    else:
+        points = numpy.array(obj.bound_box, dtype=numpy.float32)
+
+    # The transform is done in double precision, like mathutils, so far-from-origin objects don't lose precision
+    transform = numpy.array(matrix, dtype=numpy.float64)
+    world = points @ transform[:3, :3].T + transform[:3, 3]
+    return Vector(world.min(axis=0)), Vector(world.max(axis=0))
+
+
 def get_extremes(obj: bpy.types.Object, mesh_precision: bool = False, ttl: int = 20) -> tuple[Vector, Vector]:
     """
     Find the extremes of the object, deeply incorporating instanced collections
@@ -36,8 +73,9 @@ def get_extremes(obj: bpy.types.Object, mesh_precision: bool = False, ttl: int =
     # TODO: Other sorts of parenting/instancing, too?
     if obj.instance_collection is None:
         # Regular object
-        points = _get_points(obj, mesh_precision=mesh_precision)
-        return _get_extremes_vectors([obj.matrix_world @ Vector(pt) for pt in points])
+        if _HAS_NUMPY:
+            return _get_extremes_numpy(obj, obj.matrix_world, mesh_precision=mesh_precision)
+        return _get_extremes_python(obj, obj.matrix_world, mesh_precision=mesh_precision)
 
     extremes = []
     # Collection Instance
@@ -1,8 +1,20 @@
-from time import time
+from collections import OrderedDict
+from sys import getsizeof
+from threading import RLock, Event, get_ident
+from time import time, perf_counter
 
 _DEFAULT_LIFETIME = 60
 
 
+class _Missing:
+    def __repr__(self):
+        return "<cache.MISSING>"
+
+
+# Pass as Cache.get's default to tell a miss apart from a cached None or empty value
+MISSING = _Missing()
+
+
 class CacheMissException(Exception):
     pass
 
@@ -11,11 +23,59 @@ class CacheTimeoutException(CacheMissException):
     pass
 
 
+class CacheStaleException(CacheMissException):
+    pass
+
+
+class CacheNegativeException(CacheMissException):
+    """The cached item is a remembered failure. The exception the resolver raised is in `error`."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class CacheRecursionException(Exception):
+    """A resolver tried to resolve the key it is already resolving"""
+    pass
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.timeouts = 0
+        self.stale = 0
+        self.evictions = 0
+        self.resolves = 0
+        self.shared_resolves = 0
+        self.resolver_time = 0.0
+
+    def as_dict(self) -> dict[str, int | float]:
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "timeouts": self.timeouts,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "resolves": self.resolves,
+            "shared_resolves": self.shared_resolves,
+            "resolver_time": self.resolver_time,
+        }
+
+
 class CacheItem:
-    def __init__(self, value: any, lifetime: float = None):
+    __slots__ = ("born", "lifetime", "value", "signature", "size", "error")
+
+    def __init__(self, value: any, lifetime: float = None, signature: any = None, size: int = 0,
+                 error: BaseException | None = None):
         self.born: float = time()
         self.lifetime = lifetime if lifetime is not None else _DEFAULT_LIFETIME
         self.value = value
+        self.signature = signature
+        self.size = size
+        self.error = error
 
     def is_valid(self, lifetime: float = None) -> bool:
         return (time() - self.born) < (lifetime if lifetime is not None else self.lifetime)
@@ -24,58 +84,177 @@ class CacheItem:
         return self.value
 
 
+class _InFlight:
+    """A resolution in progress, which other requests for the same key wait on"""
+
+    def __init__(self):
+        self.owner = get_ident()
+        self.done = Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
 class Cache:
-    def __init__(self, lifetime: float = 60, debug_id: str = None):
+    def __init__(self, lifetime: float = 60, debug_id: str = None, max_entries: int | None = None,
+                 size_of: callable = getsizeof, negative_lifetime: float | None = None):
+        """
+        max_entries, if set, bounds the cache, evicting the least-recently-used items first.
+        size_of estimates the memory size of each value for the size total. The default, sys.getsizeof, does not
+        count referenced objects, so pass something deeper if the total matters.
+        negative_lifetime, if set, is how long an exception raised by a get_or_resolve resolver is remembered and
+        re-raised instead of resolving again.
+        All methods are thread-safe.
+        """
         self.lifetime = lifetime
-        self.items = {}
+        self.items = OrderedDict()
+        self.max_entries = max_entries
+        self.size_of = size_of
+        self.size = 0
+        self.negative_lifetime = negative_lifetime
+        self.stats = CacheStats()
         self.debug_id = debug_id
+        self._lock = RLock()
+        self._in_flight: dict[any, _InFlight] = {}
         if debug_id:
             print("Debug on for cache", debug_id, "Default cache lifetime set to ", lifetime)
 
-    def set(self, key: str, value: any, lifetime: float = None) -> None:
+    def _store(self, key, item: CacheItem) -> None:
+        with self._lock:
+            if key in self.items:
+                self.size -= self.items[key].size
+            self.items[key] = item
+            self.items.move_to_end(key)
+            self.size += item.size
+            if self.max_entries is not None:
+                while len(self.items) > self.max_entries:
+                    (evicted_key, evicted) = self.items.popitem(last=False)
+                    self.size -= evicted.size
+                    self.stats.evictions += 1
+                    if self.debug_id: print(f"{self.debug_id}: Evicted least recently used cache item {evicted_key}")
+
+    def set(self, key: str, value: any, lifetime: float = None, signature: any = None) -> None:
         lifetime: float = lifetime if lifetime is not None else self.lifetime
-        self.items[key] = CacheItem(value, lifetime)
+        self._store(key, CacheItem(value, lifetime, signature, self.size_of(value) if self.size_of else 0))
         if self.debug_id: print(f"{self.debug_id}: Set cache item {key} for {lifetime} seconds to value", value)
 
+    def set_negative(self, key: str, error: BaseException, lifetime: float = None, signature: any = None) -> None:
+        """Remember that resolving the key failed with the given exception"""
+        lifetime: float = lifetime if lifetime is not None else self.negative_lifetime
+        self._store(key, CacheItem(None, lifetime, signature, error=error))
+        if self.debug_id: print(f"{self.debug_id}: Set negative cache item {key} for {lifetime} seconds to", error)
+
     def delete(self, key) -> None:
-        del self.items[key]
+        with self._lock:
+            self.size -= self.items.pop(key).size
         if self.debug_id: print(f"{self.debug_id}: Delete cache item {key}")
 
-    def get_or_raise(self, key, lifetime: float = None) -> any:
-        lifetime = lifetime if lifetime is not None else self.lifetime
-        if key not in self.items:
-            if self.debug_id: print(f"{self.debug_id}: Cache miss looking for key {key}")
-            raise CacheMissException()
-        if not self.items[key].is_valid():
-            if self.debug_id: print(f"{self.debug_id}: Cache timeout for key {key}, deleting value")
-            self.delete(key)
-            raise CacheTimeoutException()
-        value = self.items[key].get()
-        if self.debug_id: print(f"{self.debug_id}: Cache hit, found key {key} with value", value)
-        return self.items[key].get()
+    def discard(self, key) -> None:
+        """Delete the item if it exists"""
+        with self._lock:
+            if key in self.items:
+                self.delete(key)
+
+    def get_or_raise(self, key, lifetime: float = None, signature: any = None) -> any:
+        """
+        Get an item or raise a CacheMissException. If a signature is given (e.g., a file modification time), an item
+        that was set with a different signature is stale and is deleted. A remembered failure raises a
+        CacheNegativeException.
+        """
+        with self._lock:
+            lifetime = lifetime if lifetime is not None else self.lifetime
+            if key not in self.items:
+                self.stats.misses += 1
+                if self.debug_id: print(f"{self.debug_id}: Cache miss looking for key {key}")
+                raise CacheMissException()
+            item = self.items[key]
+            if not item.is_valid():
+                self.stats.timeouts += 1
+                if self.debug_id: print(f"{self.debug_id}: Cache timeout for key {key}, deleting value")
+                self.delete(key)
+                raise CacheTimeoutException()
+            if signature is not None and item.signature != signature:
+                self.stats.stale += 1
+                if self.debug_id: print(f"{self.debug_id}: Stale cache item for key {key}, deleting value")
+                self.delete(key)
+                raise CacheStaleException()
+            self.items.move_to_end(key)
+            if item.error is not None:
+                self.stats.negative_hits += 1
+                if self.debug_id: print(f"{self.debug_id}: Negative cache hit, found key {key} with", item.error)
+                raise CacheNegativeException(item.error)
+            self.stats.hits += 1
+            value = item.get()
+            if self.debug_id: print(f"{self.debug_id}: Cache hit, found key {key} with value", value)
+            return value
 
     def get_or_resolve(self, key: str, resolver: callable, lifetime: float = None, item_lifetime: float = None,
-                       ignore_cache: bool = False) -> any:
+                       ignore_cache: bool = False, signature: any = None) -> any:
+        """
+        Get an item, or resolve, cache and return it if it is missing. Only one resolution per key runs at a time:
+        concurrent requests for a key that is being resolved wait for that resolution and share its result.
+        """
         # This seems silly to have an ignore_cache in a caching method, but it allows callers to use the smae resolver
         # callback lambda or function when caching is directed to be ignored by their caller.
-        if not ignore_cache:
-            try:
-                return self.get_or_raise(key, lifetime)
-            except CacheMissException:
-                pass
+        with self._lock:
+            if not ignore_cache:
+                try:
+                    return self.get_or_raise(key, lifetime, signature=signature)
+                except CacheNegativeException as e:
+                    raise e.error.with_traceback(None) from None
+                except CacheMissException:
+                    pass
+
+            flight = self._in_flight.get(key)
+            is_resolver = flight is None
+            if is_resolver:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+            elif flight.owner == get_ident():
+                raise CacheRecursionException(f"Cache item {key} was requested while resolving it")
+            else:
+                self.stats.shared_resolves += 1
+
+        if not is_resolver:
+            if self.debug_id: print(f"{self.debug_id}: Waiting for in-flight resolution of item {key}")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
 
         if self.debug_id: print(f"{self.debug_id}: Cache miss finding item {key}, resolving with callable")
-        value = resolver(key)
-        self.set(key, value, item_lifetime if item_lifetime is not None else self.lifetime)
-        return value
+        start = perf_counter()
+        try:
+            flight.value = resolver(key)
+        except Exception as e:
+            flight.error = e
+            if self.negative_lifetime is not None:
+                self.set_negative(key, e, signature=signature)
+            raise
+        else:
+            self.set(key, flight.value, item_lifetime if item_lifetime is not None else self.lifetime,
+                     signature=signature)
+        finally:
+            with self._lock:
+                self.stats.resolves += 1
+                self.stats.resolver_time += perf_counter() - start
+                del self._in_flight[key]
+            flight.done.set()
+        return flight.value
 
-    def get(self, key, lifetime: float = None) -> any:
+    def get(self, key, lifetime: float = None, default: any = None) -> any:
+        """Get an item, or the default (None unless given) if it is missing. Use default=MISSING to detect misses."""
         try:
             return self.get_or_raise(key, lifetime)
         except CacheMissException:
-            return None
+            return default
 
     def clear(self):
-        self.items = {}
+        with self._lock:
+            self.items = OrderedDict()
+            self.size = 0
         if self.debug_id:
             print("Cache cleared:", self.debug_id)
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = CacheStats()
@@ -0,0 +1,88 @@
+import os
+import pickle
+from os import path
+
+# Bump this when the shape of stored records changes, so old files are not read
+_FORMAT_VERSION = 1
+_DEFAULT_MAX_FILES = 512
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    """Only plain data (dicts, lists, strings, numbers...) can come out of a cache file, never arbitrary objects"""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Kiro cache files cannot contain {module}.{name}")
+
+
+class DiskCache:
+    """
+    A cache of plain-data records in files, which persists between sessions. Keys should change whenever the data
+    they refer to changes (e.g., a content hash), as items never expire on their own. When there are more than
+    max_files files, the least recently written ones are removed.
+    """
+
+    def __init__(self, directory: str, namespace: str, max_files: int = _DEFAULT_MAX_FILES):
+        self.directory = directory
+        self.prefix = f"{namespace}-v{_FORMAT_VERSION}-"
+        self.max_files = max_files
+
+    def _path(self, key: str) -> str:
+        return path.join(self.directory, f"{self.prefix}{key}.pickle")
+
+    def _files(self) -> list[str]:
+        try:
+            return [path.join(self.directory, f) for f in os.listdir(self.directory)
+                    if f.startswith(self.prefix) and f.endswith(".pickle")]
+        except OSError:
+            return []
+
+    def get(self, key: str, default: any = None) -> any:
+        file_path = self._path(key)
+        try:
+            with open(file_path, "rb") as file:
+                return _RestrictedUnpickler(file).load()
+        except FileNotFoundError:
+            return default
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+            print(f"Kiro: Ignoring unreadable cache file {file_path}:", e)
+            return default
+
+    def set(self, key: str, value: any) -> None:
+        file_path = self._path(key)
+        # Write to a temporary file and move it into place, so other processes sharing the directory (e.g., render
+        # farm workers) never read a partial file
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, file_path)
+        except OSError as e:
+            print(f"Kiro: Could not write cache file {file_path}:", e)
+            return
+        self._prune()
+
+    def _prune(self) -> None:
+        files = self._files()
+        if len(files) <= self.max_files:
+            return
+
+        def mtime(file_path: str) -> float:
+            try:
+                return path.getmtime(file_path)
+            except OSError:
+                return 0
+
+        for file_path in sorted(files, key=mtime)[:len(files) - self.max_files]:
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        for file_path in self._files():
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
+
@@ -0,0 +1,43 @@
+import bpy
+from bpy.app.handlers import persistent
+from . import kiro
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (kiro,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+@persistent
+def kiro_depsgraph_update_post(scene, depsgraph):
+    kiro.on_depsgraph_update(depsgraph)
+
+
+@persistent
+def kiro_load_post(*args):
+    kiro.on_load_post()
+
+
+_HANDLERS = [
+    (bpy.app.handlers.depsgraph_update_post, kiro_depsgraph_update_post),
+    (bpy.app.handlers.load_post, kiro_load_post),
+]
+
+
+def _remove_handlers() -> None:
+    # Match by name, so handlers left behind by a previous (reloaded) version of this module are removed too
+    for (handler_list, handler) in _HANDLERS:
+        for existing in [h for h in handler_list if getattr(h, "__name__", None) == handler.__name__]:
+            handler_list.remove(existing)
+
+
+def register() -> None:
+    _remove_handlers()
+    for (handler_list, handler) in _HANDLERS:
+        handler_list.append(handler)
+
+
+def unregister() -> None:
+    _remove_handlers()
@@ -1,17 +1,22 @@
 import bpy
 import json
+from os import stat, environ
 from os.path import exists, dirname, basename, join
+from time import time
 from warnings import warn
 import re
+from typing import Iterator
 from . import cache
+from . import disk_cache
 from . import metadata
+from . import profiling
 from . import types
 from . import util
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (cache, metadata, types, util):  # list all imports here
+    for mod in (cache, disk_cache, metadata, profiling, types, util):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
@@ -19,34 +24,157 @@ _LOADED = True
 _DEBUG_CACHE = False
 _CACHE_TIME = 5
 
-_general_cache = cache.Cache(_CACHE_TIME, debug_id=("_general_cache" if _DEBUG_CACHE else None))
-_data_cache = cache.Cache(_CACHE_TIME, debug_id=("_data_cache" if _DEBUG_CACHE else None))
+_CACHE_MAX_ENTRIES = 256
+
+_general_cache = cache.Cache(_CACHE_TIME, debug_id=("_general_cache" if _DEBUG_CACHE else None),
+                             max_entries=_CACHE_MAX_ENTRIES)
+# Sidecar data does not time out. It is checked against the file's modification time and size instead.
+# Failed loads are remembered the same way, so a broken sidecar is not reparsed on every redraw.
+_data_cache = cache.Cache(float("inf"), debug_id=("_data_cache" if _DEBUG_CACHE else None),
+                          max_entries=_CACHE_MAX_ENTRIES, negative_lifetime=float("inf"))
+
+# Set this environment variable to put the persistent keyset cache somewhere other than Blender's user datafiles
+# (e.g., a directory shared by render farm workers)
+_PERSISTENT_CACHE_DIR_ENV = "KIRO_CACHE_DIR"
+_persistent_store: disk_cache.DiskCache | None = None
+
+# Image metadata by image pointer, as (filepath, name_full, time checked, metadata). An entry is reused while the image
+# keeps its path and name, so only new or changed images pay for path resolution. Entries with a sidecar check that it
+# still exists each time they are used, in case it has been deleted or renamed. Entries that found no sidecar are
+# rechecked after _IMAGE_RECHECK_TIME, in case one has been added since.
+_IMAGE_RECHECK_TIME = 30
+_image_index: dict[int, tuple[str, str, float, types.KiroImageMeta]] = {}
+
+# Keysets used by Grid Pickers in each node tree (including nested groups), by node tree pointer. Any material or node
+# tree change clears it, as a change to a shared group affects every tree that uses it.
+_tree_keyset_index: dict[int, frozenset[str]] = {}
+
+# Objects using each material, by material pointer. Objects are stored as (name, library path) keys for bpy.data.objects
+# rather than as objects, which could go stale. Built on first use, and dropped by depsgraph updates that could change
+# material slots, or when the number of objects or materials changes. See material_users().
+_material_users_index: dict[int, list[tuple[str, str | None]]] | None = None
+# (object count, material count) when the index was built
+_material_users_counts: tuple[int, int] | None = None
 
 
 def _test_clear_caches():
     """Reinitialize the caches. This should only be used by tests."""
     _general_cache.clear()
     _data_cache.clear()
+    _image_index.clear()
+    _tree_keyset_index.clear()
+    invalidate_material_users()
+
+
+def invalidate_images(image_pointers: list[int] | None = None) -> None:
+    """Forget indexed metadata for the given images (by as_pointer()), or for all images"""
+    if image_pointers is None:
+        _image_index.clear()
+    else:
+        for pointer in image_pointers:
+            _image_index.pop(pointer, None)
+    _general_cache.discard("images")
+
+
+def invalidate_node_trees() -> None:
+    """Forget the keysets indexed for node trees"""
+    _tree_keyset_index.clear()
+
+
+def invalidate_material_users() -> None:
+    global _material_users_index
+    _material_users_index = None
+
+
+def _may_change_material_slots(depsgraph: bpy.types.Depsgraph) -> bool:
+    """
+    Whether the update could have changed which materials objects use. Selection, transform and viewport updates
+    can't, so they leave the material users index alone.
+    """
+    if depsgraph.id_type_updated("MESH") or depsgraph.id_type_updated("MATERIAL"):
+        return True
+    if depsgraph.id_type_updated("OBJECT"):
+        return any(isinstance(update.id, bpy.types.Object) and update.is_updated_geometry
+                   for update in depsgraph.updates)
+    return False
+
+
+def on_depsgraph_update(depsgraph: bpy.types.Depsgraph) -> None:
+    if _may_change_material_slots(depsgraph):
+        invalidate_material_users()
+    if depsgraph.id_type_updated("IMAGE"):
+        invalidate_images([update.id.original.as_pointer() for update in depsgraph.updates
+                           if isinstance(update.id, bpy.types.Image)])
+    if depsgraph.id_type_updated("MATERIAL") or depsgraph.id_type_updated("NODETREE"):
+        invalidate_node_trees()
+
+
+def on_load_post() -> None:
+    invalidate_images()
+    invalidate_kiro_data()
+    invalidate_node_trees()
+    invalidate_material_users()
+
+
+def caches() -> dict[str, cache.Cache]:
+    """The caches used by Kiro, by name, for reporting"""
+    return {"General": _general_cache, "Sidecar data": _data_cache}
+
+
+profiling.add_counter_source("kiro caches", lambda: {
+    f"{name} cache": {"entries": len(c.items), **c.stats.as_dict()} for (name, c) in caches().items()
+})
 
 
 def kiro_images(ignore_cache: bool = False) -> list[types.KiroImageMeta]:
     if not ignore_cache:
-        cached = _general_cache.get("images")
-        if cached: return cached
+        cached = _general_cache.get("images", default=cache.MISSING)
+        if cached is not cache.MISSING: return cached
+
+    if ignore_cache:
+        _image_index.clear()
 
     # TODO: Probably will have to unroll this in order to suppport packed images
-    images = [meta for meta in [kiro_image_meta(image) for image in bpy.data.images] if
+    images = [meta for meta in [_indexed_image_meta(image) for image in bpy.data.images] if
               meta.json_path is not None and meta.image_path is not None]
 
+    if len(_image_index) > len(bpy.data.images):
+        live_pointers = {image.as_pointer() for image in bpy.data.images}
+        for pointer in [p for p in _image_index.keys() if p not in live_pointers]:
+            del _image_index[pointer]
+
     if not ignore_cache:
         _general_cache.set("images", images)
 
     return images
 
 
+def _indexed_image_meta(image: bpy.types.Image) -> types.KiroImageMeta:
+    pointer = image.as_pointer()
+    filepath = image.filepath
+    name_full = image.name_full
+    now = time()
+    entry = _image_index.get(pointer)
+    if entry is not None and entry[0] == filepath and entry[1] == name_full:
+        indexed = entry[3]
+        if indexed.json_path is not None:
+            if exists(indexed.json_path):
+                return indexed
+        elif now - entry[2] < _IMAGE_RECHECK_TIME:
+            return indexed
+    meta = kiro_image_meta(image)
+    _image_index[pointer] = (filepath, name_full, now, meta)
+    return meta
+
+
+def sidecar_path(image_path: str) -> str:
+    """Where the .kiro.json sidecar file for an (absolute) image path would be"""
+    return join(dirname(image_path), re.sub(r'\.[^.]+$', '.kiro.json', basename(image_path)))
+
+
 def kiro_image_meta(image: bpy.types.Image) -> types.KiroImageMeta | None:
     image_path = bpy.path.abspath(image.filepath)
-    json_file_path = join(dirname(image_path), re.sub(r'\.[^.]+$', '.kiro.json', basename(image_path)))
+    json_file_path = sidecar_path(image_path)
     return types.KiroImageMeta(
         name=image.name,
         name_full=image.name_full,
@@ -56,41 +184,145 @@ def kiro_image_meta(image: bpy.types.Image) -> types.KiroImageMeta | None:
     )
 
 
-def kiro_data(json_file_path: str, ignore_cache: bool = False) -> types.KiroMetaData:
+def _file_signature(file_path: str) -> tuple[int | None, int | None]:
+    """Modification time and size of the file, or (None, None) if it cannot be read"""
+    try:
+        stat_result = stat(file_path)
+    except OSError:
+        return None, None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def invalidate_kiro_data(json_file_path: str | None = None) -> None:
+    """Drop cached sidecar data for one file, or for all files, so it is reloaded on next use"""
+    if json_file_path is None:
+        _data_cache.clear()
+    else:
+        _data_cache.discard(json_file_path)
+
+
+def persistent_store() -> disk_cache.DiskCache:
+    """The on-disk store of validated, normalized sidecar data, shared between sessions"""
+    global _persistent_store
+    if _persistent_store is None:
+        directory = environ.get(_PERSISTENT_CACHE_DIR_ENV) or bpy.utils.user_resource("DATAFILES", path="kiro_cache")
+        _persistent_store = disk_cache.DiskCache(directory, "keysets")
+    return _persistent_store
+
+
+def kiro_data_or_raise(json_file_path: str, ignore_cache: bool = False) -> types.KiroMetaData:
+    """
+    Get sidecar data, raising a KiroValidationException if the file is invalid. This does not touch bpy, so it can be
+    called from worker threads, as long as persistent_store() has been called on the main thread first.
+    """
     def load(_):
         try:
-            return metadata.load(json_file_path)
+            return metadata.load(json_file_path, store=persistent_store())
         except metadata.KiroValidationException as e:
             print("Kiro error:", e.msg)
             warn(e.msg)
-            return None
+            raise
 
     return _data_cache.get_or_resolve(
         json_file_path,
         resolver=load,
-        ignore_cache=ignore_cache
+        ignore_cache=ignore_cache,
+        signature=_file_signature(json_file_path)
     )
 
 
-def string_to_tokens(characters: str, space_to_none: bool = False) -> list[str | None]:
+def kiro_data(json_file_path: str, ignore_cache: bool = False) -> types.KiroMetaData | None:
+    """Get sidecar data, or None if the file is invalid or can't be read (e.g., it has been deleted)"""
+    try:
+        return kiro_data_or_raise(json_file_path, ignore_cache=ignore_cache)
+    except (metadata.KiroValidationException, OSError):
+        return None
+
+
+# A [bracketed token] (closed or running to the end of the string) or any other single character. With escapes, a
+# backslash makes the next character literal, outside brackets or inside them.
+_TOKEN_RE = re.compile(r"\[([^\]]*)(\]?)|(.)", re.S)
+_ESCAPED_TOKEN_RE = re.compile(r"\\(.)|\[((?:\\.?|[^\]\\])*)(\]?)|(.)", re.S)
+_UNESCAPE_RE = re.compile(r"\\(.)", re.S)
+
+
+def _iter_token_spans(characters: str, space_to_none: bool,
+                      escapes: bool) -> Iterator[tuple[int, str | None, bool]]:
+    """Yield (character offset, token, whether a bracketed token was closed) for each token in the string"""
+    if escapes:
+        for match in _ESCAPED_TOKEN_RE.finditer(characters):
+            (escaped, bracketed, closing, char) = match.groups()
+            if escaped is not None:
+                yield match.start(), escaped, True
+            elif bracketed is not None:
+                yield match.start(), _UNESCAPE_RE.sub(r"\1", bracketed), bool(closing)
+            else:
+                yield match.start(), None if space_to_none and char == " " else char, True
+        return
+
+    for match in _TOKEN_RE.finditer(characters):
+        (bracketed, closing, char) = match.groups()
+        if bracketed is not None:
+            yield match.start(), bracketed, bool(closing)
+        else:
+            yield match.start(), None if space_to_none and char == " " else char, True
+
+
+def iter_tokens(characters: str, space_to_none: bool = False, escapes: bool = False) -> Iterator[str | None]:
+    """Like string_to_tokens, but yields the tokens one at a time, for very long strings"""
+    for (_, token, _) in _iter_token_spans(characters, space_to_none, escapes):
+        yield token
+
+
+def string_to_tokens(characters: str, space_to_none: bool = False, escapes: bool = False) -> list[str | None]:
+    """
+    Split a string into tokens: each character, or the contents of a [bracketed name]. If space_to_none is set, spaces
+    outside brackets become None (a gap). If escapes is set, a backslash makes the next character literal, so \\[ is a
+    [ key and \\] is a ] key, even inside brackets.
+    """
+    if escapes:
+        return list(iter_tokens(characters, space_to_none, escapes))
+    # findall gives (bracketed, closing bracket, character) for each token, where only single characters set character
+    matches = _TOKEN_RE.findall(characters)
+    if space_to_none:
+        return [(None if char == " " else char) if char else bracketed for (bracketed, _, char) in matches]
+    return [char if char else bracketed for (bracketed, _, char) in matches]
+
+
+def tokenize(characters: str, keyset: types.KiroKeyset, space_to_none: bool = False,
+             escapes: bool = False) -> types.KiroTokens:
+    """
+    Tokenize a string and look its tokens up in the keyset, in one pass. The tokens, normalized tokens and indices are
+    the same as string_to_tokens, normalize_tokens and tokens_to_indices would give.
+    """
     tokens = []
-    in_long_token = False
-    for char in characters:
-        if char == "[" and not in_long_token:
-            in_long_token = True
-            tokens.append("")
-            continue
-        if char == " " and space_to_none and not in_long_token:
-            tokens.append(None)
-            continue
-        if char == "]" and in_long_token:
-            in_long_token = False
+    normalized = []
+    indices = []
+    unknown = []
+    unclosed_at = None
+    # Strings repeat tokens a lot, so each distinct token is only looked up once
+    lookups = {}
+    for (offset, token, closed) in _iter_token_spans(characters, space_to_none, escapes):
+        tokens.append(token)
+        if not closed:
+            unclosed_at = offset
+        if token is None:
+            normalized.append(None)
+            indices.append(None)
             continue
-        if in_long_token:
-            tokens[-1] += char
+        lookup = lookups.get(token)
+        if lookup is None:
+            normalized_token = keyset.normalize_token(token)
+            lookup = lookups[token] = (
+                normalized_token, None if normalized_token is None else keyset.index_of(normalized_token))
+        (normalized_token, index) = lookup
+        if normalized_token is None:
+            unknown.append((offset, token))
             continue
-        tokens.append(char)
-    return tokens
+        normalized.append(normalized_token)
+        if index is not None:
+            indices.append(index)
+    return types.KiroTokens(tokens, normalized, indices, unknown, unclosed_at)
 
 
 def normalize_tokens(tokens, keyset: types.KiroKeyset) -> list[str | None]:
@@ -100,10 +332,9 @@ def normalize_tokens(tokens, keyset: types.KiroKeyset) -> list[str | None]:
             tokens_out.append(None)
             continue
 
-        for variant in [token, token.upper(), token.lower()]:
-            if variant in keyset.keys:
-                tokens_out.append(variant)
-                break
+        normalized = keyset.normalize_token(token)
+        if normalized is not None:
+            tokens_out.append(normalized)
 
     return tokens_out
 
@@ -114,14 +345,46 @@ def tokens_to_indices(normalized_tokens: list[str], keyset: types.KiroKeyset) ->
         if token is None:
             indices.append(None)
             continue
-        try:
-            indices.append(keyset.keys.index(token))
-        except ValueError:
-            pass
+        index = keyset.index_of(token)
+        if index is not None:
+            indices.append(index)
 
     return indices
 
 
+def wrap_keys(indices: list[int | None], normalized_tokens: list[str | None],
+              width: int) -> list[tuple[list[int | None], list[str | None]]]:
+    """
+    Split a row of keys into rows of at most width positions, breaking at gaps (None) where there are any, and
+    splitting words longer than a whole row. Gaps at a break are dropped. A width of 0 or less does not wrap.
+    """
+    length = len(indices)
+    if width <= 0 or length <= width:
+        return [(indices, normalized_tokens)]
+    rows = []
+    start = 0
+    while start < length:
+        end = start + width
+        if end >= length:
+            rows.append((indices[start:], normalized_tokens[start:]))
+            break
+        # Break at the last gap that fits (a gap right after a full row fits), or split the word if there is none
+        row_end = end
+        while row_end > start and indices[row_end] is not None:
+            row_end -= 1
+        if row_end == start:
+            row_end = end
+        # Trailing gaps are dropped along with the one at the break
+        keep_end = row_end
+        while keep_end > start and indices[keep_end - 1] is None:
+            keep_end -= 1
+        rows.append((indices[start:keep_end], normalized_tokens[start:keep_end]))
+        start = row_end
+        while start < length and indices[start] is None:
+            start += 1
+    return rows
+
+
 def index_to_token(index: int, keyset: types.KiroKeyset) -> str:
     return keyset.keys[index] if len(keyset.keys) > index else None
 
@@ -160,7 +423,31 @@ def keysets_by_image(include_alternates: bool = True, ignore_cache: bool = False
     return sets
 
 
-def layouts() -> dict[str, list[str]]:
+def _parse_layout(name: str, layout_data: list | dict) -> types.KiroLayout:
+    """
+    Layouts are {"rows": [...]}, where each row is {"x": start, "y": row, "keys": [...]} (x and y are optional and
+    default to 0 and the row number) and each key is a token, or {"key": token, "x": x, "y": y} to place it elsewhere.
+    Keys without an x follow the previous key, one unit along. A plain list of tokens is a single row.
+    """
+    rows = layout_data["rows"] if isinstance(layout_data, dict) else [{"keys": layout_data}]
+    tokens = []
+    positions = []
+    for (row_number, row) in enumerate(rows):
+        row_y = row.get("y", row_number)
+        x = row.get("x", 0) - 1
+        for key in row["keys"]:
+            if isinstance(key, dict):
+                x = key.get("x", x + 1)
+                tokens.append(key["key"])
+                positions.append((x, key.get("y", row_y)))
+            else:
+                x += 1
+                tokens.append(key)
+                positions.append((x, row_y))
+    return types.KiroLayout(name, tokens, positions)
+
+
+def layouts() -> dict[str, types.KiroLayout]:
     def get_layouts(_):
         layouts_file_path = join(dirname(__file__), "..", "layouts.json")
         if not exists(layouts_file_path):
@@ -171,7 +458,13 @@ def layouts() -> dict[str, list[str]]:
         if "layouts" not in layouts_data:
             print(f"Loading layouts: Invalid JSON")
             return {}
-        return layouts_data["layouts"]
+        parsed = {}
+        for (name, layout_data) in layouts_data["layouts"].items():
+            try:
+                parsed[name] = _parse_layout(name, layout_data)
+            except (KeyError, TypeError, AttributeError) as e:
+                print(f"Loading layouts: Invalid layout {name}:", e)
+        return parsed
 
     return _general_cache.get_or_resolve("layouts", get_layouts)
 
@@ -181,48 +474,121 @@ def get_layout_names() -> list[str]:
     return list(lo.keys())
 
 
-def get_layout(name: str) -> list[str]:
-    los = layouts()
-    if name not in los: return []
-    return los[name]
+def get_layout(name: str) -> types.KiroLayout | None:
+    return layouts().get(name)
 
 
 def layout_sequence(start: int, length: int, layout_name: str, keyset: types.KiroKeyset) -> list[int]:
     if layout_name == "_": return [start]
     lo = get_layout(layout_name)
     first_token = index_to_token(start, keyset)
-    try:
-        first_layout_index = lo.index(first_token.upper())
-    except:
+    first_layout_index = lo.index_of(first_token.upper()) if lo and first_token else None
+    if first_layout_index is None:
         return [start]
-    tokens = lo[first_layout_index:first_layout_index + length:-1 if length < 0 else 1]
+    tokens = list(lo.tokens[first_layout_index:first_layout_index + length:-1 if length < 0 else 1])
     indices = tokens_to_indices(tokens, keyset)
     return indices
 
 
-def detect_wrong_keyset(string: str, keyset: types.KiroKeyset) -> bool:
-    """Detect the wrong keyset by seeing whether every token in the string has a corresponding index from the keyset"""
+def layout_placements(layout_name: str, keyset: types.KiroKeyset, anchor_index: int | None = None) -> \
+        list[tuple[int, tuple[float, float], str, int]]:
+    """
+    (keycap index, (x, y) position, token, layout position) for every key of the layout that is in the keyset. Positions
+    are relative to the anchor keycap's place in the layout, if it has one, or to the first key that is in the keyset.
+    """
+    lo = get_layout(layout_name)
+    if not lo:
+        return []
+
+    found = []
+    for (layout_position, token) in enumerate(lo.tokens):
+        normalized = keyset.normalize_token(token)
+        if normalized is not None:
+            found.append((keyset.index_of(normalized), normalized, layout_position))
+    if not found:
+        return []
 
-    # Ignore unclosed bracketed chars
-    if "[" in string:
-        last_bracket = string.rindex("[")
-        remain = string[last_bracket:]
-        if "]" not in remain:
-            string = string[:last_bracket]
+    anchor_token = index_to_token(anchor_index, keyset) if anchor_index is not None else None
+    anchor_position = lo.index_of(anchor_token.upper()) if anchor_token else None
+    (origin_x, origin_y) = lo.positions[anchor_position if anchor_position is not None else found[0][2]]
 
-    tokens = [t for t in string_to_tokens(string, space_to_none=False) if t not in (" ", "[", "]")]
-    normalized = normalize_tokens(tokens, keyset)
-    return len(tokens) > len(normalized)
+    return [(keycap, (lo.positions[layout_position][0] - origin_x, lo.positions[layout_position][1] - origin_y),
+             token, layout_position) for (keycap, token, layout_position) in found]
 
 
-def _get_keysets_from_group_node(node: bpy.types.Node):
-    # This is a Kiro Grid Picker, so get its Keyset value or fail
-    if "kiro_id" in node.node_tree and node.node_tree["kiro_id"].startswith("GRID_PICKER"):
-        if node.node_tree["kiro_id"] == "GRID_PICKER_0.2" and "Keyset" in node.inputs and node.inputs["Keyset"].default_value:
-            return [node.inputs["Keyset"].default_value]
-        # Incompatible or broken GRID_PICKER
-        return []
-    return util.flatten([n for n in node.node_tree.nodes if n.type == "GROUP"])
+def detect_wrong_keyset(string: str, keyset: types.KiroKeyset, escapes: bool = False) -> bool:
+    """Detect the wrong keyset by seeing whether every token in the string has a corresponding index from the keyset"""
+    return tokenize(string, keyset, escapes=escapes).suggests_wrong_keyset
+
+
+def _grid_picker_keyset(node: bpy.types.Node) -> str | None:
+    """The Keyset of a Kiro Grid Picker group node, or None if it has none or is incompatible or broken"""
+    if node.node_tree["kiro_id"] == "GRID_PICKER_0.2" and "Keyset" in node.inputs and node.inputs["Keyset"].default_value:
+        return node.inputs["Keyset"].default_value
+    return None
+
+
+def _index_node_tree(tree: bpy.types.NodeTree, visiting: set[int]) -> tuple[frozenset[str], bool]:
+    """
+    Find the keysets of the Grid Pickers in a node tree and the groups nested in it, adding them to the index. Returns
+    the keysets, and whether the result is complete (it is not if a group that is still being visited was reached).
+    """
+    pointer = tree.as_pointer()
+    if pointer in _tree_keyset_index:
+        return _tree_keyset_index[pointer], True
+    if pointer in visiting:
+        return frozenset(), False
+
+    visiting.add(pointer)
+    keysets = set()
+    complete = True
+    for node in tree.nodes:
+        if node.type != "GROUP" or node.node_tree is None:
+            continue
+        if "kiro_id" in node.node_tree and node.node_tree["kiro_id"].startswith("GRID_PICKER"):
+            keyset = _grid_picker_keyset(node)
+            if keyset:
+                keysets.add(keyset)
+            continue
+        (group_keysets, group_complete) = _index_node_tree(node.node_tree, visiting)
+        keysets.update(group_keysets)
+        complete = complete and group_complete
+    visiting.discard(pointer)
+
+    result = frozenset(keysets)
+    # Groups are shared between trees, so only a complete result can be reused
+    if complete:
+        _tree_keyset_index[pointer] = result
+    return result, complete
+
+
+def node_tree_keysets(tree: bpy.types.NodeTree) -> frozenset[str]:
+    """The names of the keysets used by Grid Pickers in the node tree, including in nested groups"""
+    return _index_node_tree(tree, set())[0]
+
+
+def _index_material_users() -> dict[int, list[tuple[str, str | None]]]:
+    index = {}
+    for obj in bpy.data.objects:
+        key = (obj.name, obj.library.filepath if obj.library else None)
+        for material in {slot.material for slot in obj.material_slots if slot.material}:
+            index.setdefault(material.as_pointer(), []).append(key)
+    return index
+
+
+def material_users(material: bpy.types.Material) -> list[bpy.types.Object]:
+    """
+    The objects that have the material in one of their material slots. Operators that change material assignments
+    should call invalidate_material_users() before asking again in the same run, as there has been no depsgraph update.
+    """
+    global _material_users_index, _material_users_counts
+    # Objects and materials that were added or removed don't always come with an update that drops the index
+    counts = (len(bpy.data.objects), len(bpy.data.materials))
+    if _material_users_index is None or _material_users_counts != counts:
+        _material_users_index = _index_material_users()
+        _material_users_counts = counts
+    users = [bpy.data.objects.get(key) for key in _material_users_index.get(material.as_pointer(), [])]
+    return [obj for obj in users if obj is not None]
 
 
 def keysets_in_use(obj: bpy.types.Object, ttl: int | None = None) -> list[str]:
@@ -236,8 +602,9 @@ def keysets_in_use(obj: bpy.types.Object, ttl: int | None = None) -> list[str]:
         return list(
             set(util.flatten([keysets_in_use(kiu, ttl if ttl else 20) for kiu in obj.instance_collection.objects])))
 
-    if obj.material_slots:
-        nodes = util.flatten([ms.material.node_tree.nodes for ms in obj.material_slots])
-        return list(set(util.flatten([_get_keysets_from_group_node(n) for n in nodes if n.type == "GROUP"])))
-
-    return []
+    keysets = set()
+    with profiling.phase("keysets_in_use"):
+        for slot in obj.material_slots:
+            if slot.material and slot.material.node_tree:
+                keysets.update(node_tree_keysets(slot.material.node_tree))
+    return list(keysets)
@@ -1,31 +1,76 @@
 from __future__ import annotations
-from warnings import warn
 from ..lib import bootstrap
+from ..lib import cache
+from ..lib import disk_cache
 from ..lib import types
+from ..lib import validator
+from hashlib import sha256
+from itertools import chain
+from threading import RLock
 from os import path
 import json
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (bootstrap, types,):  # list all imports here
+    for mod in (bootstrap, cache, disk_cache, types, validator,):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
-_HAS_JSONSCHEMA = bootstrap.has_module("jsonschema")
-if _HAS_JSONSCHEMA:
-    import jsonschema
-
 _ASSUME_VERSION = 1.0
 
-fp_schema = open(path.join(path.dirname(__file__), "..", "json-schema", "kirofile.schema.json"))
-kirofile_schema = json.load(fp_schema)
-fp_schema.close()
+_SCHEMA_PATH = path.join(path.dirname(__file__), "..", "json-schema", "kirofile.schema.json")
+
+# The schema and validator are loaded on first use, not at import, to keep addon startup fast. See _schema().
+_lazy_lock = RLock()
+_kirofile_schema: dict | None = None
+_schema_hash: str | None = None
+_jsonschema_validator = None
+
+
+def _schema() -> tuple[dict, str]:
+    """
+    The sidecar schema and a hash of it. Persistently cached records are only reused if they were produced under the
+    same schema.
+    """
+    global _kirofile_schema, _schema_hash
+    with _lazy_lock:
+        if _kirofile_schema is None:
+            with open(_SCHEMA_PATH, "rb") as fp_schema:
+                schema_bytes = fp_schema.read()
+            _schema_hash = sha256(schema_bytes).hexdigest()[:16]
+            _kirofile_schema = json.loads(schema_bytes)
+        return _kirofile_schema, _schema_hash
+
+
+def kirofile_schema() -> dict:
+    return _schema()[0]
+
+
+def jsonschema_validator():
+    """
+    The jsonschema validator for the sidecar schema, or None if jsonschema is not installed. It is built once:
+    jsonschema.validate checks the schema against the meta-schema and builds a new validator every time it is called.
+    """
+    global _jsonschema_validator
+    with _lazy_lock:
+        if _jsonschema_validator is None and bootstrap.has_module("jsonschema"):
+            import jsonschema
+            schema = kirofile_schema()
+            validator_class = jsonschema.validators.validator_for(schema)
+            validator_class.check_schema(schema)
+            _jsonschema_validator = validator_class(schema)
+        return _jsonschema_validator
+
+
+# Content hashes of sidecar files that have already passed validation
+_valid_content = cache.Cache(float("inf"), max_entries=1024)
 
 
 class KiroValidationException(Exception):
-    def __init__(self, msg: str | None):
+    def __init__(self, msg: str | None, errors: list[str] | None = None):
         self.msg = msg
+        self.errors = errors if errors is not None else ([msg] if msg else [])
 
     def __str__(self):
         return f"KiroValidationException: {self.msg}"
@@ -53,28 +98,106 @@ def _dict_to_instance(data: dict) -> types.KiroMetaData:
     )
 
 
-def load(path: str) -> types.KiroMetaData:
-    file = open(path)
+def _instance_to_record(instance: types.KiroMetaData) -> dict:
+    """Plain-data form of a KiroMetaData, for persistent caching"""
+    return {
+        "version": instance.version,
+        "name": instance.name,
+        "description": instance.description,
+        "keysets": {
+            name: {
+                "version": ks.version,
+                "cols": ks.cols,
+                "rows": ks.rows,
+                "start": ks.start,
+                "alt_for": ks.alt_for,
+                "keys": None if ks.alt_for else list(ks.keys),
+                "length": ks.length if ks.length_explicit else None,
+                "default_key": ks.default_key,
+            } for (name, ks) in instance.keysets.items()
+        },
+    }
+
+
+def _record_to_instance(record: dict) -> types.KiroMetaData:
+    return types.KiroMetaData(
+        version=record["version"],
+        name=record["name"],
+        description=record["description"],
+        keysets={name: types.KiroKeyset(name=name, **ks) for (name, ks) in record["keysets"].items()},
+    )
+
+
+# Bump this when validation changes beyond what the schema says (e.g., the alt_for checks), so data that was stored
+# under the old rules is checked again
+_VALIDATION_VERSION = 2
+
+
+def _record_key(content_hash: str) -> str:
+    return "-".join([content_hash, _schema()[1], str(_VALIDATION_VERSION)])
+
+
+def load(path: str, store: disk_cache.DiskCache | None = None) -> types.KiroMetaData:
+    """
+    Load, validate and normalize a sidecar file. If a persistent store is given, files whose content has been
+    loaded before (in any session) skip straight to the stored result.
+    """
+    file = open(path, "rb")
     try:
-        json_data = json.load(file)
-    except json.JSONDecodeError as e:
-        raise KiroValidationException("JSON parse error")
+        content = file.read()
     finally:
         file.close()
 
-    validate(json_data, data_name=path)
+    content_hash = sha256(content).hexdigest()
+    if store:
+        record_key = _record_key(content_hash)
+        record = store.get(record_key, default=cache.MISSING)
+        if record is not cache.MISSING:
+            try:
+                return _record_to_instance(record)
+            except (KeyError, TypeError, AttributeError) as e:
+                print(f"Kiro: Ignoring malformed cache record for {path}:", e)
 
-    return _dict_to_instance(json_data)
+    try:
+        json_data = json.loads(content)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise KiroValidationException("JSON parse error")
+
+    validate(json_data, data_name=path, content_hash=content_hash)
+
+    instance = _dict_to_instance(json_data)
+    if store:
+        store.set(record_key, _instance_to_record(instance))
+    return instance
 
 
-def validate(json_data: dict[str, any], data_name: str = "(Unknown)", strict: bool = False):
-    if not _HAS_JSONSCHEMA:
-        warn("Kiro: jsonschema module is not installed. Skipping JSON validation.")
+def _format_error(error) -> str:
+    location = "/".join([str(p) for p in error.absolute_path])
+    return f"{location}: {error.message}" if location else error.message
+
+
+def validate(json_data: dict[str, any], data_name: str = "(Unknown)", strict: bool = False,
+             content_hash: str | None = None):
+    """
+    Validate sidecar data against the schema, raising a KiroValidationException listing every problem found.
+    If content_hash (of the file the data came from) is given, data that has already passed is not checked again.
+    Uses jsonschema if it is installed, or the built-in validator, which gives the same results, if it is not. Either
+    way, alt_for references are checked afterwards.
+    """
+    if content_hash is not None and _valid_content.get(content_hash):
         return True
-    try:
-        jsonschema.validate(json_data, kirofile_schema)
-    except jsonschema.exceptions.ValidationError as e:
-        raise KiroValidationException(f"Kiro file {data_name} failed to validate:\n{e.message}")
+    jsonschema_instance = jsonschema_validator()
+    if jsonschema_instance:
+        all_errors = jsonschema_instance.iter_errors(json_data)
+    else:
+        all_errors = validator.iter_errors(json_data, kirofile_schema())
+    all_errors = chain(all_errors, validator.iter_reference_errors(json_data))
+    errors = sorted(all_errors, key=lambda e: [str(p) for p in e.absolute_path])
+    if errors:
+        messages = [_format_error(e) for e in errors]
+        raise KiroValidationException(f"Kiro file {data_name} failed to validate:\n" + "\n".join(messages), messages)
+    if content_hash is not None:
+        _valid_content.set(content_hash, True)
     return True
 
 
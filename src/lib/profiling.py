@@ -0,0 +1,148 @@
+from collections import deque
+from functools import wraps
+from os import getpid
+from threading import get_ident
+from time import perf_counter_ns
+
+# Phase timings and counter snapshots go into a ring buffer, so profiling can be left on without growing forever. It is
+# off unless switched on in the addon preferences, and when it is off, phase() hands back a shared do-nothing context
+# manager, so instrumented code only pays for a function call.
+
+_BUFFER_SIZE = 10000
+
+enabled = False
+
+# Events are (kind, name, category, start ns, duration ns, thread id, args). kind is "X" for a timed phase or "C" for a
+# counter snapshot, as in the Chrome trace format.
+_events: deque[tuple[str, str, str, int, int, int, dict]] = deque(maxlen=_BUFFER_SIZE)
+
+# Callables that return {counter group name: {counter: value}}, snapshotted after phases that ask for it
+_counter_sources: dict[str, callable] = {}
+
+
+class _Phase:
+    __slots__ = ("name", "category", "args", "counters", "start")
+
+    def __init__(self, name: str, category: str, counters: bool, args: dict):
+        self.name = name
+        self.category = category
+        self.counters = counters
+        self.args = args
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = perf_counter_ns()
+        _events.append(("X", self.name, self.category, self.start, end - self.start, get_ident(), self.args))
+        if self.counters:
+            record_counters(end)
+        return False
+
+
+class _NoPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str, category: str = "kiro", counters: bool = False, **args) -> _Phase | _NoPhase:
+    """
+    Time a block with `with profiling.phase("name"):`, if profiling is enabled. Keyword arguments are kept with the
+    timing. If counters is set, the counter sources are snapshotted when the block ends.
+    """
+    if not enabled:
+        return _NO_PHASE
+    return _Phase(name, category, counters, args)
+
+
+def profiled(name: str, category: str = "operator") -> callable:
+    """
+    Decorator that times every call of the function as a phase, and snapshots the counter sources afterwards
+
+    Operator callbacks get a wrapper with the same (self, context) or (self, context, event) arguments, as Blender
+    checks their argument count when the class is registered.
+    """
+
+    def decorate(fn: callable) -> callable:
+        def timed(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with _Phase(name, category, True, {}):
+                return fn(*args, **kwargs)
+
+        arg_count = fn.__code__.co_argcount
+        if arg_count == 2:
+            def wrapper(self, context):
+                return timed(self, context)
+        elif arg_count == 3:
+            def wrapper(self, context, event):
+                return timed(self, context, event)
+        else:
+            wrapper = timed
+
+        return wraps(fn)(wrapper)
+
+    return decorate
+
+
+def add_counter_source(name: str, source: callable) -> None:
+    """Register (or replace) a callable returning {group name: {counter: value}} to snapshot with counters=True"""
+    _counter_sources[name] = source
+
+
+def record_counters(timestamp: int | None = None) -> None:
+    timestamp = timestamp if timestamp is not None else perf_counter_ns()
+    for source in _counter_sources.values():
+        for (group, values) in source().items():
+            _events.append(("C", group, "counters", timestamp, 0, get_ident(), values))
+
+
+def clear() -> None:
+    _events.clear()
+
+
+def events() -> list[tuple[str, str, str, int, int, int, dict]]:
+    return list(_events)
+
+
+def text_report() -> str:
+    recorded = events()
+    lines = [f"Kiro profile: {len(recorded)} events (the last {_BUFFER_SIZE} are kept)"]
+    if not recorded:
+        return "\n".join(lines)
+    first = min(event[3] for event in recorded)
+    thread_numbers = {}
+    lines += [
+        "",
+        f"{'start (ms)':>12} | {'duration (ms)':>13} | {'thread':>6} | {'category':<10} | name",
+        "-" * 80,
+    ]
+    for (kind, name, category, start, duration, thread, args) in recorded:
+        thread_number = thread_numbers.setdefault(thread, len(thread_numbers))
+        details = ", ".join(f"{k}={v}" for (k, v) in args.items())
+        duration_text = f"{duration / 1e6:>13.3f}" if kind == "X" else " " * 13
+        lines.append(f"{(start - first) / 1e6:>12.3f} | {duration_text} | {thread_number:>6} | {category:<10} | {name}"
+                     + (f" ({details})" if details else ""))
+    return "\n".join(lines)
+
+
+def chrome_trace() -> dict:
+    """The recorded events as a Chrome trace (load it in chrome://tracing or Perfetto)"""
+    pid = getpid()
+    trace_events = []
+    for (kind, name, category, start, duration, thread, args) in events():
+        event = {"name": name, "cat": category, "ph": kind, "ts": start / 1000, "pid": pid, "tid": thread,
+                 "args": args}
+        if kind == "X":
+            event["dur"] = duration / 1000
+        trace_events.append(event)
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
@@ -1,17 +1,23 @@
 import bpy
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from os.path import exists
 from . import metadata
 from . import kiro
+from . import profiling
 from . import types
-from . import bootstrap
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (metadata, kiro, types):  # list all imports here
+    for mod in (metadata, kiro, profiling, types):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
+# Checking sidecars is mostly waiting on (possibly network) storage, so this can be more than the number of cores
+_MAX_WORKERS = 8
+
 
 class ImageReporter():
     is_valid_json: bool
@@ -19,87 +25,147 @@ class ImageReporter():
     kiro_meta: types.KiroImageMeta | None
     kiro_data: types.KiroMetaData
 
-    def __init__(self, full_name: str):
-        self.kiro_meta = kiro.kiro_image_meta(bpy.data.images[full_name])
+    def __init__(self, name: str, name_full: str, image_path: str):
+        """Check one image's sidecar file. This does not touch bpy, so it can run in a worker thread."""
+        with profiling.phase("check sidecar", image=name_full):
+            self._check(name, name_full, image_path)
+
+    def _check(self, name: str, name_full: str, image_path: str):
+        json_path = kiro.sidecar_path(image_path)
+        self.kiro_meta = types.KiroImageMeta(
+            name=name,
+            name_full=name_full,
+            image_path=image_path if image_path else None,
+            json_path=json_path if exists(json_path) else None
+        )
+        self.is_valid_json = True
+        self.validation_error = None
         if self.kiro_meta.json_path:
             try:
-                kiro_data = metadata.load(self.kiro_meta.json_path)
-                self.is_valid_json = True
-                self.validation_error = None
+                kiro.kiro_data_or_raise(self.kiro_meta.json_path)
             except metadata.KiroValidationException as e:
                 self.is_valid_json = False
                 self.validation_error = e.msg
-        else:
-            self.is_valid_json = True
-            self.validation_error = None
+            except OSError as e:
+                self.is_valid_json = False
+                self.validation_error = f"The file could not be read: {e}"
 
 
 def _nstr(val: str | None):
     return "" if val is None else val
 
 
-def generate():
-    reports = [ImageReporter(i) for i in bpy.data.images.keys()]
-    has_jsonschema = bootstrap.has_module("jsonschema")
-
-    name_pad = max([len(_nstr(r.kiro_meta.name_full)) for r in reports] + [len("Image ID")])
-    path_pad = max([len(_nstr(r.kiro_meta.image_path)) for r in reports] + [len("Image Path")])
-
+class Report:
+    """
+    A report in progress. It must be created on the main thread. Images are checked in a pool of worker threads, and
+    their rows are collected, in the order they finish, with poll().
+    """
     has_json_str = ["No", "YES"]
-    has_json_pad = max([len(s) for s in has_json_str] + [len("Has Kiro JSON?")])
-
     json_valid_str = ["INVALID JSON", "ok", "n/a"]
-    json_valid_pad = max([len(s) for s in json_valid_str] + [len("Is JSON Valid?")])
-
-    width = name_pad + path_pad + has_json_pad + json_valid_pad + 10
-
-    output = ["Kiro Image report generated " + datetime.now().strftime("%c")]
 
-    if not has_jsonschema:
-        output.append("")
-        output.append("NOTICE:")
-        output.append("The jsonschema Python package is not installed, so Kiro JSON files cannot be checked for validity.")
-        output.append("The package can be installed using the button in the Preferences panel for this addon.")
-
-    output += [
-        "",
-        "=" * width,
-        " | ".join(
-            [
-                "Image ID".ljust(name_pad),
-                "Has Kiro JSON?".ljust(has_json_pad),
-                "Is JSON Valid?".ljust(json_valid_pad),
-                "Image Path".ljust(path_pad)
-            ]
-        ),
-        "=" * width
-    ]
-
-
-    for r in reports:
-        cols = [r.kiro_meta.name_full.ljust(name_pad)]
+    def __init__(self):
+        images = [(i.name, i.name_full, bpy.path.abspath(i.filepath)) for i in bpy.data.images]
+
+        # Everything needed for the column widths is known before any file is checked, so the header can be written
+        # straight away.
+        self.name_pad = max([len(image[1]) for image in images] + [len("Image ID")])
+        self.path_pad = max([len(image[2]) for image in images] + [len("Image Path")])
+        self.has_json_pad = max([len(s) for s in self.has_json_str] + [len("Has Kiro JSON?")])
+        self.json_valid_pad = max([len(s) for s in self.json_valid_str] + [len("Is JSON Valid?")])
+        self.width = self.name_pad + self.path_pad + self.has_json_pad + self.json_valid_pad + 10
+        self.total = len(images)
+        self.finished_count = 0
+
+        # The store is set up here, as it needs bpy, so the workers can use it
+        kiro.persistent_store()
+        self._executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="kiro_report")
+        self._pending = {self._executor.submit(ImageReporter, *image) for image in images}
+
+    @property
+    def finished(self) -> bool:
+        return not self._pending
+
+    def header(self) -> list[str]:
+        return [
+            "Kiro Image report generated " + datetime.now().strftime("%c"),
+            "",
+            "=" * self.width,
+            " | ".join(
+                [
+                    "Image ID".ljust(self.name_pad),
+                    "Has Kiro JSON?".ljust(self.has_json_pad),
+                    "Is JSON Valid?".ljust(self.json_valid_pad),
+                    "Image Path".ljust(self.path_pad)
+                ]
+            ),
+            "=" * self.width
+        ]
+
+    def poll(self, wait: bool = False) -> list[str]:
+        """Rows for the images that have finished since the last poll. If wait is set, wait for at least one."""
+        if wait and self._pending:
+            futures.wait(self._pending, return_when=futures.FIRST_COMPLETED)
+        done = [f for f in self._pending if f.done()]
+        self._pending.difference_update(done)
+        self.finished_count += len(done)
+        if self.finished:
+            self._executor.shutdown(wait=False)
+        return [self._row(f.result()) for f in done if not f.cancelled()]
+
+    def cancel(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+
+    def footer(self) -> list[str]:
+        return ["", ""] + cache_report()
+
+    def _row(self, r: ImageReporter) -> str:
+        cols = [r.kiro_meta.name_full.ljust(self.name_pad)]
         if r.kiro_meta.json_path:
-            cols.append(has_json_str[1].ljust(has_json_pad))
-            if has_jsonschema:
-                cols.append((json_valid_str[1] if r.is_valid_json else json_valid_str[0]).ljust(json_valid_pad))
-            else:
-                cols.append(json_valid_str[2].ljust(json_valid_pad))
+            cols.append(self.has_json_str[1].ljust(self.has_json_pad))
+            cols.append((self.json_valid_str[1] if r.is_valid_json else self.json_valid_str[0]).ljust(
+                self.json_valid_pad))
         else:
-            cols.append(has_json_str[0].ljust(has_json_pad))
-            cols.append(json_valid_str[2].ljust(json_valid_pad))
-        cols.append((r.kiro_meta.image_path if r.kiro_meta.image_path else "").ljust(path_pad))
+            cols.append(self.has_json_str[0].ljust(self.has_json_pad))
+            cols.append(self.json_valid_str[2].ljust(self.json_valid_pad))
+        cols.append(_nstr(r.kiro_meta.image_path).ljust(self.path_pad))
 
         line = " | ".join(cols)
 
         if not r.is_valid_json:
-            line += "\n" + ("-" * width) + "\n"
+            line += "\n" + ("-" * self.width) + "\n"
             line += r.validation_error
-        elif r.kiro_meta.json_path and not has_jsonschema:
-            line += "\n" + ("-" * width) + "\n"
-            line += "There is a .kiro.json file, but it cannot be validated because the jsonschema package is not installed."
 
-        line += "\n" + ("=" * width)
+        line += "\n" + ("=" * self.width)
 
-        output.append(line)
+        return line
 
+
+def generate() -> str:
+    """Generate the whole report, blocking until every image has been checked"""
+    report = Report()
+    output = report.header()
+    while not report.finished:
+        output += report.poll(wait=True)
+    output += report.footer()
     return "\n".join(output)
+
+
+def cache_report() -> list[str]:
+    columns = ["Cache", "Entries", "Size (bytes)", "Hits", "Failed hits", "Misses", "Timeouts", "Stale", "Evictions",
+               "Resolves", "Shared resolves", "Resolver time (s)"]
+    rows = []
+    for (name, cache) in kiro.caches().items():
+        stats = cache.stats
+        rows.append([name, str(len(cache.items)), str(cache.size), str(stats.hits), str(stats.negative_hits),
+                     str(stats.misses), str(stats.timeouts), str(stats.stale), str(stats.evictions),
+                     str(stats.resolves), str(stats.shared_resolves), f"{stats.resolver_time:.4f}"])
+    pads = [max([len(c)] + [len(row[idx]) for row in rows]) for (idx, c) in enumerate(columns)]
+    width = sum(pads) + 3 * (len(pads) - 1)
+
+    return [
+        "Cache statistics",
+        "=" * width,
+        " | ".join([c.ljust(pad) for (c, pad) in zip(columns, pads)]),
+        "=" * width,
+    ] + [" | ".join([c.ljust(pad) for (c, pad) in zip(row, pads)]) for row in rows]
@@ -1,7 +1,14 @@
 from __future__ import annotations
+from sys import intern
 from warnings import warn
 
+# These classes use __slots__, as there can be a lot of them (and a lot of keys) when many sidecars are loaded. Key
+# tokens are interned, so a token that appears in many keysets is only stored once.
+
+
 class KiroMetaData:
+    __slots__ = ("version", "name", "description", "keysets")
+
     version: float
     name: str
     description: str
@@ -17,6 +24,9 @@ class KiroMetaData:
 
 
 class KiroKeyset:
+    __slots__ = ("version", "name", "cols", "rows", "start", "length", "length_explicit", "default_key", "alt_for",
+                 "parent", "_keys", "_key_index")
+
     version: float
     name: str
     cols: int
@@ -28,23 +38,50 @@ class KiroKeyset:
     alt_for: str
     parent: KiroMetaData
 
-    @property
-    def keys(self) -> list[str]:
+    def _primary(self) -> KiroKeyset | None:
+        """The keyset that holds the keys for this keyset: itself, or the keyset it is an alt_for"""
         if not self.alt_for:
-            return self._keys
+            return self
         if not self.parent:
             raise Exception("Reference to KiroKeyset alt_for was performed but parent was not set")
         if not self.parent.keysets or self.alt_for not in self.parent.keysets:
             warn(RuntimeWarning(f"Kiro Keyset {self.name} is an alternative for {self.alt_for} but {self.alt_for}"
                                 f" does not exist"))
-            return []
+            return None
         if self.parent.keysets[self.alt_for].alt_for:
             raise Exception(f"Kiro Keyset {self.name} alt_for references {self.alt_for} which itself has an alt_for."
                             f" Multiple levels of alt_for reference are not supported.")
+        return self.parent.keysets[self.alt_for]
+
+    @property
+    def keys(self) -> tuple[str | None, ...]:
+        primary = self._primary()
+        return primary._keys if primary else ()
 
     @keys.setter
-    def keys(self, value: list[str]):
-        self._keys = value
+    def keys(self, value: list[str | None] | tuple[str | None, ...] | None):
+        self._keys = None if value is None else tuple(None if key is None else intern(key) for key in value)
+        # First index of each key, as tuple.index would find it
+        self._key_index = {}
+        for (index, key) in enumerate(self._keys if self._keys else ()):
+            if key is not None:
+                self._key_index.setdefault(key, index)
+
+    def index_of(self, token: str) -> int | None:
+        """Index of the token in the keyset (or the keyset it is an alt_for), or None if it is not there"""
+        primary = self._primary()
+        return primary._key_index.get(token) if primary else None
+
+    def normalize_token(self, token: str) -> str | None:
+        """The token as it appears in the keyset, trying it as-is, then uppercase, then lowercase"""
+        primary = self._primary()
+        if not primary:
+            return None
+        key_index = primary._key_index
+        for variant in (token, token.upper(), token.lower()):
+            if variant in key_index:
+                return variant
+        return None
 
     def __init__(
             self,
@@ -59,6 +96,7 @@ class KiroKeyset:
             version: float = 1.0,
     ):
         self.name = name
+        self.parent = None
         self.cols = cols
         self.rows = rows
         self.start = start
@@ -71,6 +109,8 @@ class KiroKeyset:
 
 
 class KiroImageMeta:
+    __slots__ = ("name", "name_full", "image_path", "json_path")
+
     name: str
     name_full: str
     image_path: str | None
@@ -81,3 +121,56 @@ class KiroImageMeta:
         self.name_full = name_full
         self.image_path = image_path
         self.json_path = json_path
+
+
+class KiroLayout:
+    __slots__ = ("name", "tokens", "positions", "_token_index")
+
+    name: str
+    tokens: tuple[str, ...]
+    positions: tuple[tuple[float, float], ...]
+
+    def __init__(self, name: str, tokens: list[str], positions: list[tuple[float, float]]):
+        """
+        A keyboard layout: its tokens in sequence, and the (x, y) position of each, in key units, with y increasing
+        from row to row
+        """
+        self.name = name
+        self.tokens = tuple(intern(token) for token in tokens)
+        self.positions = tuple(positions)
+        # First position of each token, as tuple.index would find it
+        self._token_index = {}
+        for (index, token) in enumerate(self.tokens):
+            self._token_index.setdefault(token, index)
+
+    def index_of(self, token: str) -> int | None:
+        """Position of the token in the layout sequence, or None if it is not there"""
+        return self._token_index.get(token)
+
+
+class KiroTokens:
+    __slots__ = ("tokens", "normalized", "indices", "unknown", "unclosed_at")
+
+    tokens: list[str | None]
+    normalized: list[str | None]
+    indices: list[int | None]
+    unknown: list[tuple[int, str]]
+    unclosed_at: int | None
+
+    def __init__(self, tokens: list[str | None], normalized: list[str | None], indices: list[int | None],
+                 unknown: list[tuple[int, str]], unclosed_at: int | None):
+        """
+        A string tokenized against a keyset: every token, the tokens the keyset knows (normalized) and their key
+        indices, the (character offset, token) of each token the keyset doesn't know, and the character offset of a
+        [bracketed token at the end that hasn't been closed yet, if there is one
+        """
+        self.tokens = tokens
+        self.normalized = normalized
+        self.indices = indices
+        self.unknown = unknown
+        self.unclosed_at = unclosed_at
+
+    @property
+    def suggests_wrong_keyset(self) -> bool:
+        """Whether any token, aside from spaces, stray brackets, or a [bracketed token still being typed, is unknown"""
+        return any(token not in (" ", "[", "]") and offset != self.unclosed_at for (offset, token) in self.unknown)
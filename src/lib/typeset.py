@@ -1,17 +1,262 @@
 import bpy
 import re
+from typing import Iterable
+from uuid import uuid4
 from mathutils import Vector
+from . import bootstrap
 from . import boxer
+from . import profiling
 
+if "_LOADED" in locals():
+    import importlib
 
-def _make_guide_wire(name: str, points: list[Vector], target: bpy.types.Collection) -> bpy.types.Object:
-    mesh = bpy.data.meshes.new(name)
+    for mod in (bootstrap, boxer, profiling,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+# NumPy ships with Blender, but the pure-Python path is kept for builds without it
+_HAS_NUMPY = bootstrap.has_module("numpy")
+if _HAS_NUMPY:
+    import numpy
+
+# ID properties that tie generated keys back to the run (and original) they were made from
+RUN_ID = "kiro_run"
+RUN_POSITION = "kiro_run_position"
+RUN_ORIGIN = "kiro_run_origin"
+RUN_SPACING = "kiro_run_spacing"
+
+# How many keys typeset_rows makes at once
+TEXT_CHUNK_SIZE = 2000
+
+
+def _fill_wire_python(mesh: bpy.types.Mesh, points: list[Vector]) -> None:
     mesh.from_pydata(points, [(n, n + 1) for n in range(len(points) - 1)], [])
+
+
+def _fill_wire_numpy(mesh: bpy.types.Mesh, points) -> None:
+    """Same as _fill_wire_python, but writes the vertices and edges as arrays (points can be a list or an array)"""
+    coords = numpy.asarray(points, dtype=numpy.float32).reshape(-1, 3)
+    count = len(coords)
+    mesh.vertices.add(count)
+    mesh.vertices.foreach_set("co", coords.ravel())
+    if count > 1:
+        mesh.edges.add(count - 1)
+        starts = numpy.arange(count - 1, dtype=numpy.int32)
+        mesh.edges.foreach_set("vertices", numpy.column_stack((starts, starts + 1)).ravel())
+    mesh.update()
+
+
+def _make_guide_wire(name: str, points, target: bpy.types.Collection) -> bpy.types.Object:
+    mesh = bpy.data.meshes.new(name)
+    if _HAS_NUMPY:
+        _fill_wire_numpy(mesh, points)
+    else:
+        _fill_wire_python(mesh, points)
     object = bpy.data.objects.new(name, mesh)
     target.objects.link(object)
     return object
 
 
+def _make_instancer_node_group(name: str, original: bpy.types.Object) -> bpy.types.NodeTree:
+    """Make a Geometry Nodes group that instances the original on every incoming point"""
+    group = bpy.data.node_groups.new(name, "GeometryNodeTree")
+    if hasattr(group, "interface"):
+        # Blender 4.0+
+        group.interface.new_socket("Geometry", in_out="INPUT", socket_type="NodeSocketGeometry")
+        group.interface.new_socket("Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry")
+    else:
+        group.inputs.new("NodeSocketGeometry", "Geometry")
+        group.outputs.new("NodeSocketGeometry", "Geometry")
+
+    nodes = group.nodes
+    group_input = nodes.new("NodeGroupInput")
+    group_output = nodes.new("NodeGroupOutput")
+    object_info = nodes.new("GeometryNodeObjectInfo")
+    object_info.transform_space = "ORIGINAL"
+    object_info.inputs["Object"].default_value = original
+    instance_on_points = nodes.new("GeometryNodeInstanceOnPoints")
+
+    group_input.location.x -= 400
+    object_info.location = (-200, -150)
+    group_output.location.x += 250
+
+    # Point attributes (including "keycap") are carried over to the instance domain, where the Grid Picker's
+    # INSTANCER Attribute node picks them up. They are not on the evaluated object's mesh, which has no points.
+    links = group.links
+    links.new(group_input.outputs[0], instance_on_points.inputs["Points"])
+    links.new(object_info.outputs["Geometry"], instance_on_points.inputs["Instance"])
+    links.new(object_info.outputs["Rotation"], instance_on_points.inputs["Rotation"])
+    links.new(object_info.outputs["Scale"], instance_on_points.inputs["Scale"])
+    links.new(instance_on_points.outputs["Instances"], group_output.inputs[0])
+    return group
+
+
+def _offset_direction(direction: str) -> Vector:
+    try:
+        return Vector({
+                          "x": (-1 if direction[0] == "-" else 1, 0, 0),
+                          "y": (0, -1 if direction[0] == "-" else 1, 0),
+                          "z": (0, 0, -1 if direction[0] == "-" else 1)
+                      }[direction[1].lower()])
+    except IndexError:
+        print("Invalid direction argument passed to extend_from_original. Assuming \"+x\".", direction)
+        return Vector((1, 0, 0))
+
+
+def key_dimensions(original: bpy.types.Object) -> Vector:
+    dimensions = original.dimensions
+    if not [d for d in dimensions if d != 0.0]:
+        box = boxer.get_extremes(original, False)
+        dimensions = box[1] - box[0]
+    return dimensions
+
+
+def compute_offsets(
+        original: bpy.types.Object,
+        indices: list[int | None],
+        gap: float = 0,
+        space_gap: float = 0,
+        direction: str = "+x",
+) -> list[Vector]:
+    """Offsets of every position in the run, relative to the original"""
+    with profiling.phase("compute offsets", keys=len(indices)):
+        offset_direction = _offset_direction(direction)
+        offset_vector = (key_dimensions(original) + Vector((gap,) * 3)) * offset_direction
+        space_offset_vector = offset_vector + (Vector((space_gap,) * 3) * offset_direction)
+
+        current_offset = Vector((0, 0, 0))
+        offsets = [current_offset]
+        for keycap in indices[1:]:
+            current_offset = current_offset + (offset_vector if keycap is not None else space_offset_vector)
+            offsets.append(current_offset)
+    return offsets
+
+
+def _offsets_array(
+        original: bpy.types.Object,
+        indices: list[int | None],
+        gap: float = 0,
+        space_gap: float = 0,
+        direction: str = "+x",
+) -> "numpy.ndarray":
+    """compute_offsets as an (n, 3) array, taken as a cumulative sum of the step to each position"""
+    with profiling.phase("compute offsets", keys=len(indices)):
+        offset_direction = numpy.array(_offset_direction(direction))
+        offset_vector = (numpy.array(key_dimensions(original)) + gap) * offset_direction
+        space_offset_vector = offset_vector + space_gap * offset_direction
+
+        # Steps are chosen the same way compute_offsets chooses them
+        is_key = numpy.fromiter((keycap is not None for keycap in indices[1:]), dtype=bool, count=len(indices) - 1)
+        steps = numpy.where(is_key[:, numpy.newaxis], offset_vector, space_offset_vector)
+        offsets = numpy.zeros((len(indices), 3))
+        numpy.cumsum(steps, axis=0, out=offsets[1:])
+    return offsets
+
+
+def key_names(original: bpy.types.Object, indices: list[int | None],
+              normalized_tokens: list[str] | None = None) -> list[str | None]:
+    """Names for every position in the run, or None where the copy should keep its automatic name"""
+    if len(normalized_tokens if normalized_tokens else []) != len(indices):
+        return [None] * len(indices)
+    name_base = re.sub(r'\.\d+', '', original.name)
+    return [
+        f"{name_base} ({token if token is not None else f'idx:{keycap}'})"
+        for (token, keycap) in zip(normalized_tokens, indices)
+    ]
+
+
+class LinkBatch:
+    """
+    While a LinkBatch is open (`with typeset.LinkBatch():`), create_keycaps holds on to the copies it makes instead
+    of linking them, and they are all linked, then deselected, when it closes. This lets many runs share one view
+    layer resync, as create_keycaps does for the keys of one run. Opening a LinkBatch inside another does nothing.
+    """
+
+    def __init__(self):
+        self._pending: dict[bpy.types.Collection, list[bpy.types.Object]] = {}
+        self._active = False
+
+    def __enter__(self):
+        global _link_batch
+        if _link_batch is None:
+            _link_batch = self
+            self._active = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _link_batch
+        if not self._active:
+            return False
+        _link_batch = None
+        self._active = False
+        pending = self._pending
+        self._pending = {}
+        # If the batch failed partway, the copies are still linked, so nothing is left orphaned
+        _link_and_deselect(pending)
+        return False
+
+    def add(self, copies: list[bpy.types.Object], target: bpy.types.Collection) -> None:
+        self._pending.setdefault(target, []).extend(copies)
+
+
+_link_batch: LinkBatch | None = None
+
+
+def _link_and_deselect(copies_by_target: dict[bpy.types.Collection, list[bpy.types.Object]]) -> None:
+    keys = sum(len(copies) for copies in copies_by_target.values())
+    with profiling.phase("link objects", keys=keys):
+        for (target, copies) in copies_by_target.items():
+            link = target.objects.link
+            for new_copy in copies:
+                link(new_copy)
+
+    # Need to deselect all but the original, or the poll fails because more than one object is selected
+    with profiling.phase("deselect objects", keys=keys):
+        for copies in copies_by_target.values():
+            for new_copy in copies:
+                new_copy.select_set(False)
+
+
+def create_keycaps(
+        original: bpy.types.Object,
+        placements: list[tuple[int, Vector | None, str | None, int]],
+        target: bpy.types.Collection,
+        parent: bpy.types.Object | None = None,
+) -> list[bpy.types.Object]:
+    """
+    Create a copy of the original for every (keycap, offset, name, run position) placement.
+    All copies are made before any of them is linked, then linked and deselected in separate passes. Selecting an
+    object forces the view layer to resync, so interleaving link() and select_set() makes every key pay for a resync
+    of every key before it.
+    If a parent (guide wire) is given, each copy is parented to the parent's vertex for its run position as it is
+    made, and the offset is not used. Inside a LinkBatch, linking is left to the batch.
+    """
+    base_location = original.location.copy()
+    copy = original.copy
+    copies = []
+    with profiling.phase("create objects", keys=len(placements)):
+        for (keycap, offset, name, position) in placements:
+            new_copy = copy()
+            if parent is None:
+                new_copy.location = base_location + offset
+            else:
+                new_copy.parent = parent
+                new_copy.parent_type = "VERTEX"
+                new_copy.parent_vertices[0] = position
+                new_copy.location = (0, 0, 0)
+            if name is not None:
+                new_copy.name = name
+            new_copy['keycap'] = keycap
+            new_copy[RUN_POSITION] = position
+            copies.append(new_copy)
+
+    if _link_batch is not None:
+        _link_batch.add(copies, target)
+    else:
+        _link_and_deselect({target: copies})
+    return copies
+
+
 def extend_from_original(
         original: bpy.types.Object,
         indices: list[int],
@@ -25,60 +270,279 @@ def extend_from_original(
     if not indices:
         return [original]
 
-    try:
-        offset_direction = Vector({
-                                      "x": (-1 if direction[0] == "-" else 1, 0, 0),
-                                      "y": (0, -1 if direction[0] == "-" else 1, 0),
-                                      "z": (0, 0, -1 if direction[0] == "-" else 1)
-                                  }[direction[1].lower()])
-    except IndexError:
-        offset_direction = Vector((1, 0, 0))
-        print("Invalid direction argument passed to extend_from_original. Assuming \"+x\".", direction)
+    # Precompute offsets and names so they can be used by placement, naming and wire-creation
+    if guide_wire and _HAS_NUMPY:
+        offsets = _offsets_array(original, indices, gap=gap, space_gap=space_gap, direction=direction)
+    else:
+        offsets = compute_offsets(original, indices, gap=gap, space_gap=space_gap, direction=direction)
+    names = key_names(original, indices, normalized_tokens)
 
-    # Precompute offsets so they can be used by both placement and wire-creation
-    current_offset = Vector((0, 0, 0))
-    offsets = [current_offset]
+    copy_positions = [position for (position, keycap) in enumerate(indices) if keycap is not None and position != 0]
 
-    dimensions = original.dimensions
-    if not [d for d in dimensions if d != 0.0]:
-        box = boxer.get_extremes(original, False)
-        dimensions = box[1] - box[0]
+    # Copies inherit the run tags from the original
+    _tag_run(original, gap=gap, space_gap=space_gap, direction=direction, claimable=not guide_wire)
+
+    wire = None
+    if guide_wire:
+        # The wire is made first, so copies can be parented to it as they are made, rather than in another pass
+        with profiling.phase("guide wire", keys=len(indices)):
+            wire = _make_guide_wire("KeycapWire", offsets, target)
+            wire.location = original.location.copy()
+
+    copies = create_keycaps(
+        original,
+        [(indices[position], None if wire is not None else offsets[position], names[position], position)
+         for position in copy_positions],
+        target,
+        parent=wire,
+    )
+
+    objects = []
+    if indices[0] is not None:
+        original['keycap'] = indices[0]
+        if wire is not None:
+            original.parent = wire
+            original.parent_type = "VERTEX"
+            original.location = (0, 0, 0)
+            original.parent_vertices[0] = 0
+        objects.append(original)
+    objects.extend(copies)
+
+    return objects
+
+
+def layout_from_original(
+        original: bpy.types.Object,
+        placements: list[tuple[int, tuple[float, float], str, int]],
+        target: bpy.types.Collection,
+        gap: float = 0,
+        row_gap: float = 0,
+) -> list[bpy.types.Object]:
+    """
+    Lay out a whole keyboard from the original in one batch. Placements are (keycap, (x, y) in key units, token, layout
+    position), as from kiro.layout_placements, relative to the original. Rows run toward -Y. A key placed at (0, 0) is
+    the original itself.
+    """
+    if not placements:
+        return [original]
+
+    dimensions = key_dimensions(original)
+    unit_x = dimensions.x + gap
+    unit_y = dimensions.y + row_gap
+    name_base = re.sub(r'\.\d+', '', original.name)
+
+    # A layout is not a run that can be updated, but the copies would otherwise inherit the tags of the original's
+    # last run
+    _tag_run(original, gap=gap, space_gap=row_gap, direction="layout", claimable=False)
+
+    objects = []
+    copy_placements = []
+    for (keycap, (x, y), token, layout_position) in placements:
+        if x == 0 and y == 0 and not objects:
+            original['keycap'] = keycap
+            objects.append(original)
+            continue
+        # Run positions start at 1, as 0 is the original
+        copy_placements.append((keycap, Vector((x * unit_x, -y * unit_y, 0)), f"{name_base} ({token})",
+                                layout_position + 1))
+
+    objects.extend(create_keycaps(original, copy_placements, target))
+    return objects
+
+
+def typeset_rows(
+        original: bpy.types.Object,
+        rows: Iterable[tuple[list[int | None], list[str | None]]],
+        target: bpy.types.Collection,
+        gap: float = 0,
+        space_gap: float = 0,
+        row_gap: float = 0,
+        direction: str = "+x",
+        row_direction: str = "-y",
+        chunk_size: int = TEXT_CHUNK_SIZE,
+) -> int:
+    """
+    Typeset rows of (indices, normalized tokens), such as the lines of a text, with keys running along direction and
+    rows stepping along row_direction. The original is the first position of the first row. Rows are read as they come
+    and keys are made chunk_size at a time, so only one chunk of placements is held at once, however long the text.
+    Returns the number of keys made.
+    """
+    dimensions = key_dimensions(original)
+    offset_direction = _offset_direction(direction)
     offset_vector = (dimensions + Vector((gap,) * 3)) * offset_direction
     space_offset_vector = offset_vector + (Vector((space_gap,) * 3) * offset_direction)
-    for keycap in indices[1:]:
-        current_offset = current_offset + (offset_vector if keycap else space_offset_vector)
-        offsets.append(current_offset)
+    row_vector = (dimensions + Vector((row_gap,) * 3)) * _offset_direction(row_direction)
+    name_base = re.sub(r'\.\d+', '', original.name)
+
+    # Like a layout, typeset text is not a run that can be updated
+    _tag_run(original, gap=gap, space_gap=space_gap, direction=f"text {direction} {row_direction}", claimable=False)
+
+    made = 0
+    # Run positions count every position of every row, starting at 1 as 0 is the original
+    position = 0
+    chunk = []
+    for (row, (indices, normalized_tokens)) in enumerate(rows):
+        offset = row_vector * row
+        for (column, (keycap, token)) in enumerate(zip(indices, normalized_tokens)):
+            if column:
+                offset = offset + (offset_vector if keycap is not None else space_offset_vector)
+            if row == 0 and column == 0:
+                if keycap is not None:
+                    original['keycap'] = keycap
+                continue
+            position += 1
+            if keycap is None:
+                continue
+            chunk.append((keycap, offset, f"{name_base} ({token})", position))
+            if len(chunk) >= chunk_size:
+                made += len(create_keycaps(original, chunk, target))
+                chunk = []
+    if chunk:
+        made += len(create_keycaps(original, chunk, target))
+    return made
+
+
+def instance_from_original(
+        original: bpy.types.Object,
+        indices: list[int],
+        target: bpy.types.Collection,
+        gap: int = 0,
+        space_gap: int = 0,
+        direction: str = "+x",
+) -> list[bpy.types.Object]:
+    """
+    Instead of copying the original, make one point mesh with a "keycap" point attribute and instance the original
+    on its points with Geometry Nodes. The original stays where it is as the first key.
+    """
+    if not indices:
+        return [original]
+
+    offsets = compute_offsets(original, indices, gap=gap, space_gap=space_gap, direction=direction)
+    copy_positions = [position for (position, keycap) in enumerate(indices) if keycap is not None and position != 0]
+
+    if indices[0] is not None:
+        original['keycap'] = indices[0]
 
     name_base = re.sub(r'\.\d+', '', original.name)
-    can_rename = len(normalized_tokens if normalized_tokens else []) == len(indices)
+    name = f"{name_base} (Instances)"
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata([offsets[position] for position in copy_positions], [], [])
+    keycap_attribute = mesh.attributes.new("keycap", "INT", "POINT")
+    keycap_attribute.data.foreach_set("value", [indices[position] for position in copy_positions])
 
-    if guide_wire:
-        wire = _make_guide_wire("KeycapWire", offsets, target)
-        wire.location = original.location.copy()
+    instancer = bpy.data.objects.new(name, mesh)
+    instancer.location = original.location.copy()
+    modifier = instancer.modifiers.new("Kiro Instances", "NODES")
+    modifier.node_group = _make_instancer_node_group(name, original)
+    target.objects.link(instancer)
+
+    return [original, instancer]
+
+
+def _spacing_signature(original: bpy.types.Object, gap: float, space_gap: float, direction: str) -> str:
+    """Everything besides the keycaps themselves that the offsets of a run depend on"""
+    return repr((gap, space_gap, direction, tuple(key_dimensions(original)), tuple(original.location)))
+
+
+def _tag_run(original: bpy.types.Object, gap: float, space_gap: float, direction: str, claimable: bool = True) -> None:
+    original[RUN_ID] = uuid4().hex
+    original[RUN_POSITION] = 0
+    original[RUN_SPACING] = _spacing_signature(original, gap, space_gap, direction)
+    if claimable:
+        # Only the object the run was made from can update it. Duplicates of it get a new name, so they won't match.
+        original[RUN_ORIGIN] = original.name
+    elif RUN_ORIGIN in original:
+        del original[RUN_ORIGIN]
+
+
+def find_run(original: bpy.types.Object, target: bpy.types.Collection) -> dict[int, bpy.types.Object] | None:
+    """
+    Find the keys previously generated from this original, by run position, or None if the original did not start a
+    run that can be updated
+    """
+    if RUN_ID not in original or original.get(RUN_ORIGIN) != original.name:
+        return None
+    run_id = original[RUN_ID]
+    run = {}
+    with profiling.phase("find run"):
+        for obj in target.objects:
+            # Position 0 is the original, so anything else there is a hand-made duplicate of it
+            if obj != original and obj.get(RUN_ID) == run_id and obj.get(RUN_POSITION, 0) > 0:
+                # If a key was duplicated by hand, the first one found wins
+                run.setdefault(obj[RUN_POSITION], obj)
+    return run
+
+
+def first_difference(old: list[int | None], new: list[int | None]) -> int:
+    """The first position where two keycap index lists differ, or the length of the shorter one"""
+    for (position, (old_keycap, new_keycap)) in enumerate(zip(old, new)):
+        if old_keycap != new_keycap:
+            return position
+    return min(len(old), len(new))
+
+
+def update_run(
+        original: bpy.types.Object,
+        run: dict[int, bpy.types.Object],
+        indices: list[int],
+        target: bpy.types.Collection,
+        gap: int = 0,
+        space_gap: int = 0,
+        direction: str = "+x",
+        normalized_tokens: list[str] | None = None,
+) -> list[bpy.types.Object]:
+    """
+    Update a run found by find_run to show new indices, touching only what changed: keys are added or removed where
+    a gap opened or closed, keycaps and names are reassigned only where the index changed, and locations are only
+    rewritten from the first position where the spacing could have changed.
+    """
+    old_length = max(run.keys(), default=0) + 1
+    old_indices = [original.get("keycap") if position == 0 else None for position in range(old_length)]
+    for (position, obj) in run.items():
+        old_indices[position] = obj.get("keycap")
+
+    offsets = compute_offsets(original, indices, gap=gap, space_gap=space_gap, direction=direction) \
+        if indices else []
+    names = key_names(original, indices, normalized_tokens)
+
+    spacing = _spacing_signature(original, gap, space_gap, direction)
+    if original.get(RUN_SPACING) != spacing:
+        shift_from = 1
+        original[RUN_SPACING] = spacing
     else:
-        wire = None
+        # Offsets only depend on where the gaps are, so they move from the first place a gap opened or closed
+        shift_from = first_difference([i is None for i in old_indices], [i is None for i in indices])
+
+    if indices and indices[0] is not None:
+        original['keycap'] = indices[0]
 
-    for index, keycap in enumerate(indices):
+    base_location = original.location.copy()
+    to_create = []
+    removed_positions = [position for position in run.keys() if position >= len(indices)]
+    # Nothing before the first changed keycap needs a new keycap, and nothing before shift_from needs to move
+    start = 1 if shift_from <= 1 else max(1, first_difference(old_indices, indices))
+    for position in range(start, len(indices)):
+        keycap = indices[position]
+        obj = run.get(position)
         if keycap is None:
+            if obj is not None:
+                removed_positions.append(position)
             continue
+        if obj is None:
+            to_create.append((keycap, offsets[position], names[position], position))
+            continue
+        if obj.get("keycap") != keycap:
+            obj['keycap'] = keycap
+            if names[position] is not None:
+                obj.name = names[position]
+        if position >= shift_from:
+            obj.location = base_location + offsets[position]
+
+    if removed_positions:
+        bpy.data.batch_remove([run.pop(position) for position in removed_positions])
+    for (placement, new_copy) in zip(to_create, create_keycaps(original, to_create, target)):
+        run[placement[3]] = new_copy
 
-        if index == 0:
-            new_copy = original
-        else:
-            new_copy = original.copy()
-            new_copy.location = original.location + offsets[index]
-            if can_rename:
-                token_name = normalized_tokens[index] if normalized_tokens[index] is not None else f"idx:{keycap}"
-                new_copy.name = f"{name_base} ({token_name})"
-
-            target.objects.link(new_copy)
-            # Need to deselect all but the original, or the poll fails because more than one object is selected
-            new_copy.select_set(False)
-
-        new_copy['keycap'] = keycap
-
-        if wire:
-            new_copy.parent = wire
-            new_copy.parent_type = "VERTEX"
-            new_copy.location = (0, 0, 0)
-            new_copy.parent_vertices[0] = index
+    objects = [original] if indices and indices[0] is not None else []
+    objects.extend(run[position] for position in sorted(run.keys()))
+    return objects
@@ -21,6 +21,14 @@ def wordwrap(string: str, length: int) -> list[str]:
     return lines
 
 
+def tab_separated_rows(lines: Iterable[str]) -> list[list[str]]:
+    """
+    Split lines of tab-separated values (as pasted from a spreadsheet) into rows of fields, skipping blank lines and
+    lines starting with #
+    """
+    return [line.rstrip("\r\n").split("\t") for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
 def get_collection_of_object(obj: bpy.types.Object, default_to_context: bool = True) -> bpy.types.Collection | None:
     """Get the enclosing collection of an Object (caveat: if the object is not in the active scene, this may break)"""
 
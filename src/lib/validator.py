@@ -0,0 +1,165 @@
+import re
+from typing import Iterator
+
+# A dependency-free validator for Kiro sidecar files. It only understands the structure of kirofile.schema.json, but
+# checks it in the same order, and with the same messages, as jsonschema does. The schema itself is still passed in,
+# as a few messages quote parts of it.
+
+
+class KiroSchemaError:
+    """Mirrors the parts of jsonschema.ValidationError that Kiro uses"""
+
+    def __init__(self, message: str, absolute_path: list[str | int]):
+        self.message = message
+        self.absolute_path = absolute_path
+
+    def __repr__(self):
+        return f"<KiroSchemaError {self.absolute_path}: {self.message}>"
+
+
+def _is_integer(value: any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+def _is_number(value: any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": _is_integer,
+    "number": _is_number,
+    "null": lambda v: v is None,
+}
+
+
+def _type_error(value: any, type_name: str, path: list) -> KiroSchemaError | None:
+    if _TYPE_CHECKS[type_name](value):
+        return None
+    return KiroSchemaError(f"{value!r} is not of type {type_name!r}", path)
+
+
+def _key_item_matches(item: any, index: int) -> bool:
+    """Whether a keys item is valid under the index-th "oneOf" choice: string, null, gap or row_gap"""
+    if index == 0:
+        return isinstance(item, str)
+    if index == 1:
+        return item is None
+    if not isinstance(item, dict):
+        return False
+    allowed = "gap" if index == 2 else "row_gap"
+    return all(k == allowed for k in item.keys()) and (allowed not in item or _is_integer(item[allowed]))
+
+
+def _iter_key_item_errors(item: any, item_schema: dict, path: list) -> Iterator[KiroSchemaError]:
+    choices = item_schema["oneOf"]
+    first_valid = next((i for i in range(len(choices)) if _key_item_matches(item, i)), None)
+    if first_valid is None:
+        yield KiroSchemaError(f"{item!r} is not valid under any of the given schemas", path)
+        return
+    more_valid = [choices[i] for i in range(first_valid + 1, len(choices)) if _key_item_matches(item, i)]
+    if more_valid:
+        more_valid.append(choices[first_valid])
+        reprs = ", ".join(repr(choice) for choice in more_valid)
+        yield KiroSchemaError(f"{item!r} is valid under each of {reprs}", path)
+
+
+def _iter_keyset_errors(keyset: any, keyset_schema: dict, path: list) -> Iterator[KiroSchemaError]:
+    error = _type_error(keyset, "object", path)
+    if error:
+        yield error
+
+    properties = keyset_schema["properties"]
+    if isinstance(keyset, dict):
+        for (name, property_schema) in properties.items():
+            if name not in keyset:
+                continue
+            value = keyset[name]
+            error = _type_error(value, property_schema["type"], path + [name])
+            if error:
+                yield error
+            elif name == "keys":
+                for (index, item) in enumerate(value):
+                    yield from _iter_key_item_errors(item, property_schema["items"], path + [name, index])
+
+        for name in keyset_schema["required"]:
+            if name not in keyset:
+                yield KiroSchemaError(f"{name!r} is a required property", path)
+
+    # Exactly one of "keys" or "alt_for". Anything that isn't an object fails both choices on their "not" clause.
+    if not (isinstance(keyset, dict) and (("keys" in keyset) != ("alt_for" in keyset))):
+        yield KiroSchemaError(f"{keyset!r} is not valid under any of the given schemas", path)
+
+    if isinstance(keyset, dict):
+        extras = [k for k in keyset.keys() if k not in properties]
+        if extras:
+            verb = "was" if len(extras) == 1 else "were"
+            joined = ", ".join(repr(extra) for extra in sorted(extras, key=str))
+            yield KiroSchemaError(f"Additional properties are not allowed ({joined} {verb} unexpected)", path)
+
+
+def iter_errors(data: any, schema: dict) -> Iterator[KiroSchemaError]:
+    """Yield every way the sidecar data does not fit the Kiro sidecar schema"""
+    error = _type_error(data, "object", [])
+    if error:
+        yield error
+        return
+
+    properties = schema["properties"]
+
+    if "kiro" in data:
+        kiro_version = data["kiro"]
+        error = _type_error(kiro_version, "number", ["kiro"])
+        if error:
+            yield error
+        else:
+            if kiro_version < properties["kiro"]["minimum"]:
+                yield KiroSchemaError(
+                    f"{kiro_version!r} is less than the minimum of {properties['kiro']['minimum']!r}", ["kiro"])
+            if kiro_version > properties["kiro"]["maximum"]:
+                yield KiroSchemaError(
+                    f"{kiro_version!r} is greater than the maximum of {properties['kiro']['maximum']!r}", ["kiro"])
+
+    for name in ("name", "description"):
+        if name in data:
+            error = _type_error(data[name], "string", [name])
+            if error:
+                yield error
+
+    if "keysets" in data:
+        keysets = data["keysets"]
+        error = _type_error(keysets, "object", ["keysets"])
+        if error:
+            yield error
+        else:
+            for (pattern, keyset_schema) in properties["keysets"]["patternProperties"].items():
+                for (keyset_name, keyset) in keysets.items():
+                    if re.search(pattern, keyset_name):
+                        yield from _iter_keyset_errors(keyset, keyset_schema, ["keysets", keyset_name])
+
+    for name in schema["required"]:
+        if name not in data:
+            yield KiroSchemaError(f"{name!r} is a required property", [])
+
+
+def iter_reference_errors(data: any) -> Iterator[KiroSchemaError]:
+    """
+    Yield every alt_for that names a keyset that isn't in the file, or one that is itself an alt_for. The schema can't
+    express these, so this is run after the schema pass, whichever validator did it.
+    """
+    keysets = data.get("keysets") if isinstance(data, dict) else None
+    if not isinstance(keysets, dict):
+        return
+    for (name, keyset) in keysets.items():
+        if not isinstance(keyset, dict) or not isinstance(keyset.get("alt_for"), str):
+            continue
+        alt_for = keyset["alt_for"]
+        path = ["keysets", name, "alt_for"]
+        if alt_for not in keysets:
+            yield KiroSchemaError(f"{alt_for!r} is not a keyset in this file", path)
+        elif isinstance(keysets[alt_for], dict) and "alt_for" in keysets[alt_for]:
+            yield KiroSchemaError(f"{alt_for!r} is itself an alt_for another keyset, which is not supported", path)
@@ -1,9 +1,11 @@
 import bpy
 from ..operator import validation_report
+from ..operator import profile_dump
+from ..lib import profiling
 
 if "_LOADED" in locals():
     import importlib
-    for mod in (validation_report,):  # list all imports here
+    for mod in (validation_report, profile_dump, profiling):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
@@ -14,6 +16,12 @@ class EditMenu(bpy.types.Menu):
 
     def draw(self, context) -> None:
         self.layout.operator(validation_report.GenerateReport.bl_idname)
+        if profiling.enabled:
+            self.layout.separator()
+            self.layout.operator(profile_dump.ProfileToText.bl_idname)
+            self.layout.operator_context = 'INVOKE_DEFAULT'
+            self.layout.operator(profile_dump.SaveProfileTrace.bl_idname)
+            self.layout.operator(profile_dump.ClearProfile.bl_idname)
 
 
 REGISTER_CLASSES = [EditMenu]
@@ -10,6 +10,9 @@ _LOADED = True
 
 ArrayKeys = array_keys.ArrayKeys
 StringKeys = array_keys.StringKeys
+BatchStringKeys = array_keys.BatchStringKeys
+TextKeys = array_keys.TextKeys
+LayoutKeys = array_keys.LayoutKeys
 
 
 class ObjectKiroMenu(bpy.types.Menu):
@@ -19,6 +22,9 @@ class ObjectKiroMenu(bpy.types.Menu):
     def draw(self, context) -> None:
         self.layout.operator(ArrayKeys.bl_idname)
         self.layout.operator(StringKeys.bl_idname)
+        self.layout.operator(BatchStringKeys.bl_idname)
+        self.layout.operator(TextKeys.bl_idname)
+        self.layout.operator(LayoutKeys.bl_idname)
 
 
 REGISTER_CLASSES = [ObjectKiroMenu]
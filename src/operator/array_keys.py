@@ -1,16 +1,17 @@
 import bpy
-from typing import Set
+from os.path import isfile
+from typing import Iterator, Set
 from bpy.props import StringProperty, IntProperty, FloatProperty, BoolProperty, EnumProperty, CollectionProperty
 from bpy.types import PropertyGroup, UIList, Operator
 from ..lib import kiro
-from ..lib import typeset
+from ..lib import profiling
 from ..lib import types
 from ..lib import util
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (kiro, typeset, types, util,):  # list all imports here
+    for mod in (kiro, profiling, types, util,):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
@@ -54,22 +55,39 @@ class KeySetUIList(UIList):
         layout.label(text=item.image)
 
 
+_AXES = [
+    ("+x", "+X", "Left to right"),
+    ("+y", "+Y", "Down to up"),
+    ("+z", "+Z", "Near to far"),
+    ("-x", "-X", "Right to left"),
+    ("-y", "-Y", "Top to bottom"),
+    ("-z", "-Z", "Far to near"),
+]
+
+
 class ArrayKeysBase(Operator):
     gap: FloatProperty(name="Gap", default=0)
     axis: EnumProperty(
-        items=[
-            ("+x", "+X", "Left to right"),
-            ("+y", "+Y", "Down to up"),
-            ("+z", "+Z", "Near to far"),
-            ("-x", "-X", "Right to left"),
-            ("-y", "-Y", "Top to bottom"),
-            ("-z", "-Z", "Far to near"),
-        ],
+        items=_AXES,
         name="Axis",
         description="How to place new keycaps relative to the original"
     )
     make_wire: BoolProperty(name="Make Guide Wire",
                             description="Make a \"Guide Wire\" object and parent instances to it")
+    output_mode: EnumProperty(
+        items=[
+            ("OBJECTS", "Objects", "Make a full copy of the original object for every key"),
+            ("INSTANCES", "Instances", "Make one object that instances the original on a point for every key"),
+        ],
+        name="Output",
+        description="Whether to make an object for every key, or a single Geometry Nodes instancer for all of them",
+        default="OBJECTS"
+    )
+    update_existing: BoolProperty(name="Update Existing Keys",
+                                  description="If the selected key already started a run of keys, change that run "
+                                              "(adding, changing and removing its keys) instead of making a new run "
+                                              "alongside it",
+                                  default=False)
     keysets: CollectionProperty(type=KeySetPropertyGroup)
     selected_keyset: IntProperty(default=0)
     warn_about_keyset: BoolProperty(default=False)
@@ -89,12 +107,20 @@ class ArrayKeysBase(Operator):
         layout.prop(self, "gap")
         axis_row = layout.row()
         axis_row.prop(self, "axis", expand=True)
-        layout.prop(self, "make_wire")
+        layout.prop(self, "output_mode", expand=True)
+        if self.output_mode == "OBJECTS":
+            layout.prop(self, "make_wire")
+            if not self.make_wire:
+                layout.prop(self, "update_existing")
 
     def draw_keyset_picker(self, context, layout) -> None:
         context.layout.template_list("CUSTOM_UL_keyset", "keysets", self, "keysets", self, "selected_keyset")
 
     def keyset_picker(self, context) -> KiroKeyset | None:
+        with profiling.phase("keyset picking"):
+            return self._pick_keyset(context)
+
+    def _pick_keyset(self, context) -> KiroKeyset | None:
         self.keysets.clear()
         keysets_presumably_in_use = kiro.keysets_in_use(context.selected_objects[0])
         keysets = []
@@ -112,6 +138,49 @@ class ArrayKeysBase(Operator):
 
         return keysets[self.selected_keyset if self.selected_keyset else 0]
 
+    def make_keys(self, original: bpy.types.Object, indices: list[int | None], normalized_tokens: list[str | None],
+                  space_gap: float = 0) -> list[bpy.types.Object]:
+        with profiling.phase("make keys", keys=len(indices)):
+            return self._make_keys(original, indices, normalized_tokens, space_gap)
+
+    def _make_keys(self, original: bpy.types.Object, indices: list[int | None], normalized_tokens: list[str | None],
+                   space_gap: float = 0) -> list[bpy.types.Object]:
+        # Imported on first use rather than at addon startup, as it is only needed once keys are made
+        from ..lib import typeset
+        target = util.get_collection_of_object(original)
+        if self.output_mode == "INSTANCES":
+            return typeset.instance_from_original(
+                original,
+                indices,
+                target=target,
+                gap=self.gap,
+                space_gap=space_gap,
+                direction=self.axis,
+            )
+        if self.update_existing and not self.make_wire:
+            run = typeset.find_run(original, target)
+            if run is not None:
+                return typeset.update_run(
+                    original,
+                    run,
+                    indices,
+                    target=target,
+                    gap=self.gap,
+                    space_gap=space_gap,
+                    direction=self.axis,
+                    normalized_tokens=normalized_tokens,
+                )
+        return typeset.extend_from_original(
+            original,
+            indices,
+            target=target,
+            gap=self.gap,
+            space_gap=space_gap,
+            direction=self.axis,
+            guide_wire=self.make_wire,
+            normalized_tokens=normalized_tokens,
+        )
+
 
 def fill_layout_enum(self, context) -> list[tuple[str, str, str]]:
     enum = [
@@ -122,6 +191,10 @@ def fill_layout_enum(self, context) -> list[tuple[str, str, str]]:
     return enum
 
 
+def fill_full_layout_enum(self, context) -> list[tuple[str, str, str]]:
+    return [(name, name, f"The built-in \"{name}\" layout") for name in kiro.get_layout_names()]
+
+
 class ArrayKeys(ArrayKeysBase):
     """Make an array (sequence) of keycaps in a row"""
     bl_idname = "object.array_keycaps"
@@ -167,6 +240,7 @@ class ArrayKeys(ArrayKeysBase):
         util.reset_operator_defaults(self, ("length", "start_type", "start_index", "start_string"))
         return self.execute(context)
 
+    @profiling.profiled("ArrayKeys")
     def execute(self, context) -> Set[str]:
         original = context.selected_objects[0]
         selected_keyset = self.keyset_picker(context)
@@ -175,57 +249,50 @@ class ArrayKeys(ArrayKeysBase):
             self.report({"ERROR"}, _ALL_INVALID_ERROR)
             return {'CANCELLED'}
 
-        if self.start_type == "index":
-            start_index = self.start_index
-            start_token = kiro.index_to_token(start_index, selected_keyset)
-            self.start_string = start_token if start_token else ""
-        elif self.start_type == "string":
-            def get_start_index():
-                s_token = kiro.string_to_tokens(self.start_string, False)
-
-                # If more/less than one found, try taking the entire string as one [bracketed] token
-                if len(s_token) != 1:
-                    alt_token = kiro.string_to_tokens(f"[{self.start_string}]", False)
-                    if len(alt_token) == 1:
-                        s_token = alt_token
-
-                if len(s_token) == 0:
-                    self.start_token_valid = False
-                    return 0
-                s_indices = kiro.tokens_to_indices(kiro.normalize_tokens(s_token[0:1], selected_keyset), selected_keyset)
-                if len(s_indices) == 0:
-                    return 0
-                self.start_token_valid = True
-                return s_indices[0]
-
-            start_index = get_start_index()
-            self.start_index = start_index
-        else:
-            start_index = original["keycap"] if "keycap" in original else 0
-            self.start_index = start_index
-            start_token = kiro.index_to_token(start_index, selected_keyset)
-            self.start_string = start_token if start_token else ""
-
-        if self.layout_name == "_":
-            indices = range(start_index, start_index + self.length, -1 if self.length < 0 else 1)
-        else:
-            indices = kiro.layout_sequence(
-                start_index,
-                self.length if self.length else 1,
-                keyset=selected_keyset,
-                layout_name=self.layout_name
-            )
-        normalized_tokens = [kiro.index_to_token(i, selected_keyset) for i in indices]
-
-        objects = typeset.extend_from_original(
-            original,
-            indices,
-            target=util.get_collection_of_object(original),
-            gap=self.gap,
-            direction=self.axis,
-            guide_wire=self.make_wire,
-            normalized_tokens=normalized_tokens,
-        )
+        with profiling.phase("tokenization"):
+            if self.start_type == "index":
+                start_index = self.start_index
+                start_token = kiro.index_to_token(start_index, selected_keyset)
+                self.start_string = start_token if start_token else ""
+            elif self.start_type == "string":
+                def get_start_index():
+                    s_token = kiro.string_to_tokens(self.start_string, False)
+
+                    # If more/less than one found, try taking the entire string as one [bracketed] token
+                    if len(s_token) != 1:
+                        alt_token = kiro.string_to_tokens(f"[{self.start_string}]", False)
+                        if len(alt_token) == 1:
+                            s_token = alt_token
+
+                    if len(s_token) == 0:
+                        self.start_token_valid = False
+                        return 0
+                    s_indices = kiro.tokens_to_indices(kiro.normalize_tokens(s_token[0:1], selected_keyset), selected_keyset)
+                    if len(s_indices) == 0:
+                        return 0
+                    self.start_token_valid = True
+                    return s_indices[0]
+
+                start_index = get_start_index()
+                self.start_index = start_index
+            else:
+                start_index = original["keycap"] if "keycap" in original else 0
+                self.start_index = start_index
+                start_token = kiro.index_to_token(start_index, selected_keyset)
+                self.start_string = start_token if start_token else ""
+
+            if self.layout_name == "_":
+                indices = range(start_index, start_index + self.length, -1 if self.length < 0 else 1)
+            else:
+                indices = kiro.layout_sequence(
+                    start_index,
+                    self.length if self.length else 1,
+                    keyset=selected_keyset,
+                    layout_name=self.layout_name
+                )
+            normalized_tokens = [kiro.index_to_token(i, selected_keyset) for i in indices]
+
+        objects = self.make_keys(original, indices, normalized_tokens)
 
         return {'FINISHED'}
 
@@ -244,6 +311,9 @@ class StringKeys(ArrayKeysBase):
     space_gap_adjust: FloatProperty(name="Space Adjust",
                                     description="Add or remove space from Space character gaps",
                                     default=0.0)
+    escapes: BoolProperty(name="Backslash escapes",
+                          description="A backslash makes the next character literal, e.g., \\[ for a [ key",
+                          default=False)
 
     def invoke(self, context, event):
         util.reset_operator_defaults(self, ("string",))
@@ -256,6 +326,7 @@ class StringKeys(ArrayKeysBase):
 
         layout.prop(self, "string")
         layout.prop(self, "space_as_gap")
+        layout.prop(self, "escapes")
         if self.space_as_gap:
             layout.prop(self, "space_gap_adjust")
 
@@ -265,6 +336,7 @@ class StringKeys(ArrayKeysBase):
             errbox.label(text="Wrong keyset? Check below...", icon="QUESTION")
         layout.template_list("CUSTOM_UL_keyset", "keysets", self, "keysets", self, "selected_keyset")
 
+    @profiling.profiled("StringKeys")
     def execute(self, context) -> Set[str]:
         original = context.selected_objects[0]
         selected_keyset = self.keyset_picker(context)
@@ -273,22 +345,307 @@ class StringKeys(ArrayKeysBase):
             self.report({"ERROR"}, _ALL_INVALID_ERROR)
             return {'CANCELLED'}
 
-        self.warn_about_keyset = kiro.detect_wrong_keyset(self.string, selected_keyset)
-        tokens = kiro.string_to_tokens(self.string, self.space_as_gap)
-        normalized_tokens = kiro.normalize_tokens(tokens, selected_keyset)
-        indices = kiro.tokens_to_indices(normalized_tokens, selected_keyset)
+        with profiling.phase("tokenization", characters=len(self.string)):
+            tokenized = kiro.tokenize(self.string, selected_keyset, self.space_as_gap, self.escapes)
+            self.warn_about_keyset = tokenized.suggests_wrong_keyset
+
+        objects = self.make_keys(original, tokenized.indices, tokenized.normalized, space_gap=self.space_gap_adjust)
+        return {'FINISHED'}
 
-        objects = typeset.extend_from_original(
+
+class BatchStringKeys(ArrayKeysBase):
+    """Create a string of keycaps from each of the selected keycap objects, all at once"""
+    bl_idname = "object.batch_string_keycaps"
+    bl_label = "Clone Keycaps from Text (Batch)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    source: EnumProperty(name="Source", items=[
+        ("STRING", "One String", "The same string from every selected object", "FONT_DATA", 0),
+        ("LINES", "Text Lines", "Each line of a Text, for each selected object in name order", "ALIGN_JUSTIFY", 1),
+        ("SPEC", "Spec Table", "A Text of tab-separated rows: object name, string, and optionally a keyset name",
+         "SPREADSHEET", 2),
+    ], default="STRING")
+    string: StringProperty(name="String", default="")
+    text_name: StringProperty(name="Text", default="")
+    space_as_gap: BoolProperty(name="Non-bracketed spaces leave a gap",
+                               description="Space characters that are not in square brackets will leave gaps instead of a key",
+                               default=False)
+    space_gap_adjust: FloatProperty(name="Space Adjust",
+                                    description="Add or remove space from Space character gaps",
+                                    default=0.0)
+    escapes: BoolProperty(name="Backslash escapes",
+                          description="A backslash makes the next character literal, e.g., \\[ for a [ key",
+                          default=False)
+
+    @classmethod
+    def poll(cls, context) -> bool:
+        if not context.selected_objects:
+            cls.poll_message_set("Select one or more keycap objects")
+            return False
+        if not kiro.kiro_images():
+            cls.poll_message_set("You do not have any Kiro-enabled images in the current file")
+            return False
+        return True
+
+    def draw(self, context) -> None:
+        layout = self.layout
+        layout.prop(self, "source", expand=True)
+        if self.source == "STRING":
+            layout.prop(self, "string")
+        else:
+            layout.prop_search(self, "text_name", bpy.data, "texts")
+
+        self.draw_common_layout(context, layout)
+        if self.output_mode == "OBJECTS" and self.update_existing and not self.make_wire:
+            layout.label(text="Objects that already started a run will have that run changed", icon="INFO")
+        layout.prop(self, "space_as_gap")
+        if self.space_as_gap:
+            layout.prop(self, "space_gap_adjust")
+        layout.prop(self, "escapes")
+
+        if self.warn_about_keyset:
+            errbox = layout.box()
+            errbox.alert = True
+            errbox.label(text="Wrong keyset? Check below...", icon="QUESTION")
+        if self.source == "SPEC":
+            layout.label(text="Rows that name a keyset use that one instead", icon="INFO")
+        layout.template_list("CUSTOM_UL_keyset", "keysets", self, "keysets", self, "selected_keyset")
+
+    def _jobs(self, context, keyset: KiroKeyset) -> list[tuple[bpy.types.Object, str, KiroKeyset]] | None:
+        """(original, string, keyset) for each object to make keys from"""
+        if self.source == "STRING":
+            return [(original, self.string, keyset) for original in context.selected_objects]
+
+        text = bpy.data.texts.get(self.text_name)
+        if text is None:
+            return None
+        lines = [line.body for line in text.lines]
+
+        if self.source == "LINES":
+            originals = sorted(context.selected_objects, key=lambda obj: obj.name)
+            if len(originals) != len(lines):
+                self.report({"WARNING"}, f"{len(originals)} objects are selected but the Text has {len(lines)} "
+                                         f"lines, so only the first {min(len(originals), len(lines))} are used")
+            return [(original, line, keyset) for (original, line) in zip(originals, lines)]
+
+        # Keysets named in the spec are looked up once, whichever images they are in
+        keysets_by_name = {}
+        for image_keysets in kiro.keysets_by_image().values():
+            for ks in image_keysets:
+                keysets_by_name.setdefault(ks.name, ks)
+        jobs = []
+        for row in util.tab_separated_rows(lines):
+            original = bpy.data.objects.get(row[0])
+            if original is None:
+                self.report({"WARNING"}, f"Skipped \"{row[0]}\", as there is no object by that name")
+                continue
+            row_keyset = keyset
+            if len(row) > 2 and row[2]:
+                row_keyset = keysets_by_name.get(row[2])
+                if row_keyset is None:
+                    self.report({"WARNING"}, f"Skipped \"{row[0]}\", as there is no keyset named \"{row[2]}\"")
+                    continue
+            jobs.append((original, row[1] if len(row) > 1 else "", row_keyset))
+        return jobs
+
+    @profiling.profiled("BatchStringKeys")
+    def execute(self, context) -> Set[str]:
+        # Imported on first use rather than at addon startup, as it is only needed once keys are made
+        from ..lib import typeset
+        selected_keyset = self.keyset_picker(context)
+
+        if selected_keyset is None:
+            self.report({"ERROR"}, _ALL_INVALID_ERROR)
+            return {'CANCELLED'}
+
+        jobs = self._jobs(context, selected_keyset)
+        if jobs is None:
+            self.report({"ERROR"}, "Choose a Text to read the strings from")
+            return {'CANCELLED'}
+
+        self.warn_about_keyset = False
+        # Labels repeat a lot across a batch, so each string is only tokenized once per keyset
+        tokenized_strings = {}
+        done = set()
+        with typeset.LinkBatch():
+            for (original, string, keyset) in jobs:
+                # A second run from the same original can't see the first one's keys until the batch links them
+                if original in done:
+                    self.report({"WARNING"}, f"Skipped \"{original.name}\" after its first row")
+                    continue
+                done.add(original)
+                tokenized = tokenized_strings.get((string, keyset.name))
+                if tokenized is None:
+                    with profiling.phase("tokenization", characters=len(string)):
+                        tokenized = tokenized_strings[(string, keyset.name)] = kiro.tokenize(
+                            string, keyset, self.space_as_gap, self.escapes)
+                if tokenized.suggests_wrong_keyset:
+                    self.warn_about_keyset = True
+                self.make_keys(original, tokenized.indices, tokenized.normalized, space_gap=self.space_gap_adjust)
+        return {'FINISHED'}
+
+
+def _file_lines(file_path: str) -> Iterator[str]:
+    with open(file_path, encoding="utf-8", errors="replace") as file:
+        for line in file:
+            yield line.rstrip("\r\n")
+
+
+class TextKeys(ArrayKeysBase):
+    """Typeset a Text (or a text file) as rows of keycaps, one row per line"""
+    bl_idname = "object.text_keycaps"
+    bl_label = "Clone Keycap from Text Document"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    source: EnumProperty(name="Source", items=[
+        ("TEXT", "Text", "A Text in this file, as in the Text editor", "TEXT", 0),
+        ("FILE", "File", "A text file on disk", "FILE_TEXT", 1),
+    ], default="TEXT")
+    text_name: StringProperty(name="Text", default="")
+    filepath: StringProperty(name="File", subtype="FILE_PATH", default="")
+    wrap_width: IntProperty(name="Wrap at",
+                            description="Wrap lines longer than this many keys at a space (0 does not wrap)",
+                            default=0, min=0)
+    row_gap: FloatProperty(name="Row Gap", default=0)
+    row_axis: EnumProperty(
+        items=_AXES,
+        name="Row Axis",
+        description="Where to place each line's row relative to the one before it",
+        default="-y"
+    )
+    space_as_gap: BoolProperty(name="Non-bracketed spaces leave a gap",
+                               description="Space characters that are not in square brackets will leave gaps instead of a key",
+                               default=True)
+    space_gap_adjust: FloatProperty(name="Space Adjust",
+                                    description="Add or remove space from Space character gaps",
+                                    default=0.0)
+    escapes: BoolProperty(name="Backslash escapes",
+                          description="A backslash makes the next character literal, e.g., \\[ for a [ key",
+                          default=False)
+
+    def invoke(self, context, event):
+        if not self.text_name and context.space_data and getattr(context.space_data, "text", None):
+            self.text_name = context.space_data.text.name
+        if not self.text_name and bpy.data.texts:
+            self.text_name = bpy.data.texts[0].name
+        return self.execute(context)
+
+    def draw(self, context) -> None:
+        layout = self.layout
+        layout.prop(self, "source", expand=True)
+        if self.source == "TEXT":
+            layout.prop_search(self, "text_name", bpy.data, "texts")
+        else:
+            layout.prop(self, "filepath")
+        layout.prop(self, "wrap_width")
+
+        layout.prop(self, "gap")
+        layout.row().prop(self, "axis", expand=True)
+        layout.prop(self, "row_gap")
+        layout.row().prop(self, "row_axis", expand=True)
+        layout.prop(self, "space_as_gap")
+        if self.space_as_gap:
+            layout.prop(self, "space_gap_adjust")
+        layout.prop(self, "escapes")
+
+        if self.warn_about_keyset:
+            errbox = layout.box()
+            errbox.alert = True
+            errbox.label(text="Wrong keyset? Check below...", icon="QUESTION")
+        layout.template_list("CUSTOM_UL_keyset", "keysets", self, "keysets", self, "selected_keyset")
+
+    def _lines(self) -> Iterator[str] | None:
+        if self.source == "FILE":
+            file_path = bpy.path.abspath(self.filepath)
+            return _file_lines(file_path) if self.filepath and isfile(file_path) else None
+        text = bpy.data.texts.get(self.text_name)
+        return (line.body for line in text.lines) if text else None
+
+    @profiling.profiled("TextKeys")
+    def execute(self, context) -> Set[str]:
+        # Imported on first use rather than at addon startup, as it is only needed once keys are made
+        from ..lib import typeset
+        original = context.selected_objects[0]
+        selected_keyset = self.keyset_picker(context)
+
+        if selected_keyset is None:
+            self.report({"ERROR"}, _ALL_INVALID_ERROR)
+            return {'CANCELLED'}
+
+        lines = self._lines()
+        if lines is None:
+            self.report({"ERROR"}, "Choose a Text or a text file to typeset")
+            return {'CANCELLED'}
+
+        # Lines are tokenized and wrapped one at a time, as the keys are made, rather than all up front
+        self.warn_about_keyset = False
+
+        def rows():
+            for line in lines:
+                with profiling.phase("tokenization", characters=len(line)):
+                    tokenized = kiro.tokenize(line, selected_keyset, self.space_as_gap, self.escapes)
+                    if tokenized.suggests_wrong_keyset:
+                        self.warn_about_keyset = True
+                    wrapped = kiro.wrap_keys(tokenized.indices, tokenized.normalized, self.wrap_width)
+                yield from wrapped
+
+        made = typeset.typeset_rows(
             original,
-            indices,
+            rows(),
             target=util.get_collection_of_object(original),
             gap=self.gap,
             space_gap=self.space_gap_adjust,
+            row_gap=self.row_gap,
             direction=self.axis,
-            guide_wire=self.make_wire,
-            normalized_tokens=normalized_tokens
+            row_direction=self.row_axis,
+        )
+        self.report({"INFO"}, f"Made {made} keycaps")
+        return {'FINISHED'}
+
+
+class LayoutKeys(ArrayKeysBase):
+    """Lay out a whole keyboard layout from one keycap"""
+    bl_idname = "object.layout_keycaps"
+    bl_label = "Clone Keycap to Layout"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    layout_name: EnumProperty(name="Layout", items=fill_full_layout_enum)
+    row_gap: FloatProperty(name="Row Gap", default=0)
+
+    def draw(self, context) -> None:
+        layout = self.layout
+        layout.prop(self, "layout_name")
+        layout.prop(self, "gap")
+        layout.prop(self, "row_gap")
+        layout.template_list("CUSTOM_UL_keyset", "keysets", self, "keysets", self, "selected_keyset")
+
+    @profiling.profiled("LayoutKeys")
+    def execute(self, context) -> Set[str]:
+        # Imported on first use rather than at addon startup, as it is only needed once keys are made
+        from ..lib import typeset
+        original = context.selected_objects[0]
+        selected_keyset = self.keyset_picker(context)
+
+        if selected_keyset is None:
+            self.report({"ERROR"}, _ALL_INVALID_ERROR)
+            return {'CANCELLED'}
+
+        # The original is placed where its own keycap is in the layout, if it is there
+        anchor_index = original["keycap"] if "keycap" in original else None
+        with profiling.phase("tokenization"):
+            placements = kiro.layout_placements(self.layout_name, selected_keyset, anchor_index)
+        if not placements:
+            self.report({"WARNING"}, "None of the keys in this layout are in the selected keyset")
+            return {'CANCELLED'}
+
+        objects = typeset.layout_from_original(
+            original,
+            placements,
+            target=util.get_collection_of_object(original),
+            gap=self.gap,
+            row_gap=self.row_gap,
         )
         return {'FINISHED'}
 
 
-REGISTER_CLASSES = [KeySetPropertyGroup, KeySetUIList, ArrayKeys, StringKeys]
+REGISTER_CLASSES = [KeySetPropertyGroup, KeySetUIList, ArrayKeys, StringKeys, BatchStringKeys, TextKeys, LayoutKeys]
@@ -0,0 +1,57 @@
+import json
+import bpy
+from typing import Set
+from bpy.props import StringProperty
+from bpy_extras.io_utils import ExportHelper
+from ..lib import profiling
+
+if "_LOADED" in locals():
+    import importlib
+
+    for mod in (profiling,):  # list all imports here
+        importlib.reload(mod)
+_LOADED = True
+
+
+class ProfileToText(bpy.types.Operator):
+    """Write the recorded Kiro profile to a Text in the built-in Text editor"""
+    bl_idname = "kiro.profile_to_text"
+    bl_label = "Kiro Profile to Text"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context) -> Set[str]:
+        text = bpy.data.texts.new("Kiro Profile.txt")
+        text.use_fake_user = False
+        text.from_string(profiling.text_report())
+        self.report({'INFO'}, f"Kiro profile written to {text.name}")
+        return {'FINISHED'}
+
+
+class SaveProfileTrace(bpy.types.Operator, ExportHelper):
+    """Save the recorded Kiro profile as a Chrome trace JSON file (open it in chrome://tracing or Perfetto)"""
+    bl_idname = "kiro.save_profile_trace"
+    bl_label = "Save Kiro Profile Trace"
+    bl_options = {'REGISTER'}
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={'HIDDEN'})
+
+    def execute(self, context) -> Set[str]:
+        with open(self.filepath, "w") as file:
+            json.dump(profiling.chrome_trace(), file)
+        self.report({'INFO'}, f"Kiro profile trace saved to {self.filepath}")
+        return {'FINISHED'}
+
+
+class ClearProfile(bpy.types.Operator):
+    """Throw away the recorded Kiro profile"""
+    bl_idname = "kiro.clear_profile"
+    bl_label = "Clear Kiro Profile"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context) -> Set[str]:
+        profiling.clear()
+        return {'FINISHED'}
+
+
+REGISTER_CLASSES = [ProfileToText, SaveProfileTrace, ClearProfile]
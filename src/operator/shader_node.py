@@ -4,11 +4,12 @@ from bpy.props import StringProperty, IntProperty, FloatProperty, BoolProperty,
 from bpy.types import Operator
 from ..lib import kiro
 from ..lib import assets
+from ..lib import profiling
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (kiro, assets):  # list all imports here
+    for mod in (kiro, assets, profiling):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
@@ -59,54 +60,61 @@ class AddKiroShader(Operator):
             layout.prop(self, "keyset")
             layout.prop(self, "tag_users")
 
+    @profiling.profiled("AddKiroShader")
     def execute(self, context) -> Set[str]:
         # TODO: support image paths
-        keysets = [ks for ks in kiro.keysets_for_image_name_full(self.image) if ks.name == self.keyset]
+        with profiling.phase("keyset picking"):
+            keysets = [ks for ks in kiro.keysets_for_image_name_full(self.image) if ks.name == self.keyset]
         if not keysets:
             raise Exception("Somehow you managed to select a keyset that doesn't exist now.")
         keyset = keysets[0]
 
-        grid_picker_source = assets.load_grid_picker()
-        node_tree = context.material.node_tree
-        nodes = node_tree.nodes
-
-        # Make the NodeGroup Node
-        sng_node = nodes.new(type='ShaderNodeGroup')
-        sng_node.node_tree = grid_picker_source
-        sng_node.label = keyset.name
-        sng_node.inputs["Start Index (Offset)"].default_value = keyset.start
-        sng_node.inputs["Units Wide"].default_value = keyset.cols
-        sng_node.inputs["Units High"].default_value = keyset.rows
-        sng_node.inputs["Run Length (Limit)"].default_value = keyset.length
-        sng_node.inputs["Keyset"].default_value = keyset.name
-
-        # Make the Image Node
-        image_node = nodes.new('ShaderNodeTexImage')
-        image_node.location.x += sng_node.width + 25
-        image_node.image = bpy.data.images[self.image]
-
-        # Make the Attribute Node
-        attribute_node = nodes.new('ShaderNodeAttribute')
-        attribute_node.attribute_type = "INSTANCER"
-        attribute_node.attribute_name = "keycap"
-        for socket in [sock for (name, sock) in attribute_node.outputs.items() if not name == "Fac"]:
-            socket.hide = True
-        attribute_node.location.x -= attribute_node.width + 25
-        attribute_node.location.y += attribute_node.height / 2 + 12
-
-        # Make the UV Node
-        uv_node = nodes.new('ShaderNodeUVMap')
-        uv_node.location.x -= uv_node.width + 25
-        uv_node.location.y -= attribute_node.height / 2 + 13
-
-        # Link Nodes
-        node_tree.links.new(sng_node.outputs["Vector"], image_node.inputs["Vector"])
-        node_tree.links.new(uv_node.outputs["UV"], sng_node.inputs["UV Map"])
-        node_tree.links.new(attribute_node.outputs["Fac"], sng_node.inputs["Index"])
+        with profiling.phase("load grid picker"):
+            grid_picker_source = assets.load_grid_picker()
+
+        with profiling.phase("create nodes"):
+            node_tree = context.material.node_tree
+            nodes = node_tree.nodes
+
+            # Make the NodeGroup Node
+            sng_node = nodes.new(type='ShaderNodeGroup')
+            sng_node.node_tree = grid_picker_source
+            sng_node.label = keyset.name
+            sng_node.inputs["Start Index (Offset)"].default_value = keyset.start
+            sng_node.inputs["Units Wide"].default_value = keyset.cols
+            sng_node.inputs["Units High"].default_value = keyset.rows
+            sng_node.inputs["Run Length (Limit)"].default_value = keyset.length
+            sng_node.inputs["Keyset"].default_value = keyset.name
+
+            # Make the Image Node
+            image_node = nodes.new('ShaderNodeTexImage')
+            image_node.location.x += sng_node.width + 25
+            image_node.image = bpy.data.images[self.image]
+
+            # Make the Attribute Node
+            # INSTANCER reads the "keycap" custom property on plain objects, and the per-instance "keycap" attribute on
+            # keys made with the Instances output mode
+            attribute_node = nodes.new('ShaderNodeAttribute')
+            attribute_node.attribute_type = "INSTANCER"
+            attribute_node.attribute_name = "keycap"
+            for socket in [sock for (name, sock) in attribute_node.outputs.items() if not name == "Fac"]:
+                socket.hide = True
+            attribute_node.location.x -= attribute_node.width + 25
+            attribute_node.location.y += attribute_node.height / 2 + 12
+
+            # Make the UV Node
+            uv_node = nodes.new('ShaderNodeUVMap')
+            uv_node.location.x -= uv_node.width + 25
+            uv_node.location.y -= attribute_node.height / 2 + 13
+
+            # Link Nodes
+            node_tree.links.new(sng_node.outputs["Vector"], image_node.inputs["Vector"])
+            node_tree.links.new(uv_node.outputs["UV"], sng_node.inputs["UV Map"])
+            node_tree.links.new(attribute_node.outputs["Fac"], sng_node.inputs["Index"])
 
         if self.tag_users:
-            for obj in [o for o in bpy.data.objects]:
-                if [s for s in obj.material_slots if s.material == context.material]:
+            with profiling.phase("tag users"):
+                for obj in kiro.material_users(context.material):
                     if "keycap" not in obj:
                         obj["keycap"] = 0
                         obj.id_properties_ensure()
@@ -1,16 +1,31 @@
 from typing import Set
 import bpy
 from datetime import datetime
-from ..lib import metadata
-from ..lib import report
+from ..lib import profiling
 
 if "_LOADED" in locals():
     import importlib
 
-    for mod in (metadata, report,):  # list all imports here
+    for mod in (profiling,):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
+_POLL_INTERVAL = 0.1
+
+
+def _new_report_text() -> bpy.types.Text:
+    now = datetime.now()
+    report_text = bpy.data.texts.new("Kiro Report " + str(int(now.timestamp())) + ".txt")
+    report_text.use_fake_user = False
+    return report_text
+
+
+def _report_done_message(report_name: str) -> None:
+    def message(menu, _):
+        menu.layout.label(text=f"{report_name} has been generated and can be opened in the built-in Text editor")
+
+    bpy.context.window_manager.popup_menu(message, title="Untitled Blender Addon")
+
 
 class GenerateReport(bpy.types.Operator):
     """Generate a report of all images and validate all associated Kiro JSON files"""
@@ -18,19 +33,60 @@ class GenerateReport(bpy.types.Operator):
     bl_label = "Generate Kiro Image Report"
     bl_options = {'REGISTER'}
 
+    @profiling.profiled("GenerateReport")
     def execute(self, context) -> Set[str]:
-        now = datetime.now()
-        report_name = "Kiro Report " + str(int(now.timestamp())) + ".txt"
-        report_text = bpy.data.texts.new(report_name)
+        # Imported here rather than at addon startup
+        from ..lib import report
+        report_text = _new_report_text()
         report_text.from_string(report.generate())
-        report_text.use_fake_user = False
+        _report_done_message(report_text.name)
+        return {'FINISHED'}
+
+    @profiling.profiled("GenerateReport (start)")
+    def invoke(self, context, event) -> Set[str]:
+        # Run interactively, files are checked in the background and rows are added to the Text as they finish
+        from ..lib import report
+        self._report = report.Report()
+        self._report_text = _new_report_text()
+        self._lines = self._report.header()
+        self._report_text.from_string("\n".join(self._lines))
+        self._timer = context.window_manager.event_timer_add(_POLL_INTERVAL, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event) -> Set[str]:
+        if event.type == 'ESC':
+            self._finish(context)
+            self._report.cancel()
+            self._lines.append(f"Cancelled after {self._report.finished_count} of {self._report.total} images.")
+            self._report_text.from_string("\n".join(self._lines))
+            return {'CANCELLED'}
 
-        def message(menu, _):
-            menu.layout.label(text=f"{report_name} has been generated and can be opened in the built-in Text editor")
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
 
-        bpy.context.window_manager.popup_menu(message, title="Untitled Blender Addon")
+        with profiling.phase("report rows"):
+            rows = self._report.poll()
+            if rows:
+                self._lines += rows
+                self._report_text.from_string("\n".join(self._lines))
+        context.workspace.status_text_set(
+            f"Kiro Report: {self._report.finished_count} of {self._report.total} images checked (Esc to cancel)")
 
+        if not self._report.finished:
+            return {'RUNNING_MODAL'}
+
+        self._finish(context)
+        if profiling.enabled:
+            profiling.record_counters()
+        self._lines += self._report.footer()
+        self._report_text.from_string("\n".join(self._lines))
+        _report_done_message(self._report_text.name)
         return {'FINISHED'}
 
+    def _finish(self, context) -> None:
+        context.window_manager.event_timer_remove(self._timer)
+        context.workspace.status_text_set(None)
+
 
 REGISTER_CLASSES = [GenerateReport]
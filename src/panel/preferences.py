@@ -1,20 +1,35 @@
 import bpy
+from bpy.props import BoolProperty
 from ..lib import util
 from ..lib import bootstrap
+from ..lib import profiling
 
 if "_LOADED" in locals():
     import importlib
-    for mod in (util, bootstrap):  # list all imports here
+    for mod in (util, bootstrap, profiling):  # list all imports here
         importlib.reload(mod)
 _LOADED = True
 
 pkg = __package__.split(".")[-2]
 
+
+def _update_profiling(self, context) -> None:
+    profiling.enabled = self.profiling
+
+
 class PreferencesPanel(bpy.types.AddonPreferences):
     bl_idname = pkg
 
+    profiling: BoolProperty(
+        name="Profile Kiro operations",
+        description="Record how long each step of Kiro's operators takes. View or save it from Edit > Kiro",
+        default=False,
+        update=_update_profiling,
+    )
+
     def draw(self, context):
         layout = self.layout
+        layout.prop(self, "profiling")
         missing = bootstrap.missing_modules()
         installed = bootstrap.installed_modules()
         if missing:
@@ -0,0 +1,31 @@
+import bpy
+import argparse
+import importlib
+import sys
+from os import path, listdir
+
+# Run with: blender -b --python run_benchmarks.py -- [--output results.json] [benchmark names, e.g. typeset tokens]
+
+
+def run_benchmarks(names: list[str] | None = None, output: str | None = None):
+    here = path.dirname(__file__)
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    # Benchmarks import the harness relative to the addon package, so use that same module to collect their results
+    harness = importlib.import_module(f"{importlib.import_module('benchmark').pkg()}.harness")
+    harness.clear()
+    for filename in sorted(listdir(path.join(here, "benchmark"))):
+        if filename.startswith("bench_") and filename.endswith(".py"):
+            if names and filename[len("bench_"):-3] not in names:
+                continue
+            importlib.import_module(f"benchmark.{filename[:-3]}").run()
+    if output:
+        harness.write_json(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="run_benchmarks.py", description="Time Kiro's hot paths")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("names", nargs="*", help="Only run these benchmarks (e.g., typeset for bench_typeset)")
+    args = parser.parse_args(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else [])
+    run_benchmarks(args.names, args.output)
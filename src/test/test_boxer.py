@@ -0,0 +1,53 @@
+from . import pkg
+
+__package__ = pkg()
+
+import unittest
+import bpy
+from mathutils import Matrix, Vector
+from ..lib import boxer
+
+
+class GetExtremesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mesh = bpy.data.meshes.new("Kiro Test Boxer")
+        self.mesh.from_pydata([(0, 0, 0), (1, 0, 0), (1, 2, 0), (0, 2, 3), (-1, 0.5, 0)], [], [])
+        self.obj = bpy.data.objects.new("Kiro Test Boxer", self.mesh)
+        self.obj.matrix_world = Matrix.Translation((10, 20, 30)) @ Matrix.Rotation(0.3, 4, "Z")
+
+    def tearDown(self) -> None:
+        bpy.data.objects.remove(self.obj)
+        bpy.data.meshes.remove(self.mesh)
+
+    def test_mesh_precision(self):
+        (low, high) = boxer._get_extremes_python(self.obj, self.obj.matrix_world, mesh_precision=True)
+        points = [self.obj.matrix_world @ v.co for v in self.mesh.vertices]
+        for axis in range(3):
+            self.assertAlmostEqual(min(p[axis] for p in points), low[axis], places=5)
+            self.assertAlmostEqual(max(p[axis] for p in points), high[axis], places=5)
+
+    def test_numpy_matches_python(self):
+        if not boxer._HAS_NUMPY:
+            self.skipTest("NumPy is not available")
+        for mesh_precision in (False, True):
+            expected = boxer._get_extremes_python(self.obj, self.obj.matrix_world, mesh_precision=mesh_precision)
+            actual = boxer._get_extremes_numpy(self.obj, self.obj.matrix_world, mesh_precision=mesh_precision)
+            for (e, a) in zip(expected, actual):
+                for axis in range(3):
+                    self.assertAlmostEqual(e[axis], a[axis], places=5)
+
+    def test_empty_mesh(self):
+        empty_mesh = bpy.data.meshes.new("Kiro Test Boxer Empty")
+        obj = bpy.data.objects.new("Kiro Test Boxer Empty", empty_mesh)
+        try:
+            expected = boxer._get_extremes_python(obj, obj.matrix_world, mesh_precision=True)
+            self.assertEqual(Vector([float("inf")] * 3), expected[0])
+            if boxer._HAS_NUMPY:
+                self.assertEqual(expected, boxer._get_extremes_numpy(obj, obj.matrix_world, mesh_precision=True))
+        finally:
+            bpy.data.objects.remove(obj)
+            bpy.data.meshes.remove(empty_mesh)
+
+
+if __name__ == '__main__':
+    unittest.main()
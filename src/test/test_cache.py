@@ -1,4 +1,5 @@
 from time import sleep
+from threading import Thread, Event
 
 from . import pkg
 
@@ -9,7 +10,11 @@ from ..lib import cache as lib_cache
 
 CacheMissException = lib_cache.CacheMissException
 CacheTimeoutException = lib_cache.CacheTimeoutException
+CacheStaleException = lib_cache.CacheStaleException
+CacheNegativeException = lib_cache.CacheNegativeException
+CacheRecursionException = lib_cache.CacheRecursionException
 Cache = lib_cache.Cache
+MISSING = lib_cache.MISSING
 
 
 class CacheTest(unittest.TestCase):
@@ -162,3 +167,214 @@ class CacheTest(unittest.TestCase):
         cache.delete("key1")
         self.assertIsNone(cache.get("key1"))
         self.assertEquals(cache.get("key2"), "value2")
+
+    def test_matching_signature_hits(self):
+        cache = Cache()
+        cache.set("key1", "value1", signature=(1, 2))
+        self.assertEqual(cache.get_or_raise("key1", signature=(1, 2)), "value1")
+
+    def test_changed_signature_raises_stale(self):
+        cache = Cache()
+        cache.set("key1", "value1", signature=(1, 2))
+        self.assertRaises(CacheStaleException, lambda: cache.get_or_raise("key1", signature=(1, 3)))
+        self.assertRaises(CacheMissException, lambda: cache.get_or_raise("key1"))
+
+    def test_no_signature_ignores_signature(self):
+        cache = Cache()
+        cache.set("key1", "value1", signature=(1, 2))
+        self.assertEqual(cache.get_or_raise("key1"), "value1")
+
+    def test_get_or_resolve_changed_signature_resolves(self):
+        cache = Cache()
+        calls = []
+
+        def resolve(key):
+            calls.append(key)
+            return len(calls)
+
+        self.assertEqual(cache.get_or_resolve("key1", resolve, signature="a"), 1)
+        self.assertEqual(cache.get_or_resolve("key1", resolve, signature="a"), 1)
+        self.assertEqual(cache.get_or_resolve("key1", resolve, signature="b"), 2)
+        self.assertEqual(["key1", "key1"], calls)
+
+    def test_discard(self):
+        cache = Cache()
+        cache.set("key1", "value1")
+        cache.discard("key1")
+        cache.discard("key1")
+        self.assertIsNone(cache.get("key1"))
+
+    def test_lru_evicts_oldest(self):
+        cache = Cache(max_entries=2)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.set("key3", "value3")
+        self.assertIsNone(cache.get("key1"))
+        self.assertEqual(cache.get("key2"), "value2")
+        self.assertEqual(cache.get("key3"), "value3")
+        self.assertEqual(1, cache.stats.evictions)
+
+    def test_lru_get_refreshes_order(self):
+        cache = Cache(max_entries=2)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.get("key1")
+        cache.set("key3", "value3")
+        self.assertEqual(["key1", "key3"], list(cache.items.keys()))
+        self.assertEqual(cache.get("key1"), "value1")
+        self.assertIsNone(cache.get("key2"))
+
+    def test_lru_re_set_refreshes_order(self):
+        cache = Cache(max_entries=2)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.set("key1", "newvalue1")
+        cache.set("key3", "value3")
+        self.assertEqual(["key1", "key3"], list(cache.items.keys()))
+
+    def test_unbounded_by_default(self):
+        cache = Cache()
+        for i in range(1000):
+            cache.set(i, i)
+        self.assertEqual(1000, len(cache.items))
+        self.assertEqual(0, cache.stats.evictions)
+
+    def test_size_accounting(self):
+        cache = Cache(size_of=len, max_entries=2)
+        cache.set("key1", "abc")
+        cache.set("key2", "abcde")
+        self.assertEqual(8, cache.size)
+        cache.set("key1", "a")
+        self.assertEqual(6, cache.size)
+        cache.set("key3", "ab")
+        self.assertEqual(3, cache.size)
+        cache.delete("key3")
+        self.assertEqual(1, cache.size)
+        cache.clear()
+        self.assertEqual(0, cache.size)
+
+    def test_stats(self):
+        cache = Cache(lifetime=0.2)
+        cache.get_or_resolve("key1", lambda key: "value1")
+        cache.get("key1")
+        cache.get("key2")
+        sleep(0.3)
+        cache.get("key1")
+        stats = cache.stats.as_dict()
+        self.assertEqual(1, stats["hits"])
+        self.assertEqual(2, stats["misses"])
+        self.assertEqual(1, stats["timeouts"])
+        self.assertEqual(1, stats["resolves"])
+        cache.reset_stats()
+        self.assertEqual(0, cache.stats.hits)
+
+    def test_concurrent_resolves_share_one_resolution(self):
+        cache = Cache()
+        calls = []
+        release = Event()
+        results = []
+
+        def resolve(key):
+            calls.append(key)
+            release.wait(5)
+            return "resolved"
+
+        threads = [Thread(target=lambda: results.append(cache.get_or_resolve("key1", resolve))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(["key1"], calls)
+        self.assertEqual(["resolved"] * 5, results)
+
+    def test_concurrent_resolves_share_failure(self):
+        cache = Cache()
+        calls = []
+        release = Event()
+        errors = []
+
+        def resolve(key):
+            calls.append(key)
+            release.wait(5)
+            raise ValueError("failed")
+
+        def request():
+            try:
+                cache.get_or_resolve("key1", resolve)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [Thread(target=request) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        sleep(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(["key1"], calls)
+        self.assertEqual(3, len(errors))
+
+    def test_reentrant_resolve_raises(self):
+        cache = Cache()
+
+        def resolve(key):
+            return cache.get_or_resolve(key, resolve)
+
+        self.assertRaises(CacheRecursionException, lambda: cache.get_or_resolve("key1", resolve))
+        self.assertEqual(cache.get_or_resolve("key1", lambda key: "value1"), "value1")
+
+    def test_failures_not_cached_by_default(self):
+        cache = Cache()
+        calls = []
+
+        def resolve(key):
+            calls.append(key)
+            raise ValueError("failed")
+
+        self.assertRaises(ValueError, lambda: cache.get_or_resolve("key1", resolve))
+        self.assertRaises(ValueError, lambda: cache.get_or_resolve("key1", resolve))
+        self.assertEqual(2, len(calls))
+
+    def test_negative_cache(self):
+        cache = Cache(negative_lifetime=0.3)
+        calls = []
+
+        def resolve(key):
+            calls.append(key)
+            raise ValueError("failed")
+
+        self.assertRaises(ValueError, lambda: cache.get_or_resolve("key1", resolve))
+        self.assertRaises(ValueError, lambda: cache.get_or_resolve("key1", resolve))
+        self.assertEqual(1, len(calls))
+        self.assertRaises(CacheNegativeException, lambda: cache.get_or_raise("key1"))
+        self.assertIsNone(cache.get("key1"))
+        sleep(0.5)
+        self.assertRaises(ValueError, lambda: cache.get_or_resolve("key1", resolve))
+        self.assertEqual(2, len(calls))
+
+    def test_negative_cache_respects_signature(self):
+        cache = Cache(negative_lifetime=30)
+
+        def fail(key):
+            raise ValueError("failed")
+
+        self.assertRaises(ValueError, lambda: cache.get_or_resolve("key1", fail, signature=1))
+        self.assertEqual(cache.get_or_resolve("key1", lambda key: "fixed", signature=2), "fixed")
+
+    def test_get_default(self):
+        cache = Cache()
+        self.assertIsNone(cache.get("key1"))
+        self.assertEqual("default", cache.get("key1", default="default"))
+        self.assertIs(MISSING, cache.get("key1", default=MISSING))
+
+    def test_get_distinguishes_falsy_values_from_misses(self):
+        cache = Cache()
+        cache.set("none", None)
+        cache.set("empty", [])
+        self.assertIsNone(cache.get("none", default=MISSING))
+        self.assertEqual([], cache.get("empty", default=MISSING))
+        self.assertIs(MISSING, cache.get("missing", default=MISSING))
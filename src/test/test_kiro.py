@@ -4,7 +4,10 @@ __package__ = pkg()
 
 import unittest
 import bpy
-from os import path
+import random
+import shutil
+import tempfile
+from os import path, remove
 from ..lib import kiro
 from ..lib import types
 
@@ -33,5 +36,308 @@ class KiroImageTest(unittest.TestCase):
         kiro_json_paths = [kim.json_path for kim in kiro_images]
         self.assertListEqual(kiro_json_paths, tj_paths)
 
+    def test_empty_image_list_is_cached(self):
+        if kiro.kiro_images():
+            self.skipTest("The current file already has Kiro images")
+        misses = kiro._general_cache.stats.misses
+        for _ in range(10):
+            kiro.kiro_images()
+        self.assertEqual(misses, kiro._general_cache.stats.misses)
+
     def test_infer_packed_kirofile(self):
         self.skipTest("Not implemented yet")
+
+
+class FakeImage:
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.name = self.name_full = path.basename(filepath)
+
+    def as_pointer(self) -> int:
+        return id(self)
+
+
+class SidecarRemovedTest(unittest.TestCase):
+    def setUp(self) -> None:
+        kiro._test_clear_caches()
+        self.directory = tempfile.mkdtemp()
+        self.image_path = path.join(self.directory, "image1.png")
+        self.json_path = path.join(self.directory, "image1.kiro.json")
+        shutil.copy(ti_paths[0], self.image_path)
+        shutil.copy(tj_paths[0], self.json_path)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+        kiro._test_clear_caches()
+
+    def test_removed_sidecar_is_noticed(self):
+        image = FakeImage(self.image_path)
+        self.assertEqual(self.json_path, kiro._indexed_image_meta(image).json_path)
+        remove(self.json_path)
+        self.assertIsNone(kiro._indexed_image_meta(image).json_path)
+
+    def test_missing_sidecar_data_is_none(self):
+        self.assertIsNotNone(kiro.kiro_data(self.json_path))
+        remove(self.json_path)
+        self.assertIsNone(kiro.kiro_data(self.json_path))
+        self.assertIsNone(kiro.kiro_data(path.join(self.directory, "missing.kiro.json")))
+
+
+class FakeSocket:
+    def __init__(self, default_value):
+        self.default_value = default_value
+
+
+class FakeNodeTree(dict):
+    def __init__(self, nodes=(), kiro_id=None):
+        super().__init__()
+        self.nodes = list(nodes)
+        if kiro_id:
+            self["kiro_id"] = kiro_id
+
+    def as_pointer(self):
+        return id(self)
+
+
+class FakeGroupNode:
+    type = "GROUP"
+
+    def __init__(self, node_tree, keyset=None):
+        self.node_tree = node_tree
+        self.inputs = {"Keyset": FakeSocket(keyset)} if keyset is not None else {}
+
+
+def grid_picker(keyset):
+    return FakeGroupNode(FakeNodeTree(kiro_id="GRID_PICKER_0.2"), keyset)
+
+
+class NodeTreeKeysetsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        kiro._test_clear_caches()
+
+    def test_nested_groups(self):
+        inner = FakeNodeTree([grid_picker("inner keyset")])
+        middle = FakeNodeTree([FakeGroupNode(inner), grid_picker("middle keyset")])
+        tree = FakeNodeTree([FakeGroupNode(middle), grid_picker("top keyset"), FakeGroupNode(None)])
+        self.assertEqual({"inner keyset", "middle keyset", "top keyset"}, kiro.node_tree_keysets(tree))
+
+    def test_shared_group_is_indexed_once(self):
+        shared = FakeNodeTree([grid_picker("shared keyset")])
+        tree_a = FakeNodeTree([FakeGroupNode(shared), grid_picker("a")])
+        tree_b = FakeNodeTree([FakeGroupNode(shared)])
+        self.assertEqual({"shared keyset", "a"}, kiro.node_tree_keysets(tree_a))
+        shared.nodes.clear()
+        self.assertEqual({"shared keyset"}, kiro.node_tree_keysets(tree_b))
+        kiro.invalidate_node_trees()
+        self.assertEqual(frozenset(), kiro.node_tree_keysets(tree_b))
+
+    def test_recursive_groups(self):
+        group_a = FakeNodeTree([grid_picker("a")])
+        group_b = FakeNodeTree([grid_picker("b"), FakeGroupNode(group_a)])
+        group_a.nodes.append(FakeGroupNode(group_b))
+        self.assertEqual({"a", "b"}, kiro.node_tree_keysets(group_a))
+        self.assertEqual({"a", "b"}, kiro.node_tree_keysets(group_b))
+
+    def test_broken_grid_pickers_are_ignored(self):
+        tree = FakeNodeTree([
+            grid_picker(""),
+            FakeGroupNode(FakeNodeTree(kiro_id="GRID_PICKER_0.1"), "old keyset"),
+            FakeGroupNode(FakeNodeTree(kiro_id="GRID_PICKER_0.2")),
+        ])
+        self.assertEqual(frozenset(), kiro.node_tree_keysets(tree))
+
+
+class FakeUpdate:
+    def __init__(self, id: bpy.types.ID, geometry: bool):
+        self.id = id
+        self.is_updated_geometry = geometry
+
+
+class FakeDepsgraph:
+    def __init__(self, id_types: set[str], updates: list[FakeUpdate]):
+        self.id_types = id_types
+        self.updates = updates
+
+    def id_type_updated(self, id_type: str) -> bool:
+        return id_type in self.id_types
+
+
+class MaterialUsersTest(unittest.TestCase):
+    def setUp(self) -> None:
+        kiro._test_clear_caches()
+        self.material = bpy.data.materials.new("Kiro Test Material")
+        self.meshes = [bpy.data.meshes.new(f"Kiro Test Mesh {i}") for i in range(3)]
+        self.objects = [bpy.data.objects.new(f"Kiro Test Object {i}", mesh) for (i, mesh) in enumerate(self.meshes)]
+        self.meshes[0].materials.append(self.material)
+        self.meshes[2].materials.append(self.material)
+        self.meshes[2].materials.append(self.material)
+
+    def tearDown(self) -> None:
+        for obj in self.objects:
+            bpy.data.objects.remove(obj)
+        for mesh in self.meshes:
+            bpy.data.meshes.remove(mesh)
+        bpy.data.materials.remove(self.material)
+
+    def test_material_users(self):
+        users = kiro.material_users(self.material)
+        self.assertEqual({self.objects[0].name, self.objects[2].name}, {obj.name for obj in users})
+        self.assertEqual(2, len(users))
+
+    def test_index_is_kept_until_invalidated(self):
+        kiro.material_users(self.material)
+        self.meshes[1].materials.append(self.material)
+        self.assertEqual(2, len(kiro.material_users(self.material)))
+        kiro.invalidate_material_users()
+        self.assertEqual(3, len(kiro.material_users(self.material)))
+
+    def test_removed_objects_are_skipped(self):
+        kiro.material_users(self.material)
+        bpy.data.objects.remove(self.objects.pop(0))
+        self.assertEqual([self.objects[1].name], [obj.name for obj in kiro.material_users(self.material)])
+
+    def test_index_survives_unrelated_updates(self):
+        kiro.material_users(self.material)
+        # A transform or selection change
+        kiro.on_depsgraph_update(FakeDepsgraph({"OBJECT"}, [FakeUpdate(self.objects[0], geometry=False)]))
+        self.assertIsNotNone(kiro._material_users_index)
+        kiro.on_depsgraph_update(FakeDepsgraph({"OBJECT"}, [FakeUpdate(self.objects[0], geometry=True)]))
+        self.assertIsNone(kiro._material_users_index)
+
+    def test_index_is_dropped_by_mesh_and_material_updates(self):
+        for id_type in ("MESH", "MATERIAL"):
+            kiro.material_users(self.material)
+            kiro.on_depsgraph_update(FakeDepsgraph({id_type}, []))
+            self.assertIsNone(kiro._material_users_index, id_type)
+
+    def test_added_objects_are_found(self):
+        kiro.material_users(self.material)
+        self.meshes.append(bpy.data.meshes.new("Kiro Test Mesh 3"))
+        self.meshes[3].materials.append(self.material)
+        self.objects.append(bpy.data.objects.new("Kiro Test Object 3", self.meshes[3]))
+        self.assertEqual(3, len(kiro.material_users(self.material)))
+
+
+class LayoutTest(unittest.TestCase):
+    def setUp(self) -> None:
+        kiro._test_clear_caches()
+        self.keyset = types.KiroKeyset("test", 10, 10, 0, keys=list("QWERTYASDF") + ["NUM0", "NUM.", "ENTER"])
+
+    def test_parse_layout(self):
+        layout = kiro._parse_layout("test", {"rows": [
+            {"keys": ["A", "B"]},
+            {"x": 0.5, "keys": ["C", {"key": "D", "x": 3}, "E", {"key": "F", "y": 5}]},
+        ]})
+        self.assertEqual(("A", "B", "C", "D", "E", "F"), layout.tokens)
+        self.assertEqual(((0, 0), (1, 0), (0.5, 1), (3, 1), (4, 1), (5, 5)), layout.positions)
+        self.assertEqual(3, layout.index_of("D"))
+        self.assertIsNone(layout.index_of("Z"))
+
+    def test_parse_flat_layout(self):
+        layout = kiro._parse_layout("test", ["A", "B"])
+        self.assertEqual(((0, 0), (1, 0)), layout.positions)
+
+    def test_layout_sequence(self):
+        self.assertEqual([0, 1, 2], kiro.layout_sequence(0, 3, "US QWERTY", self.keyset))
+        self.assertEqual([2, 1, 0], kiro.layout_sequence(2, -3, "US QWERTY", self.keyset))
+        self.assertEqual([6], kiro.layout_sequence(6, 3, "Numeric Keypad", self.keyset))
+
+    def test_layout_placements(self):
+        placements = kiro.layout_placements("Numeric Keypad", self.keyset)
+        self.assertEqual([(10, (0, 0), "NUM0", 13), (11, (2, 0), "NUM.", 14), (12, (3, -0.5), "ENTER", 15)],
+                         placements)
+
+    def test_layout_placements_are_relative_to_the_anchor(self):
+        placements = {token: position for (_, position, token, _) in
+                      kiro.layout_placements("US QWERTY", self.keyset, anchor_index=6)}
+        self.assertEqual((0, 0), placements["A"])
+        self.assertEqual((-0.25, -1), placements["Q"])
+        self.assertEqual((3, 0), placements["F"])
+
+
+def reference_string_to_tokens(characters: str, space_to_none: bool = False) -> list[str | None]:
+    """The original character-at-a-time tokenizer, kept to check the regex one against"""
+    tokens = []
+    in_long_token = False
+    for char in characters:
+        if char == "[" and not in_long_token:
+            in_long_token = True
+            tokens.append("")
+            continue
+        if char == " " and space_to_none and not in_long_token:
+            tokens.append(None)
+            continue
+        if char == "]" and in_long_token:
+            in_long_token = False
+            continue
+        if in_long_token:
+            tokens[-1] += char
+            continue
+        tokens.append(char)
+    return tokens
+
+
+class TokenizeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.keyset = types.KiroKeyset("test", 4, 2, 0, keys=["A", "b", "Enter", "[", "]", None, "Shift", "\\"])
+
+    def test_fuzz_against_reference(self):
+        rng = random.Random(1234)
+        alphabet = "aAbZ []\\\n\t"
+        for _ in range(2000):
+            string = "".join(rng.choice(alphabet) for _ in range(rng.randrange(0, 24)))
+            for space_to_none in (False, True):
+                expected = reference_string_to_tokens(string, space_to_none)
+                self.assertEqual(expected, kiro.string_to_tokens(string, space_to_none), repr(string))
+                self.assertEqual(expected, list(kiro.iter_tokens(string, space_to_none)), repr(string))
+                tokenized = kiro.tokenize(string, self.keyset, space_to_none)
+                normalized = kiro.normalize_tokens(expected, self.keyset)
+                self.assertEqual(expected, tokenized.tokens)
+                self.assertEqual(normalized, tokenized.normalized)
+                self.assertEqual(kiro.tokens_to_indices(normalized, self.keyset), tokenized.indices)
+
+    def test_unknown_tokens(self):
+        tokenized = kiro.tokenize("a[Nope]x [B]", self.keyset)
+        self.assertEqual([(1, "Nope"), (7, "x"), (8, " ")], tokenized.unknown)
+        self.assertEqual([0, 1], tokenized.indices)
+        self.assertIsNone(tokenized.unclosed_at)
+
+    def test_escapes(self):
+        self.assertEqual(["[", "a", "]", "\\"], kiro.string_to_tokens("\\[a\\]\\\\", escapes=True))
+        self.assertEqual(["a]b", "c"], kiro.string_to_tokens("[a\\]b]c", escapes=True))
+        self.assertEqual(["\\"], kiro.string_to_tokens("\\", escapes=True))
+        self.assertEqual([" ", None], kiro.string_to_tokens("\\  ", space_to_none=True, escapes=True))
+        self.assertEqual([3, 4], kiro.tokenize("\\[\\]", self.keyset, escapes=True).indices)
+
+    def test_detect_wrong_keyset(self):
+        self.assertFalse(kiro.detect_wrong_keyset("Ab [Enter]", self.keyset))
+        self.assertTrue(kiro.detect_wrong_keyset("Abc", self.keyset))
+        # A bracketed token that is still being typed is not counted
+        self.assertFalse(kiro.detect_wrong_keyset("Ab [Ent", self.keyset))
+        self.assertTrue(kiro.detect_wrong_keyset("[Nope] [Ent", self.keyset))
+
+
+class WrapKeysTest(unittest.TestCase):
+    def wrap(self, string: str, width: int) -> list[str]:
+        """Wrap a string of single-character keys, with spaces as gaps, and join the rows back into strings"""
+        indices = [None if char == " " else ord(char) for char in string]
+        tokens = [None if char == " " else char for char in string]
+        rows = kiro.wrap_keys(indices, tokens, width)
+        for (row_indices, row_tokens) in rows:
+            self.assertEqual([None if token is None else ord(token) for token in row_tokens], row_indices)
+        return ["".join(" " if token is None else token for token in row_tokens) for (_, row_tokens) in rows]
+
+    def test_no_wrap(self):
+        self.assertEqual(["ab cd"], self.wrap("ab cd", 0))
+        self.assertEqual(["ab cd"], self.wrap("ab cd", 5))
+
+    def test_wrap_at_gaps(self):
+        self.assertEqual(["ab cd", "ef"], self.wrap("ab cd ef", 6))
+        self.assertEqual(["ab cd", "ef"], self.wrap("ab cd  ef", 5))
+        self.assertEqual(["ab", "cd", "ef"], self.wrap("ab cd ef", 4))
+
+    def test_split_long_words(self):
+        self.assertEqual(["abc", "def", "g", "hi"], self.wrap("abcdefg hi", 3))
+
+    def test_keeps_indentation(self):
+        self.assertEqual(["  ab", "cd"], self.wrap("  ab cd", 4))
@@ -3,8 +3,10 @@ from . import pkg
 __package__ = pkg()
 
 import unittest
-from importlib import util as il_util
-from os import path
+import pickle
+from os import path, listdir
+from tempfile import TemporaryDirectory
+from ..lib import disk_cache
 from ..lib import metadata
 
 """
@@ -50,30 +52,50 @@ def valid_object():
     }
 
 
-has_jsonschema = bool(il_util.find_spec("jsonschema"))
-
-
 class DataTest(unittest.TestCase):
     def test_valid_json_object(self):
-        if not has_jsonschema:
-            self.skipTest("The jsonschema module is not installed. Schema validation will always succeed.")
         self.assertTrue(metadata.validate(valid_object(), "test_data"))
 
     def test_valid_json_object_with_optional_missing(self):
-        if not has_jsonschema:
-            self.skipTest("The jsonschema module is not installed. Schema validation will always succeed.")
         kirofile = valid_object()
         del (kirofile["kiro"])
         self.assertTrue(metadata.validate(kirofile, "test_data", strict=True))
 
     def test_invalid_json_object(self):
-        if not has_jsonschema:
-            self.skipTest("The jsonschema module is not installed. Schema validation will always succeed.")
         kirofile = valid_object()
         del (kirofile["keysets"])
         self.assertRaises(metadata.KiroValidationException,
                           lambda: metadata.validate(kirofile, "test_data", strict=True))
 
+    def test_invalid_json_object_lists_every_error(self):
+        kirofile = valid_object()
+        del (kirofile["name"])
+        kirofile["keysets"]["keyset A1"]["cols"] = "four"
+        kirofile["keysets"]["keyset B1"]["rows"] = "three"
+        try:
+            metadata.validate(kirofile, "test_data")
+            self.fail("KiroValidationException not raised")
+        except metadata.KiroValidationException as e:
+            self.assertEqual(3, len(e.errors))
+            for error in e.errors:
+                self.assertIn(error, e.msg)
+
+    def test_known_valid_content_is_not_revalidated(self):
+        self.assertTrue(metadata.validate(valid_object(), "test_data", content_hash="test-known-valid"))
+        kirofile = valid_object()
+        del (kirofile["keysets"])
+        self.assertTrue(metadata.validate(kirofile, "test_data", content_hash="test-known-valid"))
+        self.assertRaises(metadata.KiroValidationException,
+                          lambda: metadata.validate(kirofile, "test_data", content_hash="test-other"))
+
+    def test_schema_is_loaded_on_first_validation(self):
+        metadata._kirofile_schema = None
+        metadata._jsonschema_validator = None
+        kirofile = valid_object()
+        del (kirofile["keysets"])
+        self.assertRaises(metadata.KiroValidationException, lambda: metadata.validate(kirofile, "test_data"))
+        self.assertIsNotNone(metadata._kirofile_schema)
+
     def test_load_success(self):
         json_path = path.join(path.dirname(__file__), "testdata", "image1.kiro.json")
         kiro_metadata = metadata.load(json_path)
@@ -84,8 +106,6 @@ class DataTest(unittest.TestCase):
         self.assertRaises(FileNotFoundError, lambda: metadata.load(json_path))
 
     def test_load_file_not_valid(self):
-        if not has_jsonschema:
-            self.skipTest("The jsonschema module is not installed. Schema validation will always succeed.")
         json_path = path.join(path.dirname(__file__), "testdata", "not_schema_compliant.kiro.json")
         self.assertRaises(metadata.KiroValidationException, lambda: metadata.load(json_path))
 
@@ -94,5 +114,61 @@ class DataTest(unittest.TestCase):
         self.assertRaises(metadata.KiroValidationException, lambda: metadata.load(json_path))
 
 
+class PersistentCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.store = disk_cache.DiskCache(self.directory.name, "test")
+        self.json_path = path.join(path.dirname(__file__), "testdata", "image1.kiro.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_load_stores_record(self):
+        metadata.load(self.json_path, store=self.store)
+        self.assertEqual(1, len(listdir(self.directory.name)))
+
+    def test_load_from_store_matches(self):
+        loaded = metadata.load(self.json_path, store=self.store)
+        restored = metadata.load(self.json_path, store=self.store)
+        self.assertEqual(loaded.name, restored.name)
+        self.assertEqual(loaded.description, restored.description)
+        self.assertEqual(list(loaded.keysets.keys()), list(restored.keysets.keys()))
+        for (name, keyset) in loaded.keysets.items():
+            self.assertEqual(keyset.keys, restored.keysets[name].keys)
+            self.assertEqual(keyset.length, restored.keysets[name].length)
+            self.assertIs(restored, restored.keysets[name].parent)
+
+    def test_record_round_trip_with_alt_for(self):
+        instance = metadata._dict_to_instance(valid_object())
+        restored = metadata._record_to_instance(metadata._instance_to_record(instance))
+        self.assertEqual(instance.keysets["keyset A1"].keys, restored.keysets["keyset A2"].keys)
+        self.assertEqual(4, restored.keysets["keyset A2"].length)
+        self.assertEqual(3, restored.keysets["keyset A1"].index_of("4"))
+
+    def test_stored_record_is_used(self):
+        metadata.load(self.json_path, store=self.store)
+        filename = listdir(self.directory.name)[0]
+        record = self.store.get(filename[len(self.store.prefix):-len(".pickle")])
+        record["name"] = "from store"
+        self.store.set(filename[len(self.store.prefix):-len(".pickle")], record)
+        self.assertEqual("from store", metadata.load(self.json_path, store=self.store).name)
+
+    def test_invalid_file_not_stored(self):
+        json_path = path.join(path.dirname(__file__), "testdata", "not_json.kiro.json")
+        self.assertRaises(metadata.KiroValidationException, lambda: metadata.load(json_path, store=self.store))
+        self.assertEqual(0, len(listdir(self.directory.name)))
+
+    def test_objects_are_not_unpickled(self):
+        with open(path.join(self.directory.name, f"{self.store.prefix}evil.pickle"), "wb") as file:
+            pickle.dump(disk_cache.DiskCache("x", "y"), file)
+        self.assertIsNone(self.store.get("evil"))
+
+    def test_prune(self):
+        store = disk_cache.DiskCache(self.directory.name, "prune", max_files=3)
+        for i in range(5):
+            store.set(str(i), i)
+        self.assertEqual(3, len(listdir(self.directory.name)))
+
+
 if __name__ == '__main__':
     unittest.main()
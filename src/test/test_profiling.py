@@ -0,0 +1,109 @@
+from . import pkg
+__package__ = pkg()
+
+import unittest
+from unittest import mock
+from ..lib import profiling
+
+
+class ProfilingTest(unittest.TestCase):
+    def setUp(self):
+        self.was_enabled = profiling.enabled
+        profiling.clear()
+        # Only snapshot this test's counters, not the ones the addon registers
+        self.sources = mock.patch.dict(profiling._counter_sources, clear=True)
+        self.sources.start()
+
+    def tearDown(self):
+        profiling.enabled = self.was_enabled
+        profiling.clear()
+        self.sources.stop()
+
+    def test_disabled_records_nothing(self):
+        profiling.enabled = False
+        with profiling.phase("nothing"):
+            pass
+        self.assertEqual([], profiling.events())
+
+    def test_phase(self):
+        profiling.enabled = True
+        with profiling.phase("outer", keys=3):
+            with profiling.phase("inner"):
+                pass
+        recorded = profiling.events()
+        self.assertEqual(["inner", "outer"], [event[1] for event in recorded])
+        (kind, name, category, start, duration, thread, args) = recorded[1]
+        self.assertEqual(("X", "kiro", {"keys": 3}), (kind, category, args))
+        self.assertGreaterEqual(duration, recorded[0][4])
+
+    def test_phase_records_on_exception(self):
+        profiling.enabled = True
+        with self.assertRaises(ValueError):
+            with profiling.phase("broken"):
+                raise ValueError()
+        self.assertEqual(["broken"], [event[1] for event in profiling.events()])
+
+    def test_profiled_records_counters(self):
+        profiling.add_counter_source("test", lambda: {"test counters": {"hits": 2}})
+
+        @profiling.profiled("Operator")
+        def operator():
+            return {'FINISHED'}
+
+        profiling.enabled = False
+        self.assertEqual({'FINISHED'}, operator())
+        self.assertEqual([], profiling.events())
+
+        profiling.enabled = True
+        self.assertEqual({'FINISHED'}, operator())
+        recorded = profiling.events()
+        self.assertIn(("C", "test counters", "counters"), [event[:3] for event in recorded])
+        self.assertIn(("X", "Operator", "operator"), [event[:3] for event in recorded])
+
+    def test_profiled_keeps_callback_arguments(self):
+        # Blender refuses to register an Operator whose callbacks have the wrong number of arguments
+        class Operator:
+            @profiling.profiled("execute")
+            def execute(self, context):
+                return {'FINISHED'}
+
+            @profiling.profiled("invoke")
+            def invoke(self, context, event):
+                return {'RUNNING_MODAL'}
+
+        self.assertEqual(2, Operator.execute.__code__.co_argcount)
+        self.assertEqual(3, Operator.invoke.__code__.co_argcount)
+        profiling.enabled = True
+        self.assertEqual({'FINISHED'}, Operator().execute(None))
+        self.assertEqual({'RUNNING_MODAL'}, Operator().invoke(None, None))
+        self.assertEqual(["execute", "invoke"], [event[1] for event in profiling.events() if event[0] == "X"])
+
+    def test_ring_buffer(self):
+        profiling.enabled = True
+        for i in range(profiling._BUFFER_SIZE + 5):
+            with profiling.phase(str(i)):
+                pass
+        recorded = profiling.events()
+        self.assertEqual(profiling._BUFFER_SIZE, len(recorded))
+        self.assertEqual("5", recorded[0][1])
+
+    def test_chrome_trace(self):
+        profiling.enabled = True
+        profiling.add_counter_source("test", lambda: {"test counters": {"hits": 2}})
+        with profiling.phase("traced", counters=True):
+            pass
+        trace = profiling.chrome_trace()["traceEvents"]
+        self.assertEqual(["X", "C"], [event["ph"] for event in trace])
+        self.assertIn("dur", trace[0])
+        self.assertNotIn("dur", trace[1])
+        self.assertEqual({"hits": 2}, trace[1]["args"])
+
+    def test_text_report(self):
+        profiling.enabled = True
+        with profiling.phase("reported", keys=3):
+            pass
+        self.assertIn("reported (keys=3)", profiling.text_report())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+from . import pkg
+
+__package__ = pkg()
+
+import unittest
+from .. import get_classes
+
+# Blender checks these when a class is registered, and refuses the whole class if the count is wrong
+_CALLBACK_ARG_COUNTS = {"execute": 2, "invoke": 3, "modal": 3, "draw": 2, "poll": 2}
+
+
+class CallbackArgumentsTest(unittest.TestCase):
+    def test_callback_arguments(self):
+        for cls in get_classes():
+            for callback, arg_count in _CALLBACK_ARG_COUNTS.items():
+                # Only the class's own callbacks, unwrapped from classmethod for poll
+                fn = getattr(cls.__dict__.get(callback), "__func__", cls.__dict__.get(callback))
+                if fn is None:
+                    continue
+                with self.subTest(cls=cls.__name__, callback=callback):
+                    self.assertEqual(arg_count, fn.__code__.co_argcount)
+
+
+if __name__ == '__main__':
+    unittest.main()
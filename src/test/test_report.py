@@ -0,0 +1,60 @@
+from . import pkg
+
+__package__ = pkg()
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+from tempfile import TemporaryDirectory
+from ..lib import disk_cache
+from ..lib import kiro
+from ..lib import report
+
+testdata_path = path.join(path.dirname(__file__), "testdata")
+
+
+def image_path(filename: str) -> str:
+    return path.join(testdata_path, filename)
+
+
+class ImageReporterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        kiro._test_clear_caches()
+        self.cache_dir = TemporaryDirectory()
+        self.original_store = kiro._persistent_store
+        kiro._persistent_store = disk_cache.DiskCache(self.cache_dir.name, "test")
+
+    def tearDown(self) -> None:
+        kiro._persistent_store = self.original_store
+        self.cache_dir.cleanup()
+
+    def test_valid_sidecar(self):
+        r = report.ImageReporter("image1.png", "image1.png", image_path("image1.png"))
+        self.assertEqual(image_path("image1.kiro.json"), r.kiro_meta.json_path)
+        self.assertTrue(r.is_valid_json)
+
+    def test_no_sidecar(self):
+        r = report.ImageReporter("nothing.png", "nothing.png", image_path("nothing.png"))
+        self.assertIsNone(r.kiro_meta.json_path)
+        self.assertTrue(r.is_valid_json)
+
+    def test_invalid_sidecar(self):
+        r = report.ImageReporter("not_json.png", "not_json.png", image_path("not_json.png"))
+        self.assertFalse(r.is_valid_json)
+        self.assertIn("JSON parse error", r.validation_error)
+
+    def test_workers_share_the_data_cache(self):
+        kiro._data_cache.reset_stats()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            reporters = list(executor.map(lambda _: report.ImageReporter("a", "a", image_path("image1.png")),
+                                          range(20)))
+        self.assertTrue(all(r.is_valid_json for r in reporters))
+        stats = kiro._data_cache.stats
+        self.assertEqual(1, stats.resolves, stats.as_dict())
+        self.assertEqual(20, stats.resolves + stats.shared_resolves + stats.hits)
+        self.assertTrue(kiro.kiro_data(image_path("image1.kiro.json")))
+        self.assertEqual(1, kiro._data_cache.stats.resolves)
+
+
+if __name__ == '__main__':
+    unittest.main()
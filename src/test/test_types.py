@@ -0,0 +1,79 @@
+from . import pkg
+
+__package__ = pkg()
+
+import unittest
+from ..lib import types
+
+
+def sample_metadata() -> types.KiroMetaData:
+    return types.KiroMetaData(
+        version=1.0,
+        name="Sample",
+        description=None,
+        keysets={
+            "main": types.KiroKeyset(name="main", cols=4, rows=2, start=0,
+                                     keys=["a", "B", None, "Enter", "a", "ß", None, "x"]),
+            "alt": types.KiroKeyset(name="alt", cols=4, rows=2, start=0, length=8, alt_for="main"),
+            "orphan": types.KiroKeyset(name="orphan", cols=4, rows=2, start=0, length=8, alt_for="missing"),
+        }
+    )
+
+
+class KiroKeysetTest(unittest.TestCase):
+    def test_index_of_finds_first_occurrence(self):
+        keyset = sample_metadata().keysets["main"]
+        self.assertEqual(0, keyset.index_of("a"))
+        self.assertEqual(3, keyset.index_of("Enter"))
+        self.assertEqual(7, keyset.index_of("x"))
+
+    def test_index_of_missing(self):
+        keyset = sample_metadata().keysets["main"]
+        self.assertIsNone(keyset.index_of("z"))
+        self.assertIsNone(keyset.index_of("b"))
+
+    def test_index_matches_list_index(self):
+        keyset = sample_metadata().keysets["main"]
+        for key in [k for k in keyset.keys if k is not None]:
+            self.assertEqual(keyset.keys.index(key), keyset.index_of(key))
+
+    def test_reassigning_keys_rebuilds_index(self):
+        keyset = sample_metadata().keysets["main"]
+        keyset.keys = ["q", "a"]
+        self.assertEqual(1, keyset.index_of("a"))
+        self.assertIsNone(keyset.index_of("x"))
+
+    def test_normalize_token_precedence(self):
+        keyset = sample_metadata().keysets["main"]
+        self.assertEqual("a", keyset.normalize_token("a"))
+        self.assertEqual("a", keyset.normalize_token("A"))
+        self.assertEqual("B", keyset.normalize_token("b"))
+        self.assertEqual("Enter", keyset.normalize_token("Enter"))
+        self.assertIsNone(keyset.normalize_token("enter"))
+        self.assertIsNone(keyset.normalize_token("z"))
+
+    def test_alt_for_uses_primary_keys(self):
+        keyset = sample_metadata().keysets["alt"]
+        self.assertEqual(sample_metadata().keysets["main"].keys, keyset.keys)
+        self.assertEqual(3, keyset.index_of("Enter"))
+        self.assertEqual("B", keyset.normalize_token("b"))
+
+    def test_alt_for_missing_primary(self):
+        keyset = sample_metadata().keysets["orphan"]
+        with self.assertWarns(RuntimeWarning):
+            self.assertIsNone(keyset.index_of("a"))
+
+    def test_tokens_are_interned(self):
+        first = types.KiroKeyset("first", 2, 1, 0, keys=["".join(["En", "ter"]), None])
+        second = types.KiroKeyset("second", 2, 1, 0, keys=["".join(["Ent", "er"]), None])
+        self.assertEqual(("Enter", None), first.keys)
+        self.assertIs(first.keys[0], second.keys[0])
+
+    def test_no_instance_dict(self):
+        keyset = sample_metadata().keysets["main"]
+        self.assertFalse(hasattr(keyset, "__dict__"))
+        self.assertFalse(hasattr(keyset.parent, "__dict__"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,306 @@
+from . import pkg
+
+__package__ = pkg()
+
+import unittest
+import bpy
+from unittest import mock
+from mathutils import Vector
+from ..lib import typeset
+
+
+class FirstDifferenceTest(unittest.TestCase):
+    def test_identical(self):
+        self.assertEqual(3, typeset.first_difference([1, 2, 3], [1, 2, 3]))
+
+    def test_changed_keycap(self):
+        self.assertEqual(1, typeset.first_difference([1, 2, 3], [1, 5, 3]))
+
+    def test_appended(self):
+        self.assertEqual(3, typeset.first_difference([1, 2, 3], [1, 2, 3, 4]))
+
+    def test_truncated(self):
+        self.assertEqual(2, typeset.first_difference([1, 2, 3], [1, 2]))
+
+    def test_gap_opened(self):
+        self.assertEqual(1, typeset.first_difference([1, 2, 3], [1, None, 3]))
+
+    def test_empty(self):
+        self.assertEqual(0, typeset.first_difference([], [1, 2]))
+
+
+class SceneTestCase(unittest.TestCase):
+    """Makes a 1 x 1 keycap in its own collection in the scene, and removes everything in the collection afterwards"""
+
+    def setUp(self) -> None:
+        self.collection = bpy.data.collections.new("Kiro Test Typeset")
+        bpy.context.scene.collection.children.link(self.collection)
+        self.mesh = bpy.data.meshes.new("Kiro Test Key")
+        self.mesh.from_pydata([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], [], [(0, 1, 2, 3)])
+        self.original = bpy.data.objects.new("Kiro Test Key", self.mesh)
+        self.collection.objects.link(self.original)
+        bpy.context.view_layer.update()
+
+    def tearDown(self) -> None:
+        meshes = {obj.data for obj in self.collection.objects if obj.data is not None}
+        bpy.data.batch_remove(list(self.collection.objects))
+        bpy.data.batch_remove(list(meshes))
+        bpy.data.collections.remove(self.collection)
+
+
+class RunTest(SceneTestCase):
+    def extend(self, indices: list[int | None], gap: float = 0) -> dict[int, bpy.types.Object]:
+        typeset.extend_from_original(self.original, indices, target=self.collection, gap=gap)
+        return typeset.find_run(self.original, self.collection)
+
+    def update(self, run: dict[int, bpy.types.Object], indices: list[int | None],
+               gap: float = 0) -> dict[int, bpy.types.Object]:
+        typeset.update_run(self.original, run, indices, target=self.collection, gap=gap)
+        return typeset.find_run(self.original, self.collection)
+
+    def assertRun(self, expected: dict[int, tuple[int, float]], run: dict[int, bpy.types.Object]) -> None:
+        """Check the run's {position: (keycap, x location)}, and that nothing else is left in the collection"""
+        self.assertEqual(sorted(expected.keys()), sorted(run.keys()))
+        for (position, (keycap, x)) in expected.items():
+            self.assertEqual(keycap, run[position]["keycap"])
+            self.assertAlmostEqual(x, run[position].location.x, places=5)
+            self.assertAlmostEqual(0, run[position].location.y, places=5)
+        self.assertEqual(len(expected) + 1, len(self.collection.objects))
+
+    def test_find_run(self):
+        run = self.extend([1, 2, 3])
+        self.assertRun({1: (2, 1), 2: (3, 2)}, run)
+
+    def test_guide_wire_runs_are_not_found(self):
+        typeset.extend_from_original(self.original, [1, 2], target=self.collection, guide_wire=True)
+        self.assertIsNone(typeset.find_run(self.original, self.collection))
+
+    def test_gap_opened(self):
+        run = self.extend([1, 2, 3, 4])
+        kept = run[3]
+        run = self.update(run, [1, None, 3, 4])
+        self.assertRun({2: (3, 2), 3: (4, 3)}, run)
+        self.assertIs(kept, run[3])
+
+    def test_gap_closed(self):
+        run = self.extend([1, None, 3])
+        kept = run[2]
+        run = self.update(run, [1, 2, 3])
+        self.assertRun({1: (2, 1), 2: (3, 2)}, run)
+        self.assertIs(kept, run[2])
+
+    def test_shortened(self):
+        run = self.extend([1, 2, 3, 4])
+        run = self.update(run, [1, 2])
+        self.assertRun({1: (2, 1)}, run)
+
+    def test_keycap_changed(self):
+        run = self.extend([1, 2, 3])
+        run = self.update(run, [1, 5, 3])
+        self.assertRun({1: (5, 1), 2: (3, 2)}, run)
+
+    def test_spacing_changed(self):
+        run = self.extend([1, 2, 3])
+        run = self.update(run, [1, 2, 3], gap=0.5)
+        self.assertRun({1: (2, 1.5), 2: (3, 3)}, run)
+
+
+class TypesetRowsTest(SceneTestCase):
+    def test_chunked_rows(self):
+        rows = [
+            ([None, 1, 2], [None, "a", "b"]),
+            ([], []),
+            ([3, None, 4], ["c", None, "d"]),
+        ]
+        with mock.patch.object(typeset, "create_keycaps", wraps=typeset.create_keycaps) as create_keycaps:
+            made = typeset.typeset_rows(self.original, iter(rows), self.collection, chunk_size=2)
+        self.assertEqual(4, made)
+        self.assertEqual([2, 2], [len(call.args[1]) for call in create_keycaps.call_args_list])
+
+        # The first line starts with a gap, so the original stays put with no keycap of its own
+        self.assertNotIn("keycap", self.original)
+        self.assertEqual(0, self.original[typeset.RUN_POSITION])
+        self.assertEqual((0, 0, 0), tuple(self.original.location))
+
+        # {run position: (keycap, x, y)}, with rows stepping toward -Y. The blank line still takes a row.
+        expected = {1: (1, 1, 0), 2: (2, 2, 0), 3: (3, 0, -2), 5: (4, 2, -2)}
+        copies = {obj[typeset.RUN_POSITION]: obj for obj in self.collection.objects if obj != self.original}
+        self.assertEqual(sorted(expected.keys()), sorted(copies.keys()))
+        for (position, (keycap, x, y)) in expected.items():
+            self.assertEqual(keycap, copies[position]["keycap"])
+            self.assertAlmostEqual(x, copies[position].location.x, places=5)
+            self.assertAlmostEqual(y, copies[position].location.y, places=5)
+
+    def test_original_takes_the_first_key(self):
+        made = typeset.typeset_rows(self.original, [([5, 6], ["e", "f"])], self.collection, row_gap=0.5)
+        self.assertEqual(1, made)
+        self.assertEqual(5, self.original["keycap"])
+
+
+class FakeKey:
+    def __init__(self, dimensions: tuple[float, float, float]):
+        self.dimensions = Vector(dimensions)
+
+
+class ComputeOffsetsTest(unittest.TestCase):
+    def test_keycap_zero_is_a_key(self):
+        # Keycap 0 is the first key of a keyset starting at 0, so it steps like any key, not like a gap
+        key = FakeKey((1, 2, 0.5))
+        offsets = typeset.compute_offsets(key, [1, 0, None, 2], gap=0.25, space_gap=0.5)
+        self.assertEqual([0, 1.25, 3, 4.25], [round(offset.x, 5) for offset in offsets])
+
+
+class GuideWireTest(unittest.TestCase):
+    def setUp(self) -> None:
+        if not typeset._HAS_NUMPY:
+            self.skipTest("NumPy is not available")
+
+    def test_offsets_array_matches_compute_offsets(self):
+        key = FakeKey((1, 2, 0.5))
+        indices = [3, 4, None, 0, None, None, 7]
+        for direction in ("+x", "-y", "+z"):
+            expected = typeset.compute_offsets(key, indices, gap=0.25, space_gap=0.5, direction=direction)
+            actual = typeset._offsets_array(key, indices, gap=0.25, space_gap=0.5, direction=direction)
+            self.assertEqual((len(indices), 3), actual.shape)
+            for (e, a) in zip(expected, actual):
+                for axis in range(3):
+                    self.assertAlmostEqual(e[axis], a[axis], places=5)
+
+    def test_numpy_wire_matches_python(self):
+        points = [Vector((i * 1.5, 0, i % 2)) for i in range(5)]
+        meshes = [bpy.data.meshes.new("Kiro Test Wire") for _ in range(2)]
+        try:
+            typeset._fill_wire_python(meshes[0], points)
+            typeset._fill_wire_numpy(meshes[1], points)
+            (expected, actual) = meshes
+            self.assertEqual([tuple(v.co) for v in expected.vertices], [tuple(v.co) for v in actual.vertices])
+            self.assertEqual([tuple(e.vertices) for e in expected.edges], [tuple(e.vertices) for e in actual.edges])
+        finally:
+            for mesh in meshes:
+                bpy.data.meshes.remove(mesh)
+
+
+class InstancesTest(SceneTestCase):
+    def instance_keycaps(self, instancer: bpy.types.Object) -> list[int]:
+        """The keycap attribute of each instance the instancer's node group makes"""
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        evaluated = instancer.evaluated_get(depsgraph)
+        if hasattr(evaluated, "evaluated_geometry"):
+            # Blender 4.3+ can read instance attributes directly
+            instances = evaluated.evaluated_geometry().instances_pointcloud()
+            return [item.value for item in instances.attributes["keycap"].data]
+
+        # Otherwise, realize the instances, which carries instance attributes to the points of each one
+        group = instancer.modifiers[0].node_group
+        output = next(node for node in group.nodes if node.bl_idname == "NodeGroupOutput")
+        instances_socket = output.inputs[0].links[0].from_socket
+        realize = group.nodes.new("GeometryNodeRealizeInstances")
+        group.links.new(instances_socket, realize.inputs[0])
+        group.links.new(realize.outputs[0], output.inputs[0])
+        depsgraph.update()
+        mesh = instancer.evaluated_get(depsgraph).data
+        values = [item.value for item in mesh.attributes["keycap"].data]
+        # Every instance is a copy of the 4-vertex keycap
+        self.assertEqual(0, len(values) % len(self.mesh.vertices))
+        return values[::len(self.mesh.vertices)]
+
+    def test_instances_carry_keycap(self):
+        objects = typeset.instance_from_original(self.original, [1, 2, None, 3], target=self.collection)
+        instancer = objects[1]
+        group = instancer.modifiers[0].node_group
+        try:
+            self.assertEqual(1, self.original["keycap"])
+            self.assertEqual([2, 3], self.instance_keycaps(instancer))
+        finally:
+            bpy.data.node_groups.remove(group)
+
+
+class GuideWireParentingTest(SceneTestCase):
+    def test_keys_are_parented_to_their_vertices(self):
+        objects = typeset.extend_from_original(self.original, [1, None, 2, 3], target=self.collection,
+                                               guide_wire=True)
+        wire = self.original.parent
+        self.assertIsNotNone(wire)
+        self.assertEqual(4, len(wire.data.vertices))
+        self.assertEqual([self.original], objects[:1])
+        self.assertEqual(3, len(objects))
+
+        bpy.context.view_layer.update()
+        for obj in objects:
+            position = obj[typeset.RUN_POSITION]
+            self.assertEqual(wire, obj.parent)
+            self.assertEqual("VERTEX", obj.parent_type)
+            self.assertEqual(position, obj.parent_vertices[0])
+            self.assertEqual((0, 0, 0), tuple(obj.location))
+            # Each key sits on its vertex, one key width along per position
+            self.assertAlmostEqual(position, obj.matrix_world.translation.x, places=5)
+        self.assertEqual([0, 2, 3], [obj[typeset.RUN_POSITION] for obj in objects])
+
+
+class FakeObject(dict):
+    def __init__(self, events: list):
+        super().__init__()
+        self.events = events
+        self.location = Location(0)
+        self.name = "Key"
+
+    def copy(self):
+        return FakeObject(self.events)
+
+    def select_set(self, state: bool) -> None:
+        self.events.append(("select", state))
+
+
+class Location(float):
+    def copy(self):
+        return self
+
+
+class FakeCollection:
+    def __init__(self, events: list):
+        self.events = events
+        self.objects = self
+
+    def link(self, obj) -> None:
+        self.events.append(("link", obj[typeset.RUN_POSITION]))
+
+
+class LinkBatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.events = []
+        self.original = FakeObject(self.events)
+        self.targets = [FakeCollection(self.events), FakeCollection(self.events)]
+
+    def create(self, target: FakeCollection, positions: list[int]) -> list:
+        return typeset.create_keycaps(self.original, [(1, 1.0, None, p) for p in positions], target)
+
+    def test_without_batch(self):
+        self.create(self.targets[0], [1, 2])
+        self.assertEqual([("link", 1), ("link", 2), ("select", False), ("select", False)], self.events)
+
+    def test_batch_links_everything_at_the_end(self):
+        with typeset.LinkBatch():
+            self.create(self.targets[0], [1])
+            self.create(self.targets[1], [2])
+            self.create(self.targets[0], [3])
+            self.assertEqual([], self.events)
+        self.assertEqual([("link", 1), ("link", 3), ("link", 2)] + [("select", False)] * 3, self.events)
+
+    def test_nested_batch(self):
+        with typeset.LinkBatch():
+            with typeset.LinkBatch():
+                self.create(self.targets[0], [1])
+            self.assertEqual([], self.events)
+        self.assertEqual([("link", 1), ("select", False)], self.events)
+
+    def test_batch_links_on_error(self):
+        with self.assertRaises(ValueError):
+            with typeset.LinkBatch():
+                self.create(self.targets[0], [1])
+                raise ValueError()
+        self.assertEqual([("link", 1), ("select", False)], self.events)
+        self.assertIsNone(typeset._link_batch)
+
+
+if __name__ == '__main__':
+    unittest.main()
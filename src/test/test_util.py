@@ -51,5 +51,16 @@ class WordWrapTest(unittest.TestCase):
         expected = []
         self.assertEqual(expected, util.wordwrap(provided, 10))
 
+class TabSeparatedRowsTest(unittest.TestCase):
+    def test_rows(self):
+        provided = ["Key 1\tHello\n", "Key 2\t[Enter] x\tNumbers\n"]
+        expected = [["Key 1", "Hello"], ["Key 2", "[Enter] x", "Numbers"]]
+        self.assertEqual(expected, util.tab_separated_rows(provided))
+
+    def test_skip_blank_and_comments(self):
+        provided = ["", "  ", "# object\tstring", "Key\t a "]
+        expected = [["Key", " a "]]
+        self.assertEqual(expected, util.tab_separated_rows(provided))
+
 if __name__ == '__main__':
     unittest.main()
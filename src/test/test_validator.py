@@ -0,0 +1,168 @@
+from . import pkg
+
+__package__ = pkg()
+
+import unittest
+import json
+from copy import deepcopy
+from importlib import util as il_util
+from os import path, listdir
+from ..lib import metadata
+from ..lib import validator
+
+testdata_path = path.join(path.dirname(__file__), "testdata")
+has_jsonschema = bool(il_util.find_spec("jsonschema"))
+
+
+def valid_object():
+    return {
+        "kiro": 1.0,
+        "name": "Sample Data",
+        "description": "A complete but minimal sample",
+        "keysets": {
+            "keyset A1": {
+                "cols": 4,
+                "rows": 4,
+                "start": 2,
+                "keys": ["1", None, {"gap": 2}, {"row_gap": 1}, "8"],
+                "default_key": 0
+            },
+            "keyset A2": {
+                "alt_for": "keyset A1",
+                "cols": 8,
+                "rows": 4,
+                "start": 24,
+                "length": 4,
+                "default_key": 0
+            }
+        }
+    }
+
+
+def mutated(mutate: callable) -> dict:
+    data = valid_object()
+    mutate(data)
+    return data
+
+
+def keyset_a1(data: dict) -> dict:
+    return data["keysets"]["keyset A1"]
+
+
+# Broken variants of the sample, covering every keyword in the schema
+invalid_objects = {
+    "not an object": ["keysets"],
+    "missing name": mutated(lambda d: d.pop("name")),
+    "missing name and keysets": mutated(lambda d: (d.pop("name"), d.pop("keysets"))),
+    "kiro too high": mutated(lambda d: d.update(kiro=2)),
+    "kiro too low": mutated(lambda d: d.update(kiro=0.5)),
+    "kiro not a number": mutated(lambda d: d.update(kiro="1.0")),
+    "kiro is a bool": mutated(lambda d: d.update(kiro=True)),
+    "name not a string": mutated(lambda d: d.update(name=5)),
+    "keysets not an object": mutated(lambda d: d.update(keysets=[])),
+    "keyset not an object": mutated(lambda d: d["keysets"].update({"bad": "keyset"})),
+    "cols not an integer": mutated(lambda d: keyset_a1(d).update(cols="4")),
+    "cols fractional": mutated(lambda d: keyset_a1(d).update(cols=4.5)),
+    "cols integral float": mutated(lambda d: keyset_a1(d).update(cols=4.0)),
+    "rows is a bool": mutated(lambda d: keyset_a1(d).update(rows=False)),
+    "missing required": mutated(lambda d: (keyset_a1(d).pop("start"), keyset_a1(d).pop("default_key"))),
+    "both keys and alt_for": mutated(lambda d: keyset_a1(d).update(alt_for="keyset A2")),
+    "neither keys nor alt_for": mutated(lambda d: keyset_a1(d).pop("keys")),
+    "alt_for not a string": mutated(lambda d: d["keysets"]["keyset A2"].update(alt_for=1)),
+    "extra property": mutated(lambda d: keyset_a1(d).update(extra=1)),
+    "extra properties": mutated(lambda d: keyset_a1(d).update(zeta=1, alpha=2)),
+    "keys not an array": mutated(lambda d: keyset_a1(d).update(keys="1234")),
+    "key is a number": mutated(lambda d: keyset_a1(d)["keys"].append(5)),
+    "key is a bool": mutated(lambda d: keyset_a1(d)["keys"].append(True)),
+    "key is an array": mutated(lambda d: keyset_a1(d)["keys"].append(["a"])),
+    "key is an empty object": mutated(lambda d: keyset_a1(d)["keys"].append({})),
+    "gap not an integer": mutated(lambda d: keyset_a1(d)["keys"].append({"gap": "2"})),
+    "gap and row_gap": mutated(lambda d: keyset_a1(d)["keys"].append({"gap": 1, "row_gap": 1})),
+    "unknown key object": mutated(lambda d: keyset_a1(d)["keys"].append({"skip": 1})),
+    "many problems": mutated(lambda d: (d.pop("name"), keyset_a1(d).update(cols="x", extra=1),
+                                        d["keysets"]["keyset A2"].update(keys=[1]))),
+}
+
+
+def fixture(filename: str) -> dict:
+    with open(path.join(testdata_path, filename)) as file:
+        return json.load(file)
+
+
+def builtin_messages(data: any) -> list[str]:
+    errors = sorted(validator.iter_errors(data, metadata.kirofile_schema()),
+                    key=lambda e: [str(p) for p in e.absolute_path])
+    return [metadata._format_error(e) for e in errors]
+
+
+def jsonschema_messages(data: any) -> list[str]:
+    errors = sorted(metadata.jsonschema_validator().iter_errors(data), key=lambda e: [str(p) for p in e.absolute_path])
+    return [metadata._format_error(e) for e in errors]
+
+
+class BuiltinValidatorTest(unittest.TestCase):
+    def test_valid_object(self):
+        self.assertEqual([], builtin_messages(valid_object()))
+
+    def test_valid_fixtures(self):
+        for filename in ["image1.kiro.json", "image2.kiro.json"]:
+            with open(path.join(testdata_path, filename)) as file:
+                self.assertEqual([], builtin_messages(json.load(file)), filename)
+
+    def test_not_schema_compliant_fixture(self):
+        with open(path.join(testdata_path, "not_schema_compliant.kiro.json")) as file:
+            data = json.load(file)
+        self.assertEqual(["'name' is a required property", "'keysets' is a required property"],
+                         builtin_messages(data))
+
+    def test_invalid_objects_fail(self):
+        for (description, data) in invalid_objects.items():
+            if description == "cols integral float":
+                continue
+            self.assertNotEqual([], builtin_messages(data), description)
+
+    def test_messages(self):
+        self.assertEqual(["keysets/keyset A1/cols: '4' is not of type 'integer'"],
+                         builtin_messages(invalid_objects["cols not an integer"]))
+        self.assertEqual(["kiro: 2 is greater than the maximum of 1.0"],
+                         builtin_messages(invalid_objects["kiro too high"]))
+        self.assertEqual(["keysets/keyset A1: Additional properties are not allowed ('alpha', 'zeta' were unexpected)"],
+                         builtin_messages(invalid_objects["extra properties"]))
+        self.assertEqual(["keysets/keyset A1/keys/5: 5 is not valid under any of the given schemas"],
+                         builtin_messages(invalid_objects["key is a number"]))
+
+    def test_alt_for_references(self):
+        missing = fixture("alt_for_missing_keyset.kiro.json")
+        chained = fixture("chained_alt_for.kiro.json")
+        # The schema can't express these, so they are only caught by the reference check
+        self.assertEqual([], builtin_messages(missing))
+        self.assertEqual([], builtin_messages(chained))
+        self.assertEqual(["'c' is not a keyset in this file"],
+                         [e.message for e in validator.iter_reference_errors(missing)])
+        self.assertEqual(["'b' is itself an alt_for another keyset, which is not supported"],
+                         [e.message for e in validator.iter_reference_errors(chained)])
+        self.assertEqual([], list(validator.iter_reference_errors(valid_object())))
+
+    def test_load_rejects_alt_for_references(self):
+        with self.assertRaises(metadata.KiroValidationException) as raised:
+            metadata.load(path.join(testdata_path, "chained_alt_for.kiro.json"))
+        self.assertEqual(["keysets/c/alt_for: 'b' is itself an alt_for another keyset, which is not supported"],
+                         raised.exception.errors)
+
+    def test_parity_with_jsonschema(self):
+        if not has_jsonschema:
+            self.skipTest("The jsonschema module is not installed, so there is nothing to compare with.")
+        fixtures = {}
+        for filename in [f for f in listdir(testdata_path) if f.endswith(".kiro.json")]:
+            with open(path.join(testdata_path, filename)) as file:
+                try:
+                    fixtures[filename] = json.load(file)
+                except json.JSONDecodeError:
+                    pass
+        cases = {**fixtures, "valid object": valid_object(), **invalid_objects}
+        for (description, data) in cases.items():
+            self.assertEqual(jsonschema_messages(deepcopy(data)), builtin_messages(deepcopy(data)), description)
+
+
+if __name__ == '__main__':
+    unittest.main()